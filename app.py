@@ -1,30 +1,86 @@
-from flask import Flask, render_template, request, redirect, session, url_for
+from flask import Flask, Blueprint, Response, current_app, g, has_app_context, render_template, stream_template, stream_with_context, request, redirect, session, url_for, jsonify
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
-from authlib.integrations.flask_client import OAuth
+import hashlib
+import json
 import os
+from datetime import datetime, timedelta, timezone
 from config import GOOGLE_CLIENT_ID, GOOGLE_CLIENT_SECRET, GOOGLE_DISCOVERY_URL
-import requests
-
-app = Flask(__name__)
-app.secret_key = os.getenv("FLASK_SECRET_KEY")
-
-# Configuración de SQLite con SQLAlchemy
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///todo.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db = SQLAlchemy(app)
-
-# Configuración de OAuth
-oauth = OAuth(app)
-google = oauth.register(
-    name='google',
-    client_id=GOOGLE_CLIENT_ID,
-    client_secret=GOOGLE_CLIENT_SECRET,
-    server_metadata_url=GOOGLE_DISCOVERY_URL,
-    client_kwargs={
-        'scope': 'openid email profile',
-    }
-)
+from cache import TaskListCache, NullTaskCache, create_cache_backend
+from storage import GroupCommitter, apply_sqlite_profile, commit_with_retry, engine_options
+from security import PasswordHasher, RateLimiter, HashingBusy
+from sessions import create_session_interface
+from metrics import create_request_metrics
+from events import TaskEventHub, NullEventBackend, create_event_backend
+from reminders import ReminderScheduler, create_notifier
+from assets import build_assets, init_static_assets, precompile_templates, render_version
+from compression import create_response_compressor
+from search import include_search_objects, install_search_index, parse_search_cursor, parse_search_query, search_tasks
+from shards import MAIN, ShardMap, ShardMoving, ShardedSession, TaskShards, file_lock, rebalance
+from flask.cli import AppGroup
+from functools import wraps
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from werkzeug.local import LocalProxy
+import click
+import csv
+import heapq
+import io
+import threading
+import time
+
+# Extensiones sin aplicación: se enlazan en create_app(). Con TASK_SHARDS la sesión envía las tablas de
+# tareas al shard del usuario (shards.py)
+db = SQLAlchemy(session_options={'class_': ShardedSession})
+
+# Las integraciones externas (Google OAuth con Authlib, Weatherstack con requests) y Flask-Migrate con
+# Alembic se importan la primera vez que se usan, no al importar este módulo: arrancar un worker, cada
+# módulo de pruebas y cada comando del CLI no pagan por lo que no van a usar (tests/test_import_time.py)
+integrations_lock = threading.Lock()
+
+# Con métricas activas, mide también las llamadas HTTP del cliente OAuth (Authlib crea una sesión
+# de requests por llamada y le aplica esta función)
+def instrument_oauth_session(oauth_session):
+    metrics = current_app.extensions.get('metrics')
+    if metrics:
+        oauth_session.hooks['response'].append(metrics.requests_hook('google'))
+
+# Configuración de OAuth. El registro de Authlib se crea con el primer uso del cliente (dentro de un
+# contexto de aplicación); los metadatos del proveedor y sus claves salen de la caché compartida de
+# init_oauth_metadata() (oidc.py)
+oauth = None
+
+def google_client():
+    global oauth
+    app = current_app._get_current_object()
+    oauth_metadata(app)
+    with integrations_lock:
+        if oauth is None:
+            from oidc import CachedMetadataOAuth
+            registry = CachedMetadataOAuth(app)
+            registry.register(
+                name='google',
+                client_id=GOOGLE_CLIENT_ID,
+                client_secret=GOOGLE_CLIENT_SECRET,
+                server_metadata_url=GOOGLE_DISCOVERY_URL,
+                compliance_fix=instrument_oauth_session,
+                client_kwargs={
+                    'scope': 'openid email profile',
+                }
+            )
+            oauth = registry
+    return oauth.create_client('google')
+
+google = LocalProxy(google_client)
+
+# Caché de las páginas de tareas de cada usuario (el backend se elige en create_app())
+task_cache = TaskListCache(NullTaskCache())
+
+# Canal de cambios de tareas por usuario para /tasks/events (el backend se elige en create_app())
+task_events = TaskEventHub(NullEventBackend())
+
+bp = Blueprint('todo', __name__)
 
 # Definición de modelos para las tablas
 class User(db.Model):
@@ -33,23 +89,429 @@ class User(db.Model):
     password = db.Column(db.String(255), nullable=True)  # La contraseña será opcional para usuarios de Google
     google_id = db.Column(db.String(100), unique=True, nullable=True)  # Campo para almacenar el ID de Google
 
+# Fecha de creación en UTC sin zona horaria (mismo formato en SQLite y PostgreSQL)
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 class Task(db.Model):
+    # Índices compuestos para listar las tareas de un usuario sin recorrer toda la tabla:
+    # por prioridad, por fecha de creación y por prefijo del texto (sin distinguir mayúsculas)
+    __table_args__ = (
+        db.Index('ix_task_user_priority_id', 'user_id', 'priority', 'id'),
+        db.Index('ix_task_user_created_id', 'user_id', 'created_at', 'id'),
+        db.Index('ix_task_user_task_lower', 'user_id', db.text('lower(task)')),
+        # Índice parcial con solo las tareas con recordatorio pendiente, en orden de vencimiento: el
+        # planificador (reminders.py) lee las próximas sin recorrer la tabla ni las ya avisadas
+        db.Index('ix_task_due_pending', 'due_at',
+                 sqlite_where=db.text('due_at IS NOT NULL AND reminded_at IS NULL'),
+                 postgresql_where=db.text('due_at IS NOT NULL AND reminded_at IS NULL')),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     task = db.Column(db.String(255), nullable=False)
     priority = db.Column(db.Integer, nullable=False, default=3)  # 1: Alta, 2: Media, 3: Baja
+    created_at = db.Column(db.DateTime, nullable=False, default=utcnow)
+    due_at = db.Column(db.DateTime, nullable=True)  # Fecha límite opcional (UTC)
+    reminded_at = db.Column(db.DateTime, nullable=True)  # Envío del recordatorio; se borra al cambiar due_at
+
+# Índice de búsqueda de texto (FTS5 en SQLite, GIN en PostgreSQL) para db.create_all()
+install_search_index(Task.__table__)
+
+# Versión de la lista de tareas de cada usuario (ETag de /tasks): sube en cada transacción que crea,
+# modifica o borra tareas suyas. Sin fila, versión 0. Va en su propia tabla para que leerla no cargue el
+# usuario (con sesiones en el servidor no se consulta) ni escribir en ella bloquee su fila.
+class TaskListVersion(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True, autoincrement=False)
+    version = db.Column(db.Integer, nullable=False)
+
+# Tablas que se reparten por usuario con TASK_SHARDS: todo lo de un usuario va en el mismo shard. Los ids
+# de task son únicos dentro de cada shard; todas las consultas filtran también por usuario.
+SHARDED_TABLES = (Task.__table__, TaskListVersion.__table__)
+
+# Vista de la lista pedida en la URL: orden (?sort=priority|created|-created, "-" = más recientes primero),
+# prioridades (?priority=1&priority=2) y prefijo del texto (?q=...)
+TASK_SORTS = ('priority', 'created', '-created')
+DEFAULT_TASK_VIEW = {'sort': 'priority', 'priorities': (), 'prefix': ''}
+EPOCH = datetime(1970, 1, 1)
+
+def parse_task_view(args):
+    sort = args.get('sort') or 'priority'
+    try:
+        priorities = tuple(sorted({int(priority) for priority in args.getlist('priority')}))
+    except ValueError:
+        return None
+    if sort not in TASK_SORTS or any(priority not in (1, 2, 3) for priority in priorities):
+        return None
+    # Las tres prioridades equivalen a no filtrar (y comparten entrada en la caché)
+    if len(priorities) == 3:
+        priorities = ()
+    return {'sort': sort, 'priorities': priorities, 'prefix': (args.get('q') or '').strip()[:255]}
+
+# Parámetros de la URL que reproducen una vista (para los enlaces de paginación)
+def task_view_args(view):
+    args = {}
+    if view['sort'] != 'priority':
+        args['sort'] = view['sort']
+    if view['priorities']:
+        args['priority'] = list(view['priorities'])
+    if view['prefix']:
+        args['q'] = view['prefix']
+    return args
+
+def task_view_key(view):
+    return json.dumps([view['sort'], view['priorities'], view['prefix']])
+
+def task_view_filters(view):
+    filters = []
+    if view['priorities']:
+        filters.append(Task.priority.in_(view['priorities']))
+    if view['prefix']:
+        # El rango permite buscar en el índice sobre lower(task); el LIKE descarta los falsos positivos
+        # que deje la ordenación de PostgreSQL
+        prefix, text = view['prefix'].lower(), db.func.lower(Task.task)
+        filters += [text >= prefix, text < prefix + '\U0010ffff', text.startswith(prefix, autoescape=True)]
+    return filters
+
+def task_sort_column(view):
+    return Task.priority if view['sort'] == 'priority' else Task.created_at
+
+def task_view_order(view):
+    column = task_sort_column(view)
+    if view['sort'].startswith('-'):
+        return [column.desc(), Task.id.desc()]
+    return [column, Task.id]
+
+# Paginación por cursor (keyset): el cursor es "<clave>-<id>" de la última tarea de la página, donde la
+# clave es la prioridad o la fecha de creación en microsegundos desde 1970. Una clave fuera del rango de
+# datetime o un id de más de 64 bits no son un cursor válido (no llegan a timedelta ni a la base de datos).
+MAX_TASK_ID = 2 ** 63 - 1
+CURSOR_KEY_RANGE = range((datetime.min - EPOCH) // timedelta(microseconds=1),
+                         (datetime.max - EPOCH) // timedelta(microseconds=1) + 1)
+
+def parse_cursor(cursor):
+    try:
+        key, task_id = (int(part) for part in cursor.split('-'))
+    except (AttributeError, ValueError):
+        return None
+    if key not in CURSOR_KEY_RANGE or task_id > MAX_TASK_ID:
+        return None
+    return key, task_id
+
+def task_cursor(task, view):
+    if view['sort'] == 'priority':
+        return f"{task.priority}-{task.id}"
+    return f"{(task.created_at - EPOCH) // timedelta(microseconds=1)}-{task.id}"
+
+def cursor_key(key, view):
+    if view['sort'] == 'priority':
+        return key
+    return EPOCH + timedelta(microseconds=key)
+
+def page_size(limit=None):
+    if not limit:
+        return current_app.config['TASKS_PAGE_SIZE']
+    return max(1, min(limit, current_app.config['TASKS_MAX_PAGE_SIZE']))
+
+# Columnas que usan la lista y el cursor. Las páginas se leen como filas de solo lectura (Row, una tupla
+# con nombres): sin identity map, sin seguimiento de cambios y sin construir objetos Task
+TASK_LIST_COLUMNS = (Task.id, Task.task, Task.priority, Task.created_at, Task.due_at)
+
+def task_page_queries(user_id, after=None, view=None):
+    view = view or DEFAULT_TASK_VIEW
+    query = db.select(*TASK_LIST_COLUMNS).where(Task.user_id == user_id, *task_view_filters(view))
+    order = task_view_order(view)
+    if not after:
+        return [query.order_by(*order)]
+    # SQLite solo usa la clave del cursor para buscar en el índice, así que la página se resuelve
+    # con dos búsquedas exactas: resto de la clave actual y claves siguientes
+    column = task_sort_column(view)
+    key, task_id = cursor_key(after[0], view), after[1]
+    if view['sort'].startswith('-'):
+        return [
+            query.filter(column == key, Task.id < task_id).order_by(Task.id.desc()),
+            query.filter(column < key).order_by(*order),
+        ]
+    return [
+        query.filter(column == key, Task.id > task_id).order_by(Task.id),
+        query.filter(column > key).order_by(*order),
+    ]
+
+def task_page(user_id, after=None, limit=None, session=None, view=None):
+    view = view or DEFAULT_TASK_VIEW
+    limit = page_size(limit)
+    session = session or db.session
+    tasks = []
+    for query in task_page_queries(user_id, after, view):
+        # Se pide una fila de más para saber si existe una página siguiente
+        tasks += session.execute(query.limit(limit + 1 - len(tasks))).all()
+        if len(tasks) > limit:
+            break
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        next_cursor = task_cursor(tasks[-1], view)
+    return tasks, next_cursor
+
+# Versión cacheada de task_page; guarda filas simples para que sirvan en cualquier backend. Con la versión
+# de la lista en la clave, una página cacheada antes de un cambio no puede servirse con el ETag posterior
+# aunque la invalidación aún no haya llegado (la invalidación solo limpia la caché en memoria del worker que
+# confirmó el cambio). Sin `version` se lee aquí: ninguna clave queda sin versión.
+def cached_task_page(user_id, after=None, limit=None, view=None, version=None):
+    view = view or DEFAULT_TASK_VIEW
+    limit = page_size(limit)
+    if version is None:
+        version = task_list_version(user_id)
+    page_key = f"{after[0]}-{after[1]}:{limit}" if after else f"first:{limit}"
+    if view != DEFAULT_TASK_VIEW:
+        page_key += f":{task_view_key(view)}"
+    page_key += f"@{version}"
+
+    def load():
+        tasks, next_cursor = task_page(user_id, after, limit, view=view)
+        return {
+            'tasks': [task_row(task) for task in tasks],
+            'next_cursor': next_cursor,
+        }
+
+    page = task_cache.get_or_load(user_id, page_key, load)
+    return page['tasks'], page['next_cursor']
+
+def task_list_version(user_id):
+    return db.session.scalar(db.select(TaskListVersion.version).where(TaskListVersion.user_id == user_id)) or 0
+
+# ETag fuerte de una lista: versión de las tareas del usuario más todo lo demás que cambia el cuerpo
+# (página, vista, número del canal de cambios y versión de plantillas y recursos)
+def task_list_etag(user_id, version, *parts):
+    payload = json.dumps([current_app.extensions['render_version'], *parts], default=str)
+    return f"{user_id}-{version}-{hashlib.sha256(payload.encode()).hexdigest()[:16]}"
+
+# ETag de If-None-Match que corresponde a la lista, en cualquiera de sus codificaciones (compression.py
+# añade "-br" o "-gzip"); None si el cliente no tiene esta versión
+def matching_etag(etag):
+    for candidate in (etag, f"{etag}-br", f"{etag}-gzip"):
+        if request.if_none_match.contains_weak(candidate):
+            return candidate
+    return None
+
+def not_modified(etag):
+    response = Response(status=304)
+    return revalidate_with(response, etag)
+
+# Respuestas por usuario: solo en la caché del navegador y revalidadas en cada carga con su ETag
+def revalidate_with(response, etag):
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    response.vary.add('Cookie')
+    return response
+
+# Todas las tareas del usuario en orden, leídas por lotes (yield_per activa un cursor del lado del
+# servidor en PostgreSQL): filas simples sin pasar por el identity map, memoria acotada por el lote
+def iter_task_rows(user_id, batch_size, view=None):
+    view = view or DEFAULT_TASK_VIEW
+    yield from db.session.execute(
+        db.select(*TASK_LIST_COLUMNS)
+        .where(Task.user_id == user_id, *task_view_filters(view))
+        .order_by(*task_view_order(view))
+        .execution_options(yield_per=batch_size)
+    )
+
+# Agrupa los fragmentos del render en bloques de unos `size` caracteres para no escribir en el socket
+# por cada fila
+def buffered_chunks(chunks, size):
+    buffer, length = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield "".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+# Fila de una tarea en JSON (API, caché y canal de cambios); la fecha límite en ISO 8601 (UTC)
+def task_row(task):
+    return {'id': task.id, 'task': task.task, 'priority': task.priority, 'due_at': isoformat(task.due_at)}
 
-# Crear las tablas en la base de datos
-with app.app_context():
-    db.create_all()
+def isoformat(value):
+    return value.isoformat() if value else None
+
+# Fecha límite recibida en el formulario o la API: ISO 8601 ("2026-10-20T09:30"); sin zona horaria se
+# entiende UTC y con zona se convierte a UTC. Vacía o None quita la fecha. ValueError si no es válida.
+def parse_due_at(value):
+    if value is None or value == '':
+        return None
+    if not isinstance(value, str):
+        raise ValueError(value)
+    due_at = datetime.fromisoformat(value.strip())
+    if due_at.tzinfo is not None:
+        due_at = due_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return due_at
+
+# Valor para <input type="datetime-local"> y para mostrar la fecha: filas de la caché (texto ISO) o de la
+# base de datos (datetime)
+@bp.app_template_filter('datetime_local')
+def datetime_local(value):
+    if not value:
+        return ''
+    return (value if isinstance(value, str) else value.isoformat())[:16]
+
+# Tareas con fecha confirmadas en esta transacción: se pasan al planificador de recordatorios del proceso
+# (si lo hay) para no esperar a su siguiente lectura
+def record_scheduled_reminders(session, entries):
+    shard = session.info.get('task_shard')
+    session.info.setdefault('scheduled_reminders', []).extend(
+        (due_at, reminder_key(shard, task_id)) for due_at, task_id in entries if due_at is not None)
+
+# Con shards el planificador identifica cada tarea por (shard, id)
+def reminder_key(shard, task_id):
+    return task_id if shard is None else (shard, task_id)
+
+# Anota cambios para publicarlos en /tasks/events cuando la transacción se confirme
+def record_task_changes(session, user_id, change_type, rows):
+    if task_events.enabled:
+        session.info.setdefault('task_changes', []).extend(
+            (user_id, {'type': change_type, 'task': row}) for row in rows)
+
+# Invalidación de la caché: se anotan los usuarios cuyas tareas cambian en cada flush
+# y se invalidan solo esas entradas cuando la transacción se confirma
+@db.event.listens_for(Session, 'after_flush')
+def collect_changed_task_users(session, flush_context):
+    changed = session.info.setdefault('changed_task_users', set())
+    for change_type, objects in (('inserted', session.new), ('updated', session.dirty), ('deleted', session.deleted)):
+        for obj in objects:
+            if isinstance(obj, Task):
+                changed.add(obj.user_id)
+                row = {'id': obj.id} if change_type == 'deleted' else task_row(obj)
+                record_task_changes(session, obj.user_id, change_type, [row])
+                if change_type == 'inserted' or (change_type == 'updated' and db.inspect(obj).attrs.due_at.history.has_changes()):
+                    record_scheduled_reminders(session, [(obj.due_at, obj.id)])
+
+# La versión de la lista de los usuarios afectados sube en la misma transacción que los cambios: una versión
+# leída nunca describe menos cambios de los ya confirmados
+@db.event.listens_for(Session, 'before_commit')
+def bump_task_list_versions(session):
+    session.flush()
+    changed = session.info.get('changed_task_users')
+    if changed:
+        insert = postgresql_insert if session.get_bind(mapper=TaskListVersion).dialect.name == 'postgresql' else sqlite_insert
+        statement = insert(TaskListVersion).values([{'user_id': user_id, 'version': 1} for user_id in sorted(changed)])
+        session.execute(statement.on_conflict_do_update(
+            index_elements=['user_id'], set_={'version': TaskListVersion.version + 1}))
+
+@db.event.listens_for(Session, 'after_commit')
+def invalidate_changed_task_users(session):
+    for user_id in session.info.pop('changed_task_users', ()):
+        task_cache.invalidate(user_id)
+    changes_by_user = {}
+    for user_id, change in session.info.pop('task_changes', ()):
+        changes_by_user.setdefault(user_id, []).append(change)
+    for user_id, changes in changes_by_user.items():
+        task_events.publish(user_id, changes)
+    scheduled = session.info.pop('scheduled_reminders', None)
+    scheduler = current_app.extensions.get('reminders') if has_app_context() else None
+    if scheduled and scheduler:
+        scheduler.schedule(scheduled)
+
+@db.event.listens_for(Session, 'after_rollback')
+def discard_changed_task_users(session):
+    session.info.pop('changed_task_users', None)
+    session.info.pop('task_changes', None)
+    session.info.pop('scheduled_reminders', None)
+
+# Confirma los cambios de work() reintentando si la base de datos está bloqueada
+def commit(work):
+    return commit_with_retry(db.session, work, attempts=current_app.config['DB_COMMIT_ATTEMPTS'])
+
+# Alta de una tarea. Con TASK_GROUP_COMMIT se inserta junto con las de otras peticiones en una sola
+# transacción; la función vuelve cuando la tarea está confirmada, así que la redirección a /tasks ya la ve.
+# Con shards hay un group commit por shard: cada uno confirma sus lotes sin esperar a los demás.
+def create_task(user_id, fields):
+    writers = current_app.extensions.get('task_writers')
+    if writers is None:
+        task = Task(user_id=user_id, **fields)
+        commit(lambda: db.session.add(task))
+        return task.id
+    writer = writers[db.session.info.get('task_shard')]
+    # Se devuelve la conexión al pool antes de esperar: el hilo del group commit necesita una
+    db.session.close()
+    return writer.submit(dict(fields, user_id=user_id))
+
+# Inserta un lote de tareas del group commit (en el hilo del group commit) con un INSERT masivo. Como en
+# apply_task_batch, se marcan los usuarios para invalidar su caché y se anotan los cambios para el canal de eventos.
+def insert_task_batch(app, rows, shard=None):
+    with app.app_context():
+        if shard is not None:
+            db.session.info['task_shard'] = shard
+
+        def work():
+            ids = db.session.scalars(db.insert(Task).returning(Task.id, sort_by_parameter_order=True), rows).all()
+            db.session.info.setdefault('changed_task_users', set()).update(row['user_id'] for row in rows)
+            for row, task_id in zip(rows, ids):
+                record_task_changes(db.session, row['user_id'], 'inserted', [
+                    {'id': task_id, 'task': row['task'], 'priority': row['priority'], 'due_at': isoformat(row.get('due_at'))}])
+            record_scheduled_reminders(db.session, [(row.get('due_at'), task_id) for row, task_id in zip(rows, ids)])
+            return ids
+
+        return commit_with_retry(db.session, work, attempts=app.config['DB_COMMIT_ATTEMPTS'])
+
+# Inicia la sesión del usuario con un identificador nuevo y cachea sus datos durante la vida de la sesión
+def login_user(user):
+    session.clear()
+    current_app.session_interface.regenerate(session)
+    session['user_id'] = user.id
+    session['user'] = {'id': user.id, 'username': user.username}
+
+# Usuario de la sesión actual. Con sesiones en el servidor se usa la copia cacheada (revocar la sesión
+# basta para expulsar al usuario); con cookies firmadas se comprueba en la base de datos.
+def load_current_user():
+    if 'user_id' not in session:
+        return None
+    if current_app.session_interface.server_side and session.get('user'):
+        return session['user']
+    user = db.session.get(User, session['user_id'])
+    if user is None:
+        session.clear()
+        return None
+    return {'id': user.id, 'username': user.username}
+
+def login_required(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.user = load_current_user()
+        if g.user is None:
+            if request.path.startswith('/api/'):
+                return jsonify({'error': 'Authentication required.'}), 401
+            return redirect('/login')
+        try:
+            use_task_shard(g.user['id'])
+        except ShardMoving:
+            # Rebalanceo en curso: las tareas del usuario se están copiando a otro shard
+            message = 'Your tasks are being moved, try again shortly.'
+            if request.path.startswith('/api/'):
+                response = jsonify({'error': message})
+            else:
+                response = Response(message, mimetype='text/plain')
+            response.status_code = 503
+            response.headers['Retry-After'] = '5'
+            return response
+        return view(*args, **kwargs)
+    return wrapper
+
+# Con TASK_SHARDS, las consultas de tareas de esta sesión van al shard del usuario
+def use_task_shard(user_id):
+    shards = current_app.extensions.get('task_shards')
+    if shards is not None:
+        db.session.info['task_shard'] = shards.shard_for(user_id)
 
 # Rutas de Google OAuth
-@app.route('/google_login')
+@bp.route('/google_login')
 def google_login():
-    redirect_uri = url_for('google_authorize', _external=True)
+    redirect_uri = url_for('.google_authorize', _external=True)
     return google.authorize_redirect(redirect_uri)
 
-@app.route('/google_authorize')
+@bp.route('/google_authorize')
 def google_authorize():
     token = google.authorize_access_token()
     user_info = token.get('userinfo')  # Obtener información del usuario desde el token
@@ -64,15 +526,14 @@ def google_authorize():
             username=user_info['email'],
             google_id=user_info['sub']
         )
-        db.session.add(user)
-        db.session.commit()
+        commit(lambda: db.session.add(user))
 
     # Iniciar sesión
-    session['user_id'] = user.id
+    login_user(user)
     return redirect('/tasks')
 
 # Página de inicio de sesión
-@app.route('/login', methods=['GET', 'POST'])
+@bp.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
         username = request.form['username'].strip()
@@ -81,18 +542,30 @@ def login():
         if not username or not password:
             return render_template('login.html', error="Login failed: Fields cannot be empty.")
 
+        # Límite de intentos por IP y por usuario antes de calcular ningún hash
+        limiters = current_app.extensions['login_limiters']
+        if not (limiters['ip'].hit(request.remote_addr) and limiters['username'].hit(username.lower())):
+            return render_template('login.html', error="Login failed: Too many attempts, try again later."), 429
+
         user = User.query.filter_by(username=username).first()
+        hasher = current_app.extensions['password_hasher']
 
-        if user and check_password_hash(user.password, password):
-            session['user_id'] = user.id
-            return redirect('/tasks')
-        else:
-            return render_template('login.html', error="Login failed: Invalid username or password.")
+        try:
+            if user and hasher.verify(user.password, password):
+                # Rehash transparente si cambió el método o el coste configurado
+                if hasher.needs_rehash(user.password):
+                    new_hash = hasher.hash(password)
+                    commit(lambda: setattr(user, 'password', new_hash))
+                login_user(user)
+                return redirect('/tasks')
+        except HashingBusy:
+            return render_template('login.html', error="Login failed: Server busy, try again later."), 503
+        return render_template('login.html', error="Login failed: Invalid username or password.")
 
     return render_template('login.html')
 
 # Página de registro
-@app.route('/register', methods=['GET', 'POST'])
+@bp.route('/register', methods=['GET', 'POST'])
 def register():
     if request.method == 'POST':
         username = request.form['username'].strip()
@@ -104,91 +577,965 @@ def register():
         if User.query.filter_by(username=username).first():
             return render_template('register.html', error="Username already exists.")
 
-        hashed_password = generate_password_hash(password)
+        try:
+            hashed_password = current_app.extensions['password_hasher'].hash(password)
+        except HashingBusy:
+            return render_template('register.html', error="Server busy, try again later."), 503
         new_user = User(username=username, password=hashed_password)
-        db.session.add(new_user)
-        db.session.commit()
+        commit(lambda: db.session.add(new_user))
         return redirect('/login')
 
     return render_template('register.html')
 
 # Página de la To Do List
-@app.route('/tasks', methods=['GET', 'POST'])
+@bp.route('/tasks', methods=['GET', 'POST'])
+@login_required
 def tasks():
-    if 'user_id' not in session:
-        return redirect('/login')
-
     if request.method == 'POST':
         task_name = request.form['task'].strip()
         priority = request.form['priority'].strip()
+        try:
+            due_at, valid_due_at = parse_due_at(request.form.get('due_at')), True
+        except ValueError:
+            due_at, valid_due_at = None, False
 
-        if not task_name or not priority or int(priority) not in [1, 2, 3]:
-            return render_template('tasks.html', tasks=Task.query.filter_by(user_id=session['user_id']).all(), error="Invalid input.")
+        if not valid_due_at or not task_name or not priority or int(priority) not in [1, 2, 3]:
+            tasks, next_cursor = cached_task_page(g.user['id'], version=task_list_version(g.user['id']))
+            return render_template('tasks.html', tasks=tasks, next_cursor=next_cursor, error="Invalid input.")
 
-        new_task = Task(user_id=session['user_id'], task=task_name, priority=int(priority))
-        db.session.add(new_task)
-        db.session.commit()
+        create_task(g.user['id'], {'task': task_name, 'priority': int(priority), 'due_at': due_at})
         return redirect('/tasks')
 
-    tasks = Task.query.filter_by(user_id=session['user_id']).all()
-    return render_template('tasks.html', tasks=tasks)
+    # Orden y filtros de la lista; con valores no válidos se muestra la vista por defecto
+    view = parse_task_view(request.args)
+    error = None
+    if view is None:
+        view, error = DEFAULT_TASK_VIEW, "Invalid sort or filter."
+
+    # Número del último cambio antes de leer la página: el canal de cambios reenvía lo posterior
+    last_event_id = task_events.sequence(g.user['id']) if task_events.enabled else None
+
+    # Versión de la lista antes de leer las filas: el cuerpo nunca es más antiguo que su ETag. Si el
+    # navegador ya tiene esta versión, 304 sin consultar la página ni renderizar
+    stream_all = request.args.get('limit') == 'all'
+    limit = None if stream_all else request.args.get('limit', type=int)
+    after = None if stream_all else parse_cursor(request.args.get('after'))
+    version = task_list_version(g.user['id'])
+    etag = None
+    if not error:
+        etag = task_list_etag(g.user['id'], version, 'html', task_view_key(view), after,
+                              'all' if stream_all else page_size(limit), last_event_id)
+        cached_etag = matching_etag(etag)
+        if cached_etag:
+            return not_modified(cached_etag)
+
+    # ?limit=all: lista completa renderizada en streaming; los primeros bytes salen antes de leer
+    # todas las filas y la memoria no crece con el número de tareas
+    if stream_all:
+        rows = iter_task_rows(g.user['id'], current_app.config['TASKS_STREAM_BATCH'], view)
+        stream = stream_template('tasks.html', tasks=rows, next_cursor=None, limit=None, view=view,
+                                 view_args=task_view_args(view), error=error,
+                                 events_enabled=task_events.enabled, last_event_id=last_event_id)
+        response = Response(buffered_chunks(stream, current_app.config['TASKS_STREAM_CHUNK']), mimetype='text/html')
+        response.headers['X-Accel-Buffering'] = 'no'
+    else:
+        tasks, next_cursor = cached_task_page(g.user['id'], after, limit, view, version)
+        response = Response(render_template(
+            'tasks.html', tasks=tasks, next_cursor=next_cursor, limit=limit, view=view,
+            view_args=task_view_args(view), first_page=after is None, error=error,
+            events_enabled=task_events.enabled, last_event_id=last_event_id), 400 if error else 200, mimetype='text/html')
+    return revalidate_with(response, etag) if etag else response
+
+# Canal de cambios (Server-Sent Events): filas de tareas insertadas, modificadas o borradas del usuario.
+# El navegador reenvía Last-Event-ID al reconectarse; la primera conexión usa ?last_event_id.
+@bp.route('/tasks/events')
+@login_required
+def task_events_stream():
+    if not task_events.enabled:
+        return jsonify({'error': 'Task events are disabled.'}), 404
+    if not task_events.has_capacity():
+        return jsonify({'error': 'Too many open event streams.'}), 503
+    last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+    last_event_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+    # El flujo puede durar minutos: no debe retener una conexión de la base de datos
+    db.session.close()
+    stream = task_events.stream(g.user['id'], last_event_id, heartbeat=current_app.config['EVENTS_HEARTBEAT'],
+                                max_seconds=current_app.config['EVENTS_STREAM_SECONDS'])
+    response = Response(stream, mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Sin buffer en nginx
+    return response
+
+# API de consulta de tareas paginada por cursor, con el mismo orden y filtros que /tasks
+@bp.route('/api/v1/tasks', methods=['GET'])
+@login_required
+def api_list_tasks():
+    view = parse_task_view(request.args)
+    if view is None:
+        return jsonify({'error': "Parameter 'sort' must be priority, created or -created and 'priority' 1, 2 or 3."}), 400
+    after = request.args.get('after')
+    cursor = parse_cursor(after) if after else None
+    if after and cursor is None:
+        return jsonify({'error': 'Invalid cursor.'}), 400
+
+    limit = request.args.get('limit', type=int)
+    version = task_list_version(g.user['id'])
+    etag = task_list_etag(g.user['id'], version, 'json', task_view_key(view), cursor, page_size(limit))
+    cached_etag = matching_etag(etag)
+    if cached_etag:
+        return not_modified(cached_etag)
+    tasks, next_cursor = cached_task_page(g.user['id'], cursor, limit, view, version)
+    return revalidate_with(jsonify({'tasks': tasks, 'next_cursor': next_cursor}), etag)
+
+# Búsqueda de texto en las tareas del usuario, ordenada por relevancia y paginada por cursor
+def task_search_results(query, after, limit):
+    terms = parse_search_query(query)
+    cursor = parse_search_cursor(after) if after else None
+    if not terms:
+        return None, None, "Enter at least one word to search for."
+    if after and cursor is None:
+        return None, None, "Invalid cursor."
+    tasks, next_cursor = search_tasks(db.session, g.user['id'], terms, cursor, page_size(limit),
+                                      bind_arguments={'mapper': Task})
+    return tasks, next_cursor, None
+
+@bp.route('/tasks/search')
+@login_required
+def search():
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', type=int)
+    if not query.strip():
+        return render_template('search.html', query=query, tasks=[], next_cursor=None, limit=limit)
+    tasks, next_cursor, error = task_search_results(query, request.args.get('after'), limit)
+    return render_template('search.html', query=query, tasks=tasks or [], next_cursor=next_cursor, limit=limit,
+                           error=error), 400 if error else 200
+
+@bp.route('/api/v1/tasks/search', methods=['GET'])
+@login_required
+def api_search_tasks():
+    tasks, next_cursor, error = task_search_results(
+        request.args.get('q', ''), request.args.get('after'), request.args.get('limit', type=int))
+    if error:
+        return jsonify({'error': error}), 400
+    return jsonify({'tasks': tasks, 'next_cursor': next_cursor})
+
+# Contadores de la caché de tareas (aciertos, fallos, invalidaciones); solo para usuarios con sesión
+@bp.route('/api/v1/cache/stats', methods=['GET'])
+@login_required
+def api_cache_stats():
+    return jsonify(task_cache.stats())
+
+# Validación de los campos de una tarea recibidos por la API (mismas reglas que el formulario)
+def validate_task_fields(data, partial=False):
+    fields = {}
+    if 'task' in data or not partial:
+        task_name = data.get('task')
+        if not isinstance(task_name, str) or not task_name.strip() or len(task_name.strip()) > 255:
+            return None, "Field 'task' must be a non-empty string of at most 255 characters."
+        fields['task'] = task_name.strip()
+    if 'priority' in data or not partial:
+        priority = data.get('priority', 3)
+        if isinstance(priority, bool) or priority not in (1, 2, 3):
+            return None, "Field 'priority' must be 1, 2 or 3."
+        fields['priority'] = priority
+    if 'due_at' in data or not partial:
+        try:
+            fields['due_at'] = parse_due_at(data.get('due_at'))
+        except ValueError:
+            return None, "Field 'due_at' must be an ISO 8601 date and time, or null."
+    if not fields:
+        return None, "Nothing to update."
+    return fields, None
+
+# Ids de tarea: enteros de 64 bits con signo, como la columna (uno mayor desborda en el driver de SQLite)
+def valid_task_id(task_id):
+    return isinstance(task_id, int) and not isinstance(task_id, bool) and -MAX_TASK_ID - 1 <= task_id <= MAX_TASK_ID
+
+# Aplica una lista de operaciones (create/update/delete) en una sola transacción con
+# INSERT/UPDATE/DELETE masivos. Devuelve un resultado por operación, en el mismo orden.
+# Dentro de un lote se aplican primero las altas, luego las modificaciones y por último las bajas.
+def apply_task_batch(user_id, operations):
+    checked = []
+    for operation in operations:
+        op = operation.get('op') if isinstance(operation, dict) else None
+        if op not in ('create', 'update', 'delete'):
+            checked.append(({'status': 'invalid', 'error': "Field 'op' must be create, update or delete."}, None))
+            continue
+        if op != 'create' and not valid_task_id(operation.get('id')):
+            checked.append(({'status': 'invalid', 'error': "Field 'id' must be a 64-bit integer."}, None))
+            continue
+        fields = None
+        if op != 'delete':
+            fields, error = validate_task_fields(operation, partial=op == 'update')
+            if error:
+                checked.append(({'status': 'invalid', 'error': error}, None))
+                continue
+        checked.append((None, (op, operation.get('id'), fields)))
+
+    def work():
+        results = [dict(result) if result else None for result, _ in checked]
+        valid = [(index, item) for index, (_, item) in enumerate(checked) if item]
+        ids = {task_id for _, (op, task_id, _) in valid if op != 'create'}
+        owned = set()
+        if ids:
+            owned = set(db.session.scalars(db.select(Task.id).where(Task.user_id == user_id, Task.id.in_(ids))))
+
+        creates = [(index, fields) for index, (op, _, fields) in valid if op == 'create']
+        updates = [(index, task_id, fields) for index, (op, task_id, fields) in valid if op == 'update']
+        deletes = [(index, task_id) for index, (op, task_id, _) in valid if op == 'delete']
+
+        if creates:
+            new_ids = db.session.scalars(
+                db.insert(Task).returning(Task.id, sort_by_parameter_order=True),
+                [dict(fields, user_id=user_id) for _, fields in creates],
+            ).all()
+            for (index, _), task_id in zip(creates, new_ids):
+                results[index] = {'status': 'created', 'id': task_id}
+            record_scheduled_reminders(db.session, [
+                (fields['due_at'], task_id) for (_, fields), task_id in zip(creates, new_ids)])
+
+        # Cambiar la fecha límite vuelve a dejar pendiente el recordatorio
+        rows = [dict(fields, id=task_id, **({'reminded_at': None} if 'due_at' in fields else {}))
+                for _, task_id, fields in updates if task_id in owned]
+        if rows:
+            db.session.execute(db.update(Task), rows)
+            record_scheduled_reminders(db.session, [(row['due_at'], row['id']) for row in rows if 'due_at' in row])
+        for index, task_id, _ in updates:
+            results[index] = {'status': 'updated', 'id': task_id} if task_id in owned else {'status': 'not_found', 'id': task_id}
+
+        delete_ids = {task_id for _, task_id in deletes if task_id in owned}
+        if delete_ids:
+            db.session.execute(db.delete(Task).where(Task.user_id == user_id, Task.id.in_(delete_ids)))
+        for index, task_id in deletes:
+            results[index] = {'status': 'deleted', 'id': task_id} if task_id in owned else {'status': 'not_found', 'id': task_id}
+
+        # Las sentencias masivas no pasan por el flush del ORM: se marca al usuario para invalidar su caché
+        # y se anotan los cambios para el canal de eventos
+        if creates or rows or delete_ids:
+            db.session.info.setdefault('changed_task_users', set()).add(user_id)
+        record_task_changes(db.session, user_id, 'inserted', [
+            dict(fields, id=results[index]['id'], due_at=isoformat(fields['due_at'])) for index, fields in creates])
+        if rows and task_events.enabled:
+            updated = db.session.execute(
+                db.select(Task.id, Task.task, Task.priority, Task.due_at).where(Task.id.in_([row['id'] for row in rows])))
+            record_task_changes(db.session, user_id, 'updated', [task_row(row) for row in updated])
+        record_task_changes(db.session, user_id, 'deleted', [{'id': task_id} for task_id in sorted(delete_ids)])
+        return results
+
+    return commit(work)
+
+# Operaciones masivas: {"operations": [{"op": "create", "task": "...", "priority": 1}, ...]}
+@bp.route('/api/v1/tasks/batch', methods=['POST'])
+@login_required
+def api_batch_tasks():
+    data = request.get_json(silent=True)
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'error': "Field 'operations' must be a non-empty list."}), 400
+    if len(operations) > current_app.config['API_MAX_BATCH']:
+        return jsonify({'error': f"At most {current_app.config['API_MAX_BATCH']} operations per batch."}), 400
+
+    return jsonify({'results': apply_task_batch(g.user['id'], operations)})
+
+# Operaciones individuales: usan el mismo camino que los lotes
+API_STATUS_CODES = {'created': 201, 'updated': 200, 'deleted': 200, 'invalid': 400, 'not_found': 404}
+
+def api_single_operation(operation):
+    # Un id de la URL fuera de rango no puede ser una tarea: 404 como cualquier otra que no existe
+    if operation and operation['op'] != 'create' and not valid_task_id(operation['id']):
+        return jsonify({'status': 'not_found', 'id': operation['id']}), 404
+    result = apply_task_batch(g.user['id'], [operation])[0]
+    return jsonify(result), API_STATUS_CODES[result['status']]
+
+@bp.route('/api/v1/tasks', methods=['POST'])
+@login_required
+def api_create_task():
+    data = request.get_json(silent=True)
+    if 'task_writers' in current_app.extensions and isinstance(data, dict):
+        fields, error = validate_task_fields(data)
+        if error:
+            return jsonify({'status': 'invalid', 'error': error}), 400
+        return jsonify({'status': 'created', 'id': create_task(g.user['id'], fields)}), 201
+    return api_single_operation(dict(data, op='create') if isinstance(data, dict) else None)
+
+@bp.route('/api/v1/tasks/<int:task_id>', methods=['PATCH'])
+@login_required
+def api_update_task(task_id):
+    data = request.get_json(silent=True)
+    return api_single_operation(dict(data, op='update', id=task_id) if isinstance(data, dict) else None)
+
+@bp.route('/api/v1/tasks/<int:task_id>', methods=['DELETE'])
+@login_required
+def api_delete_task(task_id):
+    return api_single_operation({'op': 'delete', 'id': task_id})
+
+# Exportación e importación de tareas en CSV (con cabecera) o NDJSON (un objeto JSON por línea)
+TASK_FILE_FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+TASK_FILE_EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+TASK_EXPORT_COLUMNS = ('id', 'task', 'priority', 'due_at', 'created_at')
+TASK_IMPORT_FIELDS = ('task', 'priority', 'due_at')
+
+# Formato de un archivo: ?format=, extensión del nombre o tipo MIME; None si no se reconoce
+def task_file_format(filename=None, mimetype=None):
+    if 'format' in request.args:
+        return request.args['format'] if request.args['format'] in TASK_FILE_FORMATS else None
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension in TASK_FILE_EXTENSIONS:
+        return TASK_FILE_EXTENSIONS[extension]
+    return next((name for name, type_ in TASK_FILE_FORMATS.items() if type_ == mimetype), None)
+
+# "Archivo" de csv.writer que devuelve la línea en vez de escribirla: writerow() da la línea formateada
+class CsvLine:
+    def write(self, value):
+        return value
+
+# Líneas del archivo exportado, una por fila; las fechas en ISO 8601 (UTC)
+def task_export_lines(rows, file_format):
+    if file_format == 'csv':
+        writer = csv.writer(CsvLine())
+        yield writer.writerow(TASK_EXPORT_COLUMNS)
+        for row in rows:
+            yield writer.writerow((row.id, row.task, row.priority, isoformat(row.due_at) or '', isoformat(row.created_at)))
+    else:
+        for row in rows:
+            yield json.dumps(dict(task_row(row), created_at=isoformat(row.created_at))) + "\n"
+
+# Adaptador para TextIOWrapper de un flujo de bytes sin readable(): antes de Python 3.11 el
+# SpooledTemporaryFile en el que Werkzeug guarda los archivos subidos no lo tiene
+class ReadableStream(io.RawIOBase):
+    def __init__(self, stream):
+        self.stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+# Filas de un archivo de importación leídas según llegan: (línea, campos, error). Las columnas o claves que
+# no son campos de una tarea (id, created_at de una exportación) se ignoran. ValueError si el CSV no tiene
+# cabecera con la columna "task".
+def read_task_import(stream, file_format):
+    if not hasattr(stream, 'readable'):
+        stream = io.BufferedReader(ReadableStream(stream))
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if file_format == 'ndjson':
+        return (parse_import_line(number, line) for number, line in enumerate(text, 1) if line.strip())
+    reader = csv.DictReader(text)
+    if 'task' not in (reader.fieldnames or ()):
+        raise ValueError("The CSV header must include a 'task' column.")
+    return (validate_import_row(reader.line_num, {
+        # Celdas vacías: valor por defecto (prioridad 3, sin fecha límite)
+        field: int(value) if field == 'priority' and value.strip() in ('1', '2', '3') else value
+        for field, value in row.items() if field in TASK_IMPORT_FIELDS and value
+    }) for row in reader)
+
+def parse_import_line(number, line):
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return number, None, "Invalid JSON."
+    if not isinstance(data, dict):
+        return number, None, "Each line must be a JSON object."
+    return validate_import_row(number, data)
+
+def validate_import_row(number, data):
+    fields, error = validate_task_fields({field: data[field] for field in TASK_IMPORT_FIELDS if field in data})
+    return number, fields, error
+
+# Inserta un lote de tareas importadas en una transacción. Antes de cada lote se vuelve a mirar el shard del
+# usuario: si un rebalanceo lo está moviendo, ShardMoving corta la importación (el rebalanceo espera su
+# periodo de gracia, más largo que un lote, antes de copiar). Para que SQLAlchemy envíe unas 1000 filas por
+# sentencia:
+# - RETURNING devuelve las columnas de cada fila en vez de solo los ids en el orden de entrada (con
+#   sort_by_parameter_order hace un INSERT por fila en SQLite).
+# - render_nulls: sin él, las filas sin fecha límite omiten la columna y el lote se parte en un INSERT por
+#   cada racha de filas con las mismas columnas.
+def insert_imported_tasks(user_id, rows):
+    use_task_shard(user_id)
+
+    def work():
+        inserted = db.session.execute(
+            db.insert(Task).returning(Task.id, Task.task, Task.priority, Task.due_at).execution_options(render_nulls=True),
+            [dict(fields, user_id=user_id) for fields in rows]).all()
+        db.session.info.setdefault('changed_task_users', set()).add(user_id)
+        record_task_changes(db.session, user_id, 'inserted', [task_row(row) for row in inserted])
+        record_scheduled_reminders(db.session, [(row.due_at, row.id) for row in inserted])
+        return len(inserted)
+
+    return commit(work)
+
+# Importa las filas por lotes y genera el progreso: un objeto por lote confirmado y uno final con "done".
+# "line" es la última línea del archivo incluida en un lote confirmado: si la importación se corta, el
+# resto del archivo se puede volver a enviar desde ahí. Las filas no válidas se saltan y se cuentan; las
+# primeras `max_errors` se detallan en el resultado final.
+def import_tasks(user_id, rows, batch_size, max_errors):
+    started = time.perf_counter()
+    progress = {'line': 0, 'imported': 0, 'invalid': 0}
+    errors, batch, line, failure = [], [], 0, None
+    try:
+        for line, fields, error in rows:
+            if error:
+                progress['invalid'] += 1
+                if len(errors) < max_errors:
+                    errors.append({'line': line, 'error': error})
+                continue
+            batch.append(fields)
+            if len(batch) >= batch_size:
+                progress['imported'] += insert_imported_tasks(user_id, batch)
+                progress['line'], batch = line, []
+                yield dict(progress)
+        if batch:
+            progress['imported'] += insert_imported_tasks(user_id, batch)
+        progress['line'] = line
+    except UnicodeDecodeError:
+        failure = "The file must be UTF-8 text."
+    except csv.Error as error:
+        failure = f"Invalid CSV: {error}"
+    except ShardMoving:
+        failure = "Your tasks are being moved, try again shortly."
+    result = dict(progress, done=True, errors=errors, seconds=round(time.perf_counter() - started, 3))
+    if failure:
+        result['error'] = failure
+    yield result
+
+# Todas las tareas del usuario (con el orden y filtros de /tasks) en streaming, leídas por lotes del cursor
+# como /tasks?limit=all: la memoria no crece con el número de tareas
+@bp.route('/tasks/export')
+@login_required
+def export_tasks():
+    file_format = task_file_format() if 'format' in request.args else 'csv'
+    view = parse_task_view(request.args)
+    if file_format is None or view is None:
+        return jsonify({'error': "Parameter 'format' must be csv or ndjson, with the sort and filters of /tasks."}), 400
+
+    etag = task_list_etag(g.user['id'], task_list_version(g.user['id']), 'export', file_format, task_view_key(view))
+    cached_etag = matching_etag(etag)
+    if cached_etag:
+        return not_modified(cached_etag)
+    rows = iter_task_rows(g.user['id'], current_app.config['TASKS_STREAM_BATCH'], view)
+    lines = task_export_lines(rows, file_format)
+    response = Response(stream_with_context(buffered_chunks(lines, current_app.config['TASKS_STREAM_CHUNK'])),
+                        mimetype=TASK_FILE_FORMATS[file_format])
+    response.headers['Content-Disposition'] = f'attachment; filename="tasks.{file_format}"'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return revalidate_with(response, etag)
+
+# Importación de un archivo CSV o NDJSON: subido como campo "file" de un formulario multipart o como cuerpo
+# de la petición (Content-Type text/csv o application/x-ndjson). La respuesta es NDJSON en streaming con el
+# progreso de cada lote (TASK_IMPORT_BATCH filas por transacción).
+@bp.route('/tasks/import', methods=['POST'])
+@login_required
+def import_tasks_file():
+    upload = request.files.get('file')
+    if upload is not None:
+        stream, file_format = upload.stream, task_file_format(upload.filename, upload.mimetype)
+    else:
+        stream, file_format = request.stream, task_file_format(mimetype=request.mimetype)
+    if file_format is None:
+        return jsonify({'error': "Send a .csv or .ndjson file, or set 'format' to csv or ndjson."}), 400
+    try:
+        rows = read_task_import(stream, file_format)
+    except (ValueError, csv.Error) as error:
+        # UnicodeDecodeError también es un ValueError
+        return jsonify({'error': "The file must be UTF-8 text." if isinstance(error, UnicodeDecodeError) else str(error)}), 400
+
+    progress = import_tasks(g.user['id'], rows, current_app.config['TASK_IMPORT_BATCH'],
+                            current_app.config['TASK_IMPORT_MAX_ERRORS'])
+    response = Response(stream_with_context(json.dumps(update) + "\n" for update in progress),
+                        mimetype='application/x-ndjson')
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 # Editar una tarea
-@app.route('/edit_task/<int:task_id>', methods=['POST'])
+@bp.route('/edit_task/<int:task_id>', methods=['POST'])
+@login_required
 def edit_task(task_id):
-    task = db.session.get(Task, task_id)
+    task = db.session.get(Task, task_id) if valid_task_id(task_id) else None
 
-    if task and task.user_id == session['user_id']:
+    if task and task.user_id == g.user['id']:
         new_task_name = request.form['task'].strip()
         new_priority = request.form['priority'].strip()
+        new_due_at = task.due_at
+        if 'due_at' in request.form:
+            try:
+                new_due_at = parse_due_at(request.form['due_at'])
+            except ValueError:
+                tasks, next_cursor = cached_task_page(g.user['id'], version=task_list_version(g.user['id']))
+                return render_template('tasks.html', tasks=tasks, next_cursor=next_cursor, error="Invalid due date.")
 
         if not new_task_name or not new_priority:
-            tasks = Task.query.filter_by(user_id=session['user_id']).all()
-            return render_template('tasks.html', tasks=tasks, error="Fields cannot be empty.")
+            tasks, next_cursor = cached_task_page(g.user['id'], version=task_list_version(g.user['id']))
+            return render_template('tasks.html', tasks=tasks, next_cursor=next_cursor, error="Fields cannot be empty.")
 
-        task.task = new_task_name
-        task.priority = int(new_priority)
-        db.session.commit()
+        def apply_changes():
+            task.task = new_task_name
+            task.priority = int(new_priority)
+            # Con otra fecha límite el recordatorio vuelve a quedar pendiente
+            if new_due_at != task.due_at:
+                task.due_at = new_due_at
+                task.reminded_at = None
+
+        commit(apply_changes)
     return redirect('/tasks')
 
 # Eliminar una tarea
-@app.route('/delete_task/<int:task_id>')
+@bp.route('/delete_task/<int:task_id>')
+@login_required
 def delete_task(task_id):
-    task = db.session.get(Task, task_id)
-    if task and task.user_id == session['user_id']:
-        db.session.delete(task)
-        db.session.commit()
+    task = db.session.get(Task, task_id) if valid_task_id(task_id) else None
+    if task and task.user_id == g.user['id']:
+        commit(lambda: db.session.delete(task))
     return redirect('/tasks')
 
-# Logout
-@app.route('/logout')
+# Logout (con ?all=1 se revocan todas las sesiones del usuario, solo con sesiones en el servidor)
+@bp.route('/logout')
 def logout():
-    session.pop('user_id', None)
+    user_id = session.get('user_id')
+    if user_id is not None and request.args.get('all'):
+        current_app.session_interface.revoke_user(user_id)
+    session.clear()
     return redirect('/login')
 
-if __name__ == '__main__':
-    app.run(debug=os.getenv("FLASK_DEBUG", "False") == "True")
-
-
-@app.route('/weatherstack', methods=['GET'])
+@bp.route('/weatherstack', methods=['GET'])
 def get_weatherstack():
+    import requests
+    from weather import WeatherError
+
     city = request.args.get('city', 'Guadalajara')  # Ciudad por defecto
-    api_key = os.getenv('WEATHERSTACK_API_KEY')
-    url = f"http://api.weatherstack.com/current?access_key={api_key}&query={city}"
 
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        weather_data = response.json()
-
-        # Extraer datos relevantes de la respuesta
-        weather = {
-            'city': weather_data['location']['name'],
-            'temperature': weather_data['current']['temperature'],
-            'description': weather_data['current']['weather_descriptions'][0],
-            'icon': weather_data['current']['weather_icons'][0]
-        }
-
+        weather = weatherstack_client(current_app).get(city)
         return render_template('weatherstack.html', weather=weather)
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, WeatherError) as e:
         return f'Error fetching weather data: {e}', 500
+
+def init_task_events(app):
+    task_events.configure(
+        create_event_backend(app.config),
+        buffer_size=app.config['EVENTS_BUFFER_SIZE'],
+        max_streams=app.config['EVENTS_MAX_STREAMS'],
+    )
+
+# Group commit de altas de tareas (TASK_GROUP_COMMIT): uno por shard (None sin shards)
+def init_task_writer(app):
+    app.extensions.pop('task_writers', None)
+    if app.config['TASK_GROUP_COMMIT']:
+        shards = app.extensions.get('task_shards')
+        app.extensions['task_writers'] = {
+            shard: GroupCommitter(
+                lambda rows, shard=shard: insert_task_batch(app, rows, shard),
+                max_rows=app.config['TASK_GROUP_COMMIT_ROWS'],
+                max_delay=app.config['TASK_GROUP_COMMIT_MS'] / 1000,
+            )
+            for shard in (shards.engines if shards else [None])
+        }
+
+# Recordatorios: las próximas tareas con recordatorio pendiente, leídas en orden del índice parcial
+# ix_task_due_pending (sin recorrer la tabla ni las tareas ya avisadas)
+def pending_reminders_query(limit):
+    return (db.select(Task.due_at, Task.id)
+            .where(Task.due_at.is_not(None), Task.reminded_at.is_(None))
+            .order_by(Task.due_at)
+            .limit(limit))
+
+# Con shards, los próximos `limit` de cada shard mezclados en orden
+def load_pending_reminders(app, limit):
+    with app.app_context():
+        shards = app.extensions.get('task_shards')
+        if shards is None:
+            return db.session.execute(pending_reminders_query(limit)).all()
+        return list(heapq.merge(*[
+            [(due_at, (shard, task_id)) for due_at, task_id in rows]
+            for shard, rows in shards.scatter(pending_reminders_query(limit), shards=shards.engines)
+        ]))[:limit]
+
+# Reclama los recordatorios vencidos con un UPDATE condicional: solo devuelve las filas que este proceso
+# marcó como enviadas (otro proceso pudo adelantarse, o la fecha pudo cambiar después de cargarla)
+REMINDER_CLAIM_CHUNK = 500
+
+def claim_reminders(app, task_ids, now):
+    with app.app_context():
+        shards = app.extensions.get('task_shards')
+        if shards is None:
+            reminders = [row._asdict() for row in claim_shard_reminders(app, task_ids, now)]
+        else:
+            # Con shards, las claves son (shard, id): una transacción por shard. Se descartan las copias
+            # viejas de usuarios ya movidos a otro shard que un rebalanceo cortado no llegó a borrar.
+            shards.map.refresh()
+            by_shard = {}
+            for shard, task_id in task_ids:
+                by_shard.setdefault(shard, []).append(task_id)
+            reminders = []
+            for shard, ids in sorted(by_shard.items()):
+                db.session.info['task_shard'] = shard
+                reminders += [dict(row._asdict(), shard=shard) for row in claim_shard_reminders(app, ids, now)
+                              if shards.map.placement(row.user_id) == shard]
+    return sorted(reminders, key=lambda reminder: (reminder['due_at'], reminder['id']))
+
+def claim_shard_reminders(app, task_ids, now):
+    def work():
+        claimed = []
+        for start in range(0, len(task_ids), REMINDER_CLAIM_CHUNK):
+            claimed += db.session.execute(
+                db.update(Task)
+                .where(Task.id.in_(task_ids[start:start + REMINDER_CLAIM_CHUNK]), Task.due_at <= now,
+                       Task.reminded_at.is_(None))
+                .values(reminded_at=now)
+                .returning(Task.id, Task.user_id, Task.task, Task.due_at)
+                .execution_options(synchronize_session=False)
+            ).all()
+        return claimed
+
+    return commit_with_retry(db.session, work, attempts=app.config['DB_COMMIT_ATTEMPTS'])
+
+# Planificador de recordatorios (REMINDERS_ENABLED): un hilo por proceso, arrancado en cada worker de
+# gunicorn (post_worker_init) o con el servidor de desarrollo
+def start_reminders(app):
+    if not app.config['REMINDERS_ENABLED']:
+        return None
+    scheduler = ReminderScheduler(
+        lambda limit: load_pending_reminders(app, limit),
+        lambda task_ids, now: claim_reminders(app, task_ids, now),
+        create_notifier(app.config, app.logger),
+        capacity=app.config['REMINDER_HEAP_SIZE'],
+        poll_interval=app.config['REMINDER_POLL_INTERVAL'],
+        workers=app.config['REMINDER_WORKERS'],
+        max_pending=app.config['REMINDER_MAX_PENDING'],
+    )
+    app.extensions['reminders'] = scheduler.start()
+    return scheduler
+
+# Shards de tareas (TASK_SHARDS): tasks-0.db ... tasks-<N-1>.db en TASK_SHARD_DIR, con el mismo pool y
+# perfil de SQLite que la base de datos principal. Su esquema sigue al de la base de datos principal (ver
+# migrate_task_shard()).
+def task_shard_names(config):
+    return [str(index) for index in range(config['TASK_SHARDS'])]
+
+def create_shard_engine(config, name):
+    uri = f"sqlite:///{os.path.join(config['TASK_SHARD_DIR'], f'tasks-{name}.db')}"
+    engine = create_engine(uri, **engine_options(
+        uri, config['DB_POOL_SIZE'], config['DB_MAX_OVERFLOW'], config['DB_POOL_TIMEOUT'], config['DB_POOL_RECYCLE']))
+    apply_sqlite_profile(engine, config['SQLITE_PROFILE'])
+    return engine
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+# Revisión de Alembic de una base de datos; None si no está versionada (creada con db.create_all())
+def database_revision(engine):
+    from alembic.migration import MigrationContext
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+# Lleva un shard a la revisión de la base de datos principal con las mismas migraciones (un shard nuevo
+# las recorre todas; sus tablas de usuarios quedan vacías). Sin migraciones en la principal, las tablas
+# repartidas se crean desde los modelos como hace db.create_all(). Un shard con otra historia (sin versión
+# pero con tablas, o en una revisión posterior) impide arrancar: su esquema no es el que espera el código.
+def migrate_task_shard(engine, name, revision):
+    current = database_revision(engine)
+    if current == revision:
+        if revision is None:
+            db.metadata.create_all(engine, tables=SHARDED_TABLES)
+        return
+    if revision is None or (current is None and db.inspect(engine).has_table(Task.__tablename__)):
+        raise RuntimeError(f"Shard {name} is at revision {current} but the main database is at {revision}.")
+
+    from alembic.config import Config
+    from alembic.runtime.environment import EnvironmentContext
+    from alembic.script import ScriptDirectory
+    config = Config()
+    config.set_main_option('script_location', MIGRATIONS_DIR)
+    script = ScriptDirectory.from_config(config)
+    with engine.connect() as connection, EnvironmentContext(
+            config, script, fn=lambda rev, context: script._upgrade_revs(revision, rev)) as environment:
+        environment.configure(connection=connection, target_metadata=db.metadata, include_name=include_search_objects)
+        with environment.begin_transaction():
+            environment.run_migrations()
+
+def init_task_shards(app):
+    app.extensions.pop('task_shards', None)
+    if not app.config['TASK_SHARDS']:
+        return None
+    names = task_shard_names(app.config)
+    os.makedirs(app.config['TASK_SHARD_DIR'], exist_ok=True)
+    engines = {MAIN: db.engine, **{name: create_shard_engine(app.config, name) for name in names}}
+    # Todos los workers arrancan a la vez: uno migra cada shard y el resto lo encuentra al día
+    revision = database_revision(db.engine)
+    with file_lock(os.path.join(app.config['TASK_SHARD_DIR'], 'migrate.lock')):
+        for name in names:
+            migrate_task_shard(engines[name], name, revision)
+    # Al activar el reparto, los usuarios con tareas en la base de datos principal siguen leyéndolas de
+    # ella hasta que `flask --app app shards rebalance` las mueva
+    path = app.config['TASK_SHARD_MAP']
+    main_users = () if os.path.exists(path) else users_on_engine(db.engine)
+    shards = TaskShards(ShardMap.open(path, names, main_users), engines, SHARDED_TABLES)
+    unknown = set(shards.map.shards) - set(names)
+    if unknown:
+        raise RuntimeError(f"Shard map {path} uses shards {sorted(unknown)} but TASK_SHARDS is {len(names)}.")
+    if len(shards.map.shards) < len(names):
+        app.logger.warning("Shards %s are not in the shard map yet: run `flask --app app shards rebalance`.",
+                           ", ".join(name for name in names if name not in shards.map.shards))
+    app.extensions['task_shards'] = shards
+    return shards
+
+# Usuarios con tareas o con versión de la lista en una base de datos (un shard o la principal)
+def users_on_engine(engine):
+    if not db.inspect(engine).has_table(Task.__tablename__):
+        return []
+    with engine.connect() as connection:
+        users = set(connection.scalars(db.select(Task.user_id).distinct()))
+        users.update(connection.scalars(db.select(TaskListVersion.user_id)))
+    return sorted(users)
+
+# Mueve las filas de un usuario de un shard a otro (rebalanceo). El origen se lee con DELETE ... RETURNING,
+# que bloquea su escritura hasta el final: ninguna escritura (un recordatorio reclamado, p. ej.) se pierde
+# entre la copia y el borrado. Se confirma el destino, se apunta el usuario al destino en el mapa (switch)
+# y solo entonces se confirma el borrado del origen. Los ids de las tareas son nuevos en el destino y la
+# versión de la lista sube, así que las páginas y ETags anteriores dejan de valer.
+SHARD_MOVE_CHUNK = 5000
+
+def move_user_tasks(app, user_id, source, target, switch):
+    shards = app.extensions['task_shards']
+    with shards.engines[source].connect() as source_connection:
+        tasks = source_connection.execute(
+            db.delete(Task).where(Task.user_id == user_id).returning(*Task.__table__.columns)).mappings().all()
+        version = source_connection.scalar(
+            db.delete(TaskListVersion).where(TaskListVersion.user_id == user_id).returning(TaskListVersion.version))
+        with shards.engines[target].begin() as target_connection:
+            # Restos de un movimiento anterior cortado antes de apuntar el usuario al destino
+            target_connection.execute(db.delete(Task).where(Task.user_id == user_id))
+            target_connection.execute(db.delete(TaskListVersion).where(TaskListVersion.user_id == user_id))
+            rows = [{key: value for key, value in task.items() if key != 'id'} for task in tasks]
+            for start in range(0, len(rows), SHARD_MOVE_CHUNK):
+                target_connection.execute(db.insert(Task), rows[start:start + SHARD_MOVE_CHUNK])
+            target_connection.execute(db.insert(TaskListVersion), {'user_id': user_id, 'version': (version or 0) + 1})
+        switch()
+        source_connection.commit()
+    task_cache.invalidate(user_id)
+    return len(tasks)
+
+def purge_user_tasks(app, user_id, shard):
+    with app.extensions['task_shards'].engines[shard].begin() as connection:
+        connection.execute(db.delete(Task).where(Task.user_id == user_id))
+        connection.execute(db.delete(TaskListVersion).where(TaskListVersion.user_id == user_id))
+
+def rebalance_task_shards(app, grace=30, batch=1000, log=None):
+    shards = app.extensions['task_shards']
+    return rebalance(
+        shards.map, task_shard_names(app.config),
+        users_on=lambda shard: users_on_engine(shards.engines[shard]),
+        move=lambda user_id, source, target, switch: move_user_tasks(app, user_id, source, target, switch),
+        purge=lambda user_id, shard: purge_user_tasks(app, user_id, shard),
+        grace=grace, batch=batch, log=log,
+    )
+
+# Administración de los shards: flask --app app shards rebalance|stats|query
+shards_cli = AppGroup('shards', help="Manage the per-user task shards (TASK_SHARDS).")
+
+def cli_task_shards():
+    shards = current_app.extensions.get('task_shards')
+    if shards is None:
+        raise click.ClickException("Task sharding is off (TASK_SHARDS=0).")
+    return shards
+
+@shards_cli.command('rebalance')
+@click.option('--grace', default=30.0, show_default=True,
+              help="Seconds to wait after marking users as moving, for requests that started before.")
+@click.option('--batch', default=1000, show_default=True, help="Users marked as moving at a time.")
+def rebalance_command(grace, batch):
+    """Add the configured shards to the ring and move each user to their shard."""
+    cli_task_shards()
+    moved = rebalance_task_shards(current_app._get_current_object(), grace, batch, log=click.echo)
+    click.echo(f"{moved} users moved.")
+
+@shards_cli.command('stats')
+def stats_command():
+    """Users, tasks and pending reminders per shard."""
+    shards = cli_task_shards()
+    statement = db.select(db.func.count(db.distinct(Task.user_id)), db.func.count(Task.id),
+                          db.func.count(Task.id).filter(Task.due_at.is_not(None), Task.reminded_at.is_(None)))
+    click.echo(f"{'shard':>6} {'users':>10} {'tasks':>12} {'reminders':>10}")
+    for shard, rows in shards.scatter(statement, shards=shards.engines):
+        users, tasks, reminders = rows[0]
+        click.echo(f"{shard:>6} {users:>10} {tasks:>12} {reminders:>10}")
+    shard_map = shards.map
+    click.echo(f"ring: {', '.join(shard_map.shards)}; pinned: {len(shard_map.pinned)}, "
+               f"moving: {len(shard_map.moving)}, cleanup: {len(shard_map.cleanup)}")
+
+@shards_cli.command('query')
+@click.argument('sql')
+def query_command(sql):
+    """Run a read-only SQL query on every shard; each row is prefixed with its shard."""
+    shards = cli_task_shards()
+    for shard, rows in shards.scatter(db.text(sql)):
+        for row in rows:
+            click.echo("\t".join([shard, *(str(value) for value in row)]))
+
+# Recursos estáticos con hash y bytecode de las plantillas: flask --app app assets build (p. ej. al
+# desplegar, antes de arrancar gunicorn). El arranque solo construye si static/ cambió desde la última vez.
+assets_cli = AppGroup('assets', help="Build the fingerprinted static files and the template bytecode.")
+
+@assets_cli.command('build')
+def build_assets_command():
+    """Rebuild STATIC_BUILD_DIR and TEMPLATE_CACHE_DIR, removing the files of earlier builds."""
+    app = current_app._get_current_object()
+    if app.config['STATIC_PIPELINE']:
+        manifest = build_assets(app.static_folder, app.config['STATIC_BUILD_DIR'])
+        click.echo(f"{len(manifest)} static files built in {app.config['STATIC_BUILD_DIR']}.")
+    # Las plantillas ya cargadas al crear la aplicación se vuelven a compilar y a guardar
+    app.jinja_env.cache.clear()
+    precompile_templates(app)
+    click.echo(f"{len(app.jinja_env.list_templates())} templates compiled in {app.config['TEMPLATE_CACHE_DIR']}.")
+
+# Cliente de Weatherstack (con métricas activas se mide cada llamada a la API)
+def init_weatherstack(app):
+    from weather import WeatherClient
+    client = WeatherClient.from_config(app.config)
+    if 'metrics' in app.extensions:
+        client.session.hooks['response'].append(app.extensions['metrics'].requests_hook('weatherstack'))
+    app.extensions['weatherstack'] = client
+    return client
+
+# El cliente se crea con la primera consulta del tiempo
+def weatherstack_client(app):
+    with integrations_lock:
+        return app.extensions.get('weatherstack') or init_weatherstack(app)
+
+# Caché de metadatos OpenID y JWKS de Google (con métricas activas se mide cada descarga); None si
+# OAUTH_METADATA_CACHE está desactivada
+def init_oauth_metadata(app):
+    cache = None
+    if app.config['OAUTH_METADATA_CACHE']:
+        from oidc import ProviderMetadataCache
+        cache = ProviderMetadataCache.from_config(app.config, app.config['OAUTH_CACHE_PATH'])
+        if 'metrics' in app.extensions:
+            cache.session.hooks['response'].append(app.extensions['metrics'].requests_hook('google'))
+    app.extensions['oidc_metadata'] = cache
+    return cache
+
+# La caché se crea con el primer uso del cliente de Google o en el arranque del worker (warm_up_oauth)
+def oauth_metadata(app):
+    with integrations_lock:
+        if 'oidc_metadata' not in app.extensions:
+            init_oauth_metadata(app)
+        return app.extensions['oidc_metadata']
+
+# Arranque de un worker (gunicorn post_worker_init): carga los metadatos y el JWKS antes de la primera
+# petición, desde el archivo compartido si otro worker ya los descargó. Un fallo no impide arrancar: la
+# primera petición de login volverá a intentarlo.
+def warm_up_oauth(app):
+    if not app.config['OAUTH_WARM_UP'] or not app.config['GOOGLE_CLIENT_ID']:
+        return False
+    cache = oauth_metadata(app)
+    if cache is None:
+        return False
+    import requests
+    from oidc import ProviderMetadataError
+    try:
+        cache.warm_up()
+    except (requests.exceptions.RequestException, ProviderMetadataError) as error:
+        app.logger.warning("OAuth metadata warm-up failed: %s", error)
+        return False
+    return True
+
+# Flask-Migrate (y con él Alembic) solo hace falta para `flask --app app db ...`; fuera del CLI de Flask
+# se registra con init_migrations() (p. ej. benchmarks/suite/seed.py antes de upgrade())
+def init_migrations(app):
+    if 'migrate' not in app.extensions:
+        from flask_migrate import Migrate
+        Migrate(app, db, include_name=include_search_objects)
+
+# Hash de contraseñas en un pool acotado y límites de intentos de login
+def init_login_security(app):
+    app.extensions['password_hasher'] = PasswordHasher(
+        app.config['PASSWORD_HASH_METHOD'],
+        workers=app.config['PASSWORD_HASH_WORKERS'],
+        max_pending=app.config['PASSWORD_HASH_MAX_PENDING'],
+    )
+    app.extensions['login_limiters'] = {
+        'ip': RateLimiter(app.config['LOGIN_RATE_LIMIT_IP'], app.config['LOGIN_RATE_WINDOW']),
+        'username': RateLimiter(app.config['LOGIN_RATE_LIMIT_USER'], app.config['LOGIN_RATE_WINDOW']),
+    }
+
+# Fábrica de la aplicación: la usan el servidor de desarrollo, gunicorn (wsgi.py) y las pruebas
+def create_app(config=None):
+    app = Flask(__name__)
+    app.secret_key = os.getenv("FLASK_SECRET_KEY")
+
+    # Configuración desde config.py (variables de entorno); base de datos SQLite por defecto,
+    # PostgreSQL con SQLALCHEMY_DATABASE_URI
+    app.config.from_object('config')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config.update(config or {})
+    app.config['SESSION_STORE_PATH'] = app.config['SESSION_STORE_PATH'] or os.path.join(app.instance_path, 'sessions.db')
+    app.config['PROFILE_DIR'] = app.config['PROFILE_DIR'] or os.path.join(app.instance_path, 'profiles')
+    app.config['OAUTH_CACHE_PATH'] = app.config['OAUTH_CACHE_PATH'] or os.path.join(app.instance_path, 'oauth_metadata.json')
+    app.config['STATIC_BUILD_DIR'] = app.config['STATIC_BUILD_DIR'] or os.path.join(app.instance_path, 'static')
+    app.config['TEMPLATE_CACHE_DIR'] = app.config['TEMPLATE_CACHE_DIR'] or os.path.join(app.instance_path, 'templates')
+    app.config['REMINDER_LOG_PATH'] = app.config['REMINDER_LOG_PATH'] or os.path.join(app.instance_path, 'reminders.jsonl')
+    if app.config['TASK_SHARDS']:
+        app.config['TASK_SHARD_DIR'] = app.config['TASK_SHARD_DIR'] or os.path.join(app.instance_path, 'shards')
+        app.config['TASK_SHARD_MAP'] = app.config['TASK_SHARD_MAP'] or os.path.join(app.config['TASK_SHARD_DIR'], 'shard_map.json')
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(
+        app.config['SQLALCHEMY_DATABASE_URI'], app.config['DB_POOL_SIZE'], app.config['DB_MAX_OVERFLOW'],
+        app.config['DB_POOL_TIMEOUT'], app.config['DB_POOL_RECYCLE']))
+
+    db.init_app(app)
+    with app.app_context():
+        apply_sqlite_profile(db.engine, app.config['SQLITE_PROFILE'])
+        shards = init_task_shards(app)
+        if app.config['METRICS_ENABLED']:
+            metrics = create_request_metrics(app.config)
+            metrics.init_app(app, db.engine)
+            for shard, engine in (shards.engines.items() if shards else ()):
+                if shard != MAIN:
+                    metrics.instrument(engine)
+    task_cache.backend = create_cache_backend(app.config)
+    init_task_events(app)
+    init_task_writer(app)
+    init_login_security(app)
+    if app.config['SESSION_BACKEND'] == 'sqlite':
+        os.makedirs(os.path.dirname(app.config['SESSION_STORE_PATH']), exist_ok=True)
+    app.session_interface = create_session_interface(app.config)
+    # Cargada desde el CLI de Flask (flask --app app db upgrade, flask run, ...): registrar las migraciones
+    if click.get_current_context(silent=True) is not None:
+        init_migrations(app)
+    app.register_blueprint(bp)
+    app.cli.add_command(shards_cli)
+    app.cli.add_command(assets_cli)
+    if app.config['STATIC_PIPELINE']:
+        init_static_assets(app)
+    precompile_templates(app)
+    app.extensions['render_version'] = render_version(app)
+    if app.config['COMPRESS_RESPONSES']:
+        create_response_compressor(app.config).init_app(app)
+
+    # El esquema se gestiona con migraciones versionadas: flask --app app db upgrade
+    return app
+
+# Después de un fork (workers de gunicorn con preload_app) el proceso hijo no debe reutilizar
+# las conexiones abiertas por el proceso maestro (base de datos, caché y sesiones HTTP de Weatherstack y
+# de los metadatos de OAuth). El cliente OAuth de Authlib crea su sesión HTTP en cada llamada.
+def reset_after_fork(app):
+    with app.app_context():
+        db.engine.dispose(close=False)
+    shards = app.extensions.get('task_shards')
+    for shard, engine in (shards.engines.items() if shards else ()):
+        if shard != MAIN:
+            engine.dispose(close=False)
+    task_cache.backend = create_cache_backend(app.config)
+    init_task_events(app)
+    init_task_writer(app)
+    # Los clientes de Weatherstack y de los metadatos de OAuth se vuelven a crear con el primer uso
+    app.extensions.pop('weatherstack', None)
+    app.extensions.pop('oidc_metadata', None)
+    init_login_security(app)
+
+app = create_app()
+
+if __name__ == '__main__':
+    start_reminders(app)
+    app.run(debug=os.getenv("FLASK_DEBUG", "False") == "True")
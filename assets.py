@@ -0,0 +1,218 @@
+import contextlib
+import fnmatch
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import tempfile
+
+from flask import current_app, request, send_file
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.exceptions import NotFound
+
+# Pipeline de recursos estáticos: `flask --app app assets build` (o el arranque, si static/ cambió desde
+# la última construcción) copia cada archivo de static/ a STATIC_BUILD_DIR con el hash de su contenido en el nombre (styles/tasks.css -> styles/tasks.3f9a0c1b2d4e.css), el CSS se minifica
+# y los formatos de texto se precomprimen (.gz y, si el paquete brotli está instalado, .br).
+# url_for('static', ...) devuelve el nombre con hash, que se sirve con caché de un año: un cambio en el
+# archivo cambia su URL, así que nunca hace falta revalidarlo.
+MANIFEST = 'manifest.json'
+COMPRESSIBLE = ('.css', '.js', '.svg', '.json', '.txt')
+# Codificaciones precomprimidas, en orden de preferencia a igual calidad en Accept-Encoding
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+# Por debajo de este tamaño la versión comprimida no ahorra nada apreciable
+MIN_COMPRESS_SIZE = 256
+
+CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+CSS_SPACE = re.compile(r'\s+')
+# Solo se quitan los espacios que nunca separan nada: alrededor de { } ; , y después de ":" (antes no,
+# porque "a :hover" y "a:hover" son selectores distintos)
+CSS_PUNCTUATION = re.compile(r'\s*([{};,])\s*')
+CSS_COLON = re.compile(r':\s+')
+
+
+def minify_css(source):
+    source = CSS_COMMENT.sub('', source)
+    source = CSS_SPACE.sub(' ', source)
+    source = CSS_PUNCTUATION.sub(r'\1', source)
+    source = CSS_COLON.sub(':', source)
+    return source.replace(';}', '}').strip()
+
+
+def fingerprint(path, content):
+    stem, extension = os.path.splitext(path)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{extension}"
+
+
+# Escritura atómica: varios workers sin preload pueden construir los mismos archivos a la vez
+def write_file(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    with os.fdopen(descriptor, 'wb') as file:
+        file.write(content)
+    os.replace(temporary, path)
+
+
+def compressors():
+    found = {'gzip': lambda content: gzip.compress(content, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        return found
+    found['br'] = lambda content: brotli.compress(content, quality=11)
+    return found
+
+
+# Construye los recursos de source_dir en build_dir y devuelve el manifiesto
+# {ruta original: {'path': ruta con hash, 'encodings': [...]}}. Los archivos ya construidos (mismo hash)
+# no se vuelven a escribir y los de construcciones anteriores que ya no están en el manifiesto se borran.
+def build_assets(source_dir, build_dir):
+    manifest = {}
+    encoders = compressors()
+    for directory, _, names in os.walk(source_dir):
+        for name in sorted(names):
+            source = os.path.join(directory, name)
+            logical = os.path.relpath(source, source_dir).replace(os.sep, '/')
+            with open(source, 'rb') as file:
+                content = file.read()
+            extension = os.path.splitext(name)[1].lower()
+            if extension == '.css':
+                content = minify_css(content.decode('utf-8')).encode('utf-8')
+            built = fingerprint(logical, content)
+            target = os.path.join(build_dir, built)
+            encodings = []
+            if extension in COMPRESSIBLE and len(content) >= MIN_COMPRESS_SIZE:
+                for encoding, compress in encoders.items():
+                    if not os.path.exists(target + SUFFIXES[encoding]):
+                        write_file(target + SUFFIXES[encoding], compress(content))
+                    encodings.append(encoding)
+            if not os.path.exists(target):
+                write_file(target, content)
+            manifest[logical] = {'path': built, 'encodings': encodings}
+    write_file(os.path.join(build_dir, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode())
+    prune_build(build_dir, manifest)
+    return manifest
+
+
+def prune_build(build_dir, manifest):
+    current = {MANIFEST}
+    for entry in manifest.values():
+        current.add(entry['path'])
+        current.update(entry['path'] + SUFFIXES[encoding] for encoding in entry['encodings'])
+    for directory, _, names in os.walk(build_dir):
+        for name in names:
+            path = os.path.join(directory, name)
+            # Los temporales son de otro proceso que está construyendo a la vez
+            if name.startswith('.tmp-') or os.path.relpath(path, build_dir).replace(os.sep, '/') in current:
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+
+# Manifiesto de la última construcción; se vuelve a construir si falta o si algún archivo (o directorio,
+# para los borrados) de source_dir es posterior a él
+def load_assets(source_dir, build_dir):
+    path = os.path.join(build_dir, MANIFEST)
+    try:
+        built_at = os.path.getmtime(path)
+        if all(os.path.getmtime(os.path.join(directory, name)) <= built_at
+               for directory, _, names in os.walk(source_dir) for name in ['.', *names]):
+            with open(path) as file:
+                return json.load(file)
+    except (OSError, ValueError):
+        pass
+    return build_assets(source_dir, build_dir)
+
+
+class StaticAssets:
+    def __init__(self, build_dir, manifest, max_age=31536000):
+        self.build_dir = build_dir
+        self.manifest = manifest
+        self.max_age = max_age
+        self._built = {entry['path']: entry for entry in manifest.values()}
+
+    def init_app(self, app):
+        app.extensions['static_assets'] = self
+        app.url_defaults(self.url_defaults)
+        # Sustituye la vista de Flask para /static/<filename>: los nombres con hash salen de build_dir
+        app.view_functions['static'] = self.send_static
+
+    def url_defaults(self, endpoint, values):
+        if endpoint == 'static':
+            entry = self.manifest.get(values.get('filename'))
+            if entry:
+                values['filename'] = entry['path']
+
+    def send_static(self, filename):
+        entry = self._built.get(filename)
+        if entry is None:
+            # Archivos sin hash (URL escrita a mano o pipeline a medias): caché normal de Flask
+            return current_app.send_static_file(filename)
+        path = filename
+        encoding = self.choose_encoding(entry['encodings'])
+        if encoding:
+            path += SUFFIXES[encoding]
+        try:
+            response = send_file(
+                os.path.join(self.build_dir, path),
+                mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                max_age=self.max_age,
+                conditional=True,
+                # El hash del nombre ya identifica el contenido; el ETag distingue cada codificación
+                etag=f"{os.path.basename(filename)}{'.' + encoding if encoding else ''}",
+            )
+        except FileNotFoundError:
+            raise NotFound()
+        response.cache_control.immutable = True
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if entry['encodings']:
+            response.vary.add('Accept-Encoding')
+        return response
+
+    @staticmethod
+    def choose_encoding(available):
+        best = None
+        for encoding in SUFFIXES:
+            if encoding in available and request.accept_encodings[encoding] > 0:
+                quality = request.accept_encodings[encoding]
+                if best is None or quality > best[1]:
+                    best = (encoding, quality)
+        return best[0] if best else None
+
+
+def init_static_assets(app):
+    manifest = load_assets(app.static_folder, app.config['STATIC_BUILD_DIR'])
+    StaticAssets(app.config['STATIC_BUILD_DIR'], manifest, max_age=app.config['STATIC_MAX_AGE']).init_app(app)
+
+
+# Plantillas: se compilan todas al arrancar (con preload, una vez en el maestro y los workers heredan el
+# entorno de Jinja ya cargado) y el bytecode se guarda en TEMPLATE_CACHE_DIR para que los workers nuevos
+# (reciclados por max_requests o sin preload) no vuelvan a compilar el código fuente. Jinja reescribe el
+# bytecode de una plantilla que cambia; el de las plantillas borradas o renombradas se borra aquí.
+def precompile_templates(app):
+    directory = app.config['TEMPLATE_CACHE_DIR']
+    os.makedirs(directory, exist_ok=True)
+    cache = app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+    current = set()
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+        _, filename, _ = app.jinja_env.loader.get_source(app.jinja_env, name)
+        current.add(cache.pattern % cache.get_cache_key(name, filename))
+    for stale in set(fnmatch.filter(os.listdir(directory), cache.pattern % '*')) - current:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(directory, stale))
+
+
+# Identifica el código de presentación (plantillas y recursos con hash): forma parte de los ETag de las
+# páginas, que deben cambiar al desplegar plantillas nuevas aunque los datos sean los mismos
+def render_version(app):
+    digest = hashlib.sha256()
+    for name in sorted(app.jinja_env.list_templates()):
+        source, _, _ = app.jinja_env.loader.get_source(app.jinja_env, name)
+        digest.update(f"{name}\0{source}\0".encode())
+    assets = app.extensions.get('static_assets')
+    if assets:
+        digest.update(json.dumps(assets.manifest, sort_keys=True).encode())
+    return digest.hexdigest()[:16]
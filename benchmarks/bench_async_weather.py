@@ -0,0 +1,89 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+
+# Uso: python benchmarks/bench_async_weather.py [retardo del upstream en s] [concurrencias]
+DELAY = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+CONCURRENCY = [int(n) for n in (sys.argv[2] if len(sys.argv) > 2 else "10,50,200").split(',')]
+WORKER_CLASSES = ['gthread', 'gevent']
+PORT = 5055
+
+
+class SlowWeatherstack(BaseHTTPRequestHandler):
+    # Upstream lento: cada respuesta tarda DELAY segundos
+    def do_GET(self):
+        time.sleep(DELAY)
+        city = parse_qs(urlparse(self.path).query).get('query', [''])[0]
+        body = json.dumps({
+            'location': {'name': city},
+            'current': {'temperature': 21, 'weather_descriptions': ['Sunny'], 'weather_icons': ['icon.png']},
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(worker_class, upstream_url):
+    # Un solo worker: 4 hilos con gthread, hasta 1000 conexiones con gevent. Sin caché de clima.
+    env = dict(os.environ, BIND=f"127.0.0.1:{PORT}", WEB_CONCURRENCY="1", GUNICORN_THREADS="4",
+               GUNICORN_WORKER_CLASS=worker_class, GUNICORN_ACCESS_LOG="/dev/null",
+               WEATHERSTACK_URL=upstream_url, WEATHER_CACHE_TTL="0", WEATHER_STALE_TTL="0",
+               WEATHER_POOL_SIZE="200", FLASK_SECRET_KEY=os.getenv("FLASK_SECRET_KEY", "bench"))
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+                              cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            requests.get(f"http://127.0.0.1:{PORT}/login", timeout=1)
+            return server
+        except requests.exceptions.RequestException:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("gunicorn did not start")
+
+
+def run_load(concurrency):
+    # Ciudades distintas para que ni la caché ni la agrupación de peticiones intervengan
+    urls = [f"http://127.0.0.1:{PORT}/weatherstack?city=City{i}" for i in range(concurrency * 2)]
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        statuses = list(pool.map(lambda url: session.get(url, timeout=60).status_code, urls))
+        elapsed = time.perf_counter() - start
+    return len(urls) / elapsed, statuses.count(200) == len(urls)
+
+
+def main():
+    upstream = ThreadingHTTPServer(('127.0.0.1', 0), SlowWeatherstack)
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+    upstream_url = f"http://127.0.0.1:{upstream.server_port}/current"
+
+    print(f"upstream delay {DELAY}s, 1 worker")
+    print(f"{'worker':>8} {'concurrency':>12} {'req/s':>8} {'all ok':>7}")
+    for worker_class in WORKER_CLASSES:
+        server = start_server(worker_class, upstream_url)
+        try:
+            for concurrency in CONCURRENCY:
+                throughput, ok = run_load(concurrency)
+                print(f"{worker_class:>8} {concurrency:>12} {throughput:>8.1f} {str(ok):>7}")
+        finally:
+            server.terminate()
+            server.wait()
+    upstream.shutdown()
+
+
+if __name__ == '__main__':
+    main()
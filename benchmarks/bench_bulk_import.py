@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import time
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import create_app, db, User
+
+# Uso: python benchmarks/bench_bulk_import.py [tareas] [tamaño de lote]
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+BATCH = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+
+def logged_in_client(app):
+    with app.app_context():
+        db.create_all()
+        user = User(username="bench_user")
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+    return client
+
+
+def import_with_forms(client):
+    # Un POST de formulario (una transacción y una redirección) por tarea
+    for i in range(COUNT):
+        client.post('/tasks', data={'task': f"Imported {i}", 'priority': str(i % 3 + 1)})
+
+
+def import_with_batches(client):
+    for start in range(0, COUNT, BATCH):
+        operations = [{'op': 'create', 'task': f"Imported {i}", 'priority': i % 3 + 1}
+                      for i in range(start, min(start + BATCH, COUNT))]
+        client.post('/api/v1/tasks/batch', json={'operations': operations})
+
+
+def main():
+    print(f"{COUNT} tasks (in-process test client)")
+    print(f"{'method':>12} {'seconds':>10} {'tasks/s':>10}")
+    for name, run in [('forms', import_with_forms), (f'batch x{BATCH}', import_with_batches)]:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}"})
+            client = logged_in_client(app)
+            start = time.perf_counter()
+            run(client)
+            elapsed = time.perf_counter() - start
+            with app.app_context():
+                db.engine.dispose()
+        print(f"{name:>12} {elapsed:>10.2f} {COUNT / elapsed:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
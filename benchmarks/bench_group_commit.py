@@ -0,0 +1,102 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.insert(0, ROOT)
+from benchmarks.suite.seed import PASSWORD, seed_database, username  # noqa: E402
+
+# Uso: python benchmarks/bench_group_commit.py [escritores] [segundos]
+WRITERS = [int(n) for n in (sys.argv[1] if len(sys.argv) > 1 else "50,200,1000").split(',')]
+DURATION = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+USERS = 20
+PORT = 5077
+# (perfil de SQLite, group commit): "default" confirma con fsync cada transacción; "wal" es el perfil por defecto
+SCENARIOS = [('default', False), ('default', True), ('wal', False), ('wal', True)]
+
+
+def start_server(database_uri, profile, group_commit):
+    # Un worker gevent: atiende los 1000 escritores a la vez y todas las escrituras pasan por un proceso
+    env = dict(os.environ, BIND=f"127.0.0.1:{PORT}", WEB_CONCURRENCY="1", GUNICORN_WORKER_CLASS="gevent",
+               GUNICORN_ACCESS_LOG="/dev/null", GUNICORN_MAX_REQUESTS="0", GUNICORN_TIMEOUT="120",
+               SQLALCHEMY_DATABASE_URI=database_uri, SQLITE_PROFILE=profile, TASK_GROUP_COMMIT=str(group_commit),
+               DB_POOL_SIZE="20", DB_MAX_OVERFLOW="0", TASK_CACHE_BACKEND="none",
+               FLASK_SECRET_KEY=os.getenv("FLASK_SECRET_KEY", "bench"))
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+                              cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(300):
+        try:
+            requests.get(f"http://127.0.0.1:{PORT}/login", timeout=1)
+            return server
+        except requests.exceptions.RequestException:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("gunicorn did not start")
+
+
+def login_cookies():
+    # Una sesión por usuario, compartida por sus escritores (la cookie firmada vale para varias conexiones)
+    cookies = []
+    for index in range(USERS):
+        with requests.Session() as http:
+            http.post(f"http://127.0.0.1:{PORT}/login", data={'username': username(index), 'password': PASSWORD},
+                      allow_redirects=False, timeout=60)
+            cookies.append(http.cookies.get_dict())
+    return cookies
+
+
+def run_writers(writers, cookies):
+    counts, errors = [0] * writers, [0] * writers
+    start_barrier = threading.Barrier(writers + 1)
+    deadline = []
+
+    def writer(index):
+        with requests.Session() as http:
+            http.cookies.update(cookies[index % USERS])
+            start_barrier.wait()
+            while time.monotonic() < deadline[0]:
+                try:
+                    response = http.post(f"http://127.0.0.1:{PORT}/tasks", data={'task': f"Write {index}", 'priority': '2'},
+                                         allow_redirects=False, timeout=120)
+                    if response.status_code == 302:
+                        counts[index] += 1
+                    else:
+                        errors[index] += 1
+                except requests.exceptions.RequestException:
+                    errors[index] += 1
+
+    threads = [threading.Thread(target=writer, args=(index,), daemon=True) for index in range(writers)]
+    for thread in threads:
+        thread.start()
+    deadline.append(time.monotonic() + DURATION)
+    start = time.perf_counter()
+    start_barrier.wait()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - start), sum(errors)
+
+
+def main():
+    print(f"{'profile':>8} {'group commit':>13} {'writers':>8} {'writes/s':>9} {'errors':>7}")
+    for profile, group_commit in SCENARIOS:
+        with tempfile.TemporaryDirectory() as tmp:
+            database_uri = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            seed_database(database_uri, os.path.join(ROOT, 'migrations'), USERS, 0)
+            server = start_server(database_uri, profile, group_commit)
+            try:
+                cookies = login_cookies()
+                for writers in WRITERS:
+                    throughput, errors = run_writers(writers, cookies)
+                    print(f"{profile:>8} {str(group_commit):>13} {writers:>8} {throughput:>9.1f} {errors:>7}")
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import generate_password_hash
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import create_app, db, User
+
+# Uso: python benchmarks/bench_login.py [segundos por método] [método,método,...]
+DURATION = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+METHODS = (sys.argv[2] if len(sys.argv) > 2 else "scrypt:32768:8:1,scrypt:16384:8:1,pbkdf2:sha256:600000").split(',')
+CORES = os.cpu_count() or 1
+
+
+def run(method):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            'PASSWORD_HASH_METHOD': method,
+            'PASSWORD_HASH_WORKERS': CORES,
+            'LOGIN_RATE_LIMIT_IP': 10 ** 9,
+            'LOGIN_RATE_LIMIT_USER': 10 ** 9,
+        })
+        with app.app_context():
+            db.create_all()
+            db.session.add(User(username="bench_user", password=generate_password_hash("secure_password", method)))
+            db.session.commit()
+
+        def login_loop(_):
+            client = app.test_client()
+            logins = 0
+            deadline = time.monotonic() + DURATION
+            while time.monotonic() < deadline:
+                response = client.post('/login', data={'username': 'bench_user', 'password': 'secure_password'})
+                assert response.status_code == 302
+                logins += 1
+            return logins
+
+        # Un cliente por núcleo: los hashes corren en el pool de la aplicación
+        with ThreadPoolExecutor(max_workers=CORES) as pool:
+            total = sum(pool.map(login_loop, range(CORES)))
+        with app.app_context():
+            db.engine.dispose()
+    return total / DURATION
+
+
+def main():
+    print(f"{CORES} core(s), {DURATION:.0f}s per method")
+    print(f"{'method':>24} {'logins/s':>10} {'logins/s/core':>14}")
+    for method in METHODS:
+        rate = run(method)
+        print(f"{method:>24} {rate:>10.1f} {rate / CORES:>14.1f}")
+
+
+if __name__ == '__main__':
+    main()
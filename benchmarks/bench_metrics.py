@@ -0,0 +1,64 @@
+import gc
+import os
+import sys
+import tempfile
+import time
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import create_app, db, User, Task
+
+# Uso: python benchmarks/bench_metrics.py [peticiones por ronda] [rondas]
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+ROUNDS = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+MODES = {
+    'off': {'METRICS_ENABLED': False},
+    'metrics': {'METRICS_ENABLED': True},
+    'metrics+1% profiling': {'METRICS_ENABLED': True, 'PROFILE_SAMPLE_RATE': 0.01, 'PROFILE_SLOW_MS': 10 ** 6},
+    'metrics+100% profiling': {'METRICS_ENABLED': True, 'PROFILE_SAMPLE_RATE': 1, 'PROFILE_SLOW_MS': 10 ** 6},
+}
+
+
+def build(tmp, name, options):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, name.replace(' ', '_') + '.db')}",
+        'TASK_CACHE_BACKEND': 'none',
+        'PROFILE_DIR': os.path.join(tmp, 'profiles'),
+        **options,
+    })
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(username="bench_user"))
+        db.session.add_all(Task(user_id=1, task=f"Task {i}", priority=i % 3 + 1) for i in range(50))
+        db.session.commit()
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+    return app, client
+
+
+def main():
+    print(f"GET /tasks, 50 tasks, no task cache: best of {ROUNDS} interleaved rounds of {REQUESTS} requests")
+    print(f"{'mode':>24} {'ms/req':>8} {'overhead':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        apps = {name: build(tmp, name, options) for name, options in MODES.items()}
+        # Rondas alternadas para que el calentamiento y el ruido afecten a todos los modos por igual
+        best = {name: float('inf') for name in MODES}
+        for _ in range(ROUNDS):
+            for name, (app, client) in apps.items():
+                with app.app_context():
+                    gc.collect()
+                    start = time.perf_counter()
+                    for _ in range(REQUESTS):
+                        assert client.get('/tasks').status_code == 200
+                    best[name] = min(best[name], (time.perf_counter() - start) / REQUESTS)
+        for app, _ in apps.values():
+            with app.app_context():
+                db.engine.dispose()
+
+    for name, latency in best.items():
+        print(f"{name:>24} {latency * 1000:>8.3f} {(latency / best['off'] - 1) * 100:>8.1f}%")
+
+
+if __name__ == '__main__':
+    main()
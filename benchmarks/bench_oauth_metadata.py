@@ -0,0 +1,66 @@
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import requests
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import app, db, google, init_oauth_metadata, warm_up_oauth
+from benchmarks.suite.stubs import StubGoogle
+
+# Uso: python benchmarks/bench_oauth_metadata.py [workers] [latencia del proveedor en ms]
+# Primer login con Google de cada worker recién arrancado contra un proveedor falso que tarda en servir
+# el documento de descubrimiento y el JWKS (como Google visto desde otra región). Sin caché cada worker
+# descarga ambos documentos en su primer login; con la caché compartida y el precalentamiento el primero
+# los descarga al arrancar y los demás los leen del archivo.
+WORKERS = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+DELAY = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.3
+CLIENT_ID = "bench-client"
+
+
+def first_login():
+    client = app.test_client()
+    start = time.perf_counter()
+    authorize = client.get('/google_login')
+    callback = requests.get(authorize.headers['Location'], allow_redirects=False, timeout=10)
+    response = client.get(callback.headers['Location'].replace('http://localhost', ''))
+    assert response.status_code == 302, response.status_code
+    return (time.perf_counter() - start) * 1000
+
+
+def run(stub, cached, path):
+    app.config.update(OAUTH_METADATA_CACHE=cached, OAUTH_CACHE_PATH=path, GOOGLE_CLIENT_ID=CLIENT_ID,
+                      GOOGLE_DISCOVERY_URL=stub.discovery_url)
+    google._server_metadata_url = stub.discovery_url
+    stub.requests.clear()
+    logins, startups = [], []
+    for _ in range(WORKERS):
+        # Worker nuevo: ni Authlib ni la caché en memoria conservan nada del anterior
+        google.server_metadata = {}
+        start = time.perf_counter()
+        init_oauth_metadata(app)
+        warm_up_oauth(app)
+        startups.append((time.perf_counter() - start) * 1000)
+        logins.append(first_login())
+    fetches = stub.requests['/.well-known/openid-configuration'] + stub.requests['/jwks']
+    return statistics.median(startups), statistics.median(logins), max(logins), fetches
+
+
+if __name__ == '__main__':
+    # El cliente de Google (Authlib) se crea dentro de un contexto de aplicación
+    app.app_context().push()
+    db.create_all()
+    google.client_id, google.client_secret = CLIENT_ID, "bench-secret"
+    stub = StubGoogle(CLIENT_ID, metadata_delay=DELAY).start()
+    try:
+        print(f"{WORKERS} fresh workers, provider latency {DELAY * 1000:.0f} ms")
+        print(f"{'cache':>6} {'startup p50 ms':>15} {'1st login p50 ms':>17} {'max ms':>8} {'IdP fetches':>12}")
+        with tempfile.TemporaryDirectory() as tmp:
+            for cached in (False, True):
+                startup, p50, worst, fetches = run(stub, cached, os.path.join(tmp, 'oauth_metadata.json'))
+                print(f"{str(cached):>6} {startup:>15.1f} {p50:>17.1f} {worst:>8.1f} {fetches:>12}")
+    finally:
+        stub.stop()
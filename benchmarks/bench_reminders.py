@@ -0,0 +1,172 @@
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from sqlalchemy import insert
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import create_app, db, Task, claim_reminders, load_pending_reminders, task_cache, utcnow
+from reminders import ReminderScheduler
+
+# Uso: python benchmarks/bench_reminders.py [tareas] [vencidas]
+# Base de datos SQLite con `tareas` tareas programadas (por defecto 10M): `vencidas` ya vencidas sin avisar
+# y el resto repartidas en el próximo año.
+# - Coste de encontrar las próximas 1000 con el índice parcial frente a recorrer la tabla como haría un
+#   sondeo periódico sin índice.
+# - Ritmo de envío de la cola de vencidas con uno y con dos planificadores (dos procesos sobre la misma base
+#   de datos; no debe haber duplicados).
+# - Retraso de los avisos de tareas que vencen durante la prueba.
+# Los triggers de búsqueda (task_fts) no se crean: no intervienen en los recordatorios y con ellos la carga
+# de 10M tareas tardaría una hora. Los índices se crean después de cargar los datos.
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+OVERDUE = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+SOON = 1000
+USERS = 1000
+CHUNK = 100000
+HEAP_SIZE = 1000
+REPEAT = 20
+
+
+def timestamp(value):
+    # Mismo formato de texto que escribe SQLAlchemy en SQLite
+    return value.isoformat(' ', 'microseconds')
+
+
+def seed(path, now):
+    connection = sqlite3.connect(path)
+    connection.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;")
+    for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE tbl_name = 'task' AND type IN ('index', 'trigger') "
+                                      "AND name NOT LIKE 'sqlite_%'").fetchall():
+        kind = 'TRIGGER' if name.startswith('task_fts') else 'INDEX'
+        connection.execute(f"DROP {kind} {name}")
+    connection.executemany("INSERT INTO user (id, username) VALUES (?, ?)",
+                           [(user_id, f"bench_user_{user_id}") for user_id in range(1, USERS + 1)])
+    rng = random.Random(0)
+    created = timestamp(now - timedelta(days=1))
+    year = 365 * 86400
+    for start in range(0, TASKS, CHUNK):
+        rows = []
+        for index in range(start, min(start + CHUNK, TASKS)):
+            if index < OVERDUE:
+                due_at = now - timedelta(seconds=rng.uniform(0, 3600))
+            else:
+                due_at = now + timedelta(seconds=rng.uniform(600, year))
+            rows.append((1 + index % USERS, f"Task {index}", 1 + index % 3, created, timestamp(due_at)))
+        connection.executemany("INSERT INTO task (user_id, task, priority, created_at, due_at) VALUES (?, ?, ?, ?, ?)", rows)
+        connection.commit()
+    connection.close()
+
+
+# Notificador que solo anota la hora de cada aviso
+class Recorder:
+    def __init__(self, expected):
+        self.expected = expected
+        self.sent = []
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def __call__(self, reminder):
+        with self.lock:
+            self.sent.append((reminder['id'], reminder['due_at'], utcnow()))
+            if len(self.sent) >= self.expected:
+                self.done.set()
+
+
+def scheduler_for(app, notify):
+    return ReminderScheduler(lambda limit: load_pending_reminders(app, limit),
+                             lambda task_ids, now: claim_reminders(app, task_ids, now),
+                             notify, capacity=HEAP_SIZE, poll_interval=60)
+
+
+def drain(apps, expected):
+    recorder = Recorder(expected)
+    schedulers = [scheduler_for(app, recorder) for app in apps]
+    start = time.perf_counter()
+    for scheduler in schedulers:
+        scheduler.start()
+    recorder.done.wait(600)
+    elapsed = time.perf_counter() - start
+    for scheduler in schedulers:
+        scheduler.stop()
+    ids = [task_id for task_id, _, _ in recorder.sent]
+    return len(ids) / elapsed, len(ids) - len(set(ids))
+
+
+def lateness(app):
+    # Tareas que vencen en los próximos 2 s, entregadas al planificador como hace el commit de la aplicación
+    recorder = Recorder(SOON)
+    scheduler = scheduler_for(app, recorder).start()
+    now = utcnow()
+    with app.app_context():
+        rows = [{'user_id': 1 + index % USERS, 'task': f"Soon {index}", 'priority': 1,
+                 'due_at': now + timedelta(seconds=1 + index * 2 / SOON)} for index in range(SOON)]
+        ids = db.session.scalars(insert(Task).returning(Task.id, sort_by_parameter_order=True), rows).all()
+        db.session.commit()
+    scheduler.schedule([(row['due_at'], task_id) for row, task_id in zip(rows, ids)])
+    recorder.done.wait(60)
+    scheduler.stop()
+    delays = sorted((sent - due_at).total_seconds() * 1000 for _, due_at, sent in recorder.sent)
+    return statistics.median(delays), delays[int(len(delays) * 0.99) - 1], delays[-1]
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'reminders.db')
+        uri = f"sqlite:///{path}"
+        backend = task_cache.backend
+        apps = [create_app({'SQLALCHEMY_DATABASE_URI': uri, 'TASK_CACHE_BACKEND': 'none'}) for _ in range(2)]
+        task_cache.backend = backend
+        with apps[0].app_context():
+            db.create_all()
+            db.engine.dispose()
+
+        now = utcnow()
+        start = time.perf_counter()
+        seed(path, now)
+        seeded = time.perf_counter() - start
+        start = time.perf_counter()
+        with apps[0].app_context():
+            for index in Task.__table__.indexes:
+                index.create(db.engine)
+        indexed = time.perf_counter() - start
+        print(f"{TASKS} scheduled tasks ({OVERDUE} overdue): seeded in {seeded:.0f} s, indexes built in {indexed:.0f} s, "
+              f"{os.path.getsize(path) / 2 ** 20:.0f} MB")
+
+        with apps[0].app_context():
+            timings = []
+            for _ in range(REPEAT):
+                start = time.perf_counter()
+                load_pending_reminders(apps[0], HEAP_SIZE)
+                timings.append((time.perf_counter() - start) * 1000)
+            indexed_ms = statistics.median(timings)
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                db.session.execute(db.text("SELECT id FROM task NOT INDEXED WHERE due_at <= :now AND reminded_at IS NULL"),
+                                   {'now': timestamp(utcnow())}).all()
+                timings.append((time.perf_counter() - start) * 1000)
+            scan_ms = statistics.median(timings)
+        print(f"next {HEAP_SIZE} deadlines (partial index): {indexed_ms:.2f} ms; due tasks by table scan: {scan_ms:.0f} ms")
+
+        print(f"{'schedulers':>10} {'reminders/s':>12} {'duplicates':>11}")
+        for count in (1, 2):
+            with apps[0].app_context():
+                if count == 2:
+                    # Vuelven a quedar pendientes las mismas tareas vencidas
+                    db.session.execute(db.text("UPDATE task SET reminded_at = NULL WHERE reminded_at IS NOT NULL"))
+                    db.session.commit()
+            rate, duplicates = drain(apps[:count], OVERDUE)
+            print(f"{count:>10} {rate:>12.0f} {duplicates:>11}")
+
+        p50, p99, worst = lateness(apps[0])
+        print(f"delay after due time ({SOON} tasks due within 2 s): p50 {p50:.1f} ms, p99 {p99:.1f} ms, max {worst:.1f} ms")
+        for app in apps:
+            with app.app_context():
+                db.engine.dispose()
@@ -0,0 +1,96 @@
+import os
+import random
+import statistics
+import string
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import db, Task
+from search import fts5_query, parse_search_query, search_tasks
+
+# Uso: python benchmarks/bench_search.py [tareas]
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+PAGE_SIZE = 50
+REPEAT = 20
+CHUNK = 50000
+RARE_WORD = "zebracorn"
+
+# Alternativa sin índice de texto: subcadena con LIKE sobre las tareas del usuario en orden de prioridad
+LIKE_QUERY = text(
+    "SELECT id, task, priority FROM task WHERE user_id = 1 AND task LIKE :pattern "
+    "ORDER BY priority, id LIMIT :limit"
+)
+
+
+def vocabulary(rng, size=5000):
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(size)]
+
+
+def seed(engine, rng, words):
+    # Frecuencias tipo Zipf: unas pocas palabras muy comunes y muchas raras; RARE_WORD aparece en 20 tareas
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    rare = set(rng.sample(range(TASKS), 20))
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO user (id, username) VALUES (1, 'bench_user')")
+        for start in range(0, TASKS, CHUNK):
+            rows = []
+            for i in range(start, min(start + CHUNK, TASKS)):
+                task = rng.choices(words, weights, k=rng.randint(3, 8))
+                if i in rare:
+                    task.insert(rng.randrange(len(task)), RARE_WORD)
+                rows.append({'user_id': 1, 'task': " ".join(task).capitalize(), 'priority': i % 3 + 1})
+            conn.execute(insert(Task), rows)
+
+
+def median_ms(function):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    rng = random.Random(0)
+    words = vocabulary(rng)
+    common, medium = words[0], words[200]
+    # (nombre, consulta FTS, patrón LIKE equivalente)
+    queries = [
+        ('rare word', RARE_WORD, f"%{RARE_WORD}%"),
+        ('medium word', medium, f"%{medium}%"),
+        ('common word', common, f"%{common}%"),
+        ('prefix', f"{medium[:3]}*", f"%{medium[:3]}%"),
+        ('two words', f"{common} {medium}", f"%{common}%{medium}%"),
+        ('phrase', f'"{common} {words[1]}"', f"%{common} {words[1]}%"),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        db.metadata.create_all(engine)
+        start = time.perf_counter()
+        seed(engine, rng, words)
+        print(f"{TASKS} tasks seeded with the FTS5 triggers in {time.perf_counter() - start:.1f} s")
+
+        print(f"{'query':>12} {'matches':>9} {'FTS5 (ms)':>10} {'LIKE (ms)':>10}")
+        with Session(engine) as session:
+            for name, query, pattern in queries:
+                terms = parse_search_query(query)
+                matches = session.execute(
+                    text("SELECT count(*) FROM task_fts WHERE task_fts MATCH :query"),
+                    {'query': fts5_query(terms)},
+                ).scalar()
+                fts = median_ms(lambda: search_tasks(session, 1, terms, limit=PAGE_SIZE))
+                like = median_ms(lambda: session.execute(LIKE_QUERY, {'pattern': pattern, 'limit': PAGE_SIZE + 1}).all())
+                print(f"{name:>12} {matches:>9} {fts:>10.2f} {like:>10.2f}")
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
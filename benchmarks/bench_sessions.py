@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import create_app, db, User
+
+# Uso: python benchmarks/bench_sessions.py [peticiones por backend] [backend,backend,...]
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+BACKENDS = (sys.argv[2] if len(sys.argv) > 2 else "cookie,memory,sqlite").split(',')
+
+
+def run(backend):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            'SESSION_BACKEND': backend,
+            'SESSION_STORE_PATH': os.path.join(tmp, 'sessions.db'),
+            'TASK_CACHE_BACKEND': 'memory',
+            'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1000',
+        })
+        with app.app_context():
+            db.create_all()
+            db.session.add(User(username="bench_user", password=generate_password_hash("secure_password", "pbkdf2:sha256:1000")))
+            db.session.commit()
+
+            client = app.test_client()
+            client.post('/login', data={'username': 'bench_user', 'password': 'secure_password'})
+
+            # Consultas a la base principal (las sesiones SQLite usan su propio archivo)
+            queries = []
+            event.listen(db.engine, 'before_cursor_execute', lambda *args: queries.append(1))
+            start = time.perf_counter()
+            for _ in range(REQUESTS):
+                assert client.get('/tasks').status_code == 200
+            elapsed = time.perf_counter() - start
+            db.engine.dispose()
+    return len(queries) / REQUESTS, REQUESTS / elapsed
+
+
+def main():
+    print(f"{REQUESTS} GET /tasks per backend (task list cache enabled)")
+    print(f"{'backend':>8} {'queries/req':>12} {'req/s':>8}")
+    for backend in BACKENDS:
+        queries, rate = run(backend)
+        print(f"{backend:>8} {queries:>12.2f} {rate:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
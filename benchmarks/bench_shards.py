@@ -0,0 +1,103 @@
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy.exc import OperationalError
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import create_app, commit, db, Task, User, task_cache, use_task_shard
+
+# Uso: python benchmarks/bench_shards.py [procesos] [segundos] [retención_ms] [perfil]
+# Altas de tareas por segundo desde `procesos` procesos (como workers de gunicorn), una transacción por
+# tarea como POST /tasks, de usuarios al azar, sin shards (todo en la base de datos principal) y con
+# 1, 2, 4 y 8 shards. Cada proceso elige el shard del usuario con el mapa de shards, igual que login_required.
+# `retención_ms` mantiene el bloqueo de escritura ese tiempo en cada transacción (después del INSERT, antes
+# del commit): simula un disco con fsync lento o transacciones largas, donde el límite es el escritor único
+# de cada archivo y no la CPU. Con 0 se mide el disco real.
+PROCESSES = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+DURATION = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+HOLD = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.02
+PROFILE = sys.argv[4] if len(sys.argv) > 4 else 'wal'
+SHARD_COUNTS = [0, 1, 2, 4, 8]
+USERS = 1000
+
+
+def make_app(tmp, shards):
+    return create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'main.db')}",
+        'TASK_SHARDS': shards,
+        'TASK_SHARD_DIR': os.path.join(tmp, 'shards'),
+        'SQLITE_PROFILE': PROFILE,
+        'TASK_CACHE_BACKEND': 'none',
+        'DB_COMMIT_ATTEMPTS': 10,
+    })
+
+
+def add_task(user_id):
+    db.session.add(Task(user_id=user_id, task="Sharded Task", priority=2))
+    if HOLD:
+        db.session.flush()
+        time.sleep(HOLD)
+
+
+def writer(tmp, shards, worker_id, start, results):
+    app = make_app(tmp, shards)
+    rng = random.Random(worker_id)
+    writes = errors = 0
+    with app.app_context():
+        while time.time() < start:
+            time.sleep(0.001)
+        deadline = time.monotonic() + DURATION
+        while time.monotonic() < deadline:
+            user_id = rng.randint(1, USERS)
+            use_task_shard(user_id)
+            try:
+                commit(lambda: add_task(user_id))
+                writes += 1
+            except OperationalError:
+                errors += 1
+            db.session.remove()
+    results.put((writes, errors))
+
+
+def run(shards):
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = task_cache.backend
+        app = make_app(tmp, shards)
+        task_cache.backend = backend
+        with app.app_context():
+            db.create_all()
+            db.session.add_all([User(username=f"bench_user_{user_id}") for user_id in range(1, USERS + 1)])
+            db.session.commit()
+            db.engine.dispose()
+
+        results = multiprocessing.Queue()
+        start = time.time() + 2
+        workers = [multiprocessing.Process(target=writer, args=(tmp, shards, i, start, results))
+                   for i in range(PROCESSES)]
+        for worker in workers:
+            worker.start()
+        totals = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+    return sum(w for w, _ in totals), sum(e for _, e in totals)
+
+
+def main():
+    print(f"{PROCESSES} processes, {DURATION:.0f}s, lock held {HOLD * 1000:.0f} ms per transaction, "
+          f"SQLITE_PROFILE={PROFILE}, {os.cpu_count()} CPUs")
+    print(f"{'shards':>8} {'writes/s':>10} {'speedup':>8} {'locked errors':>14}")
+    baseline = None
+    for shards in SHARD_COUNTS:
+        writes, errors = run(shards)
+        rate = writes / DURATION
+        baseline = baseline or rate
+        print(f"{shards or 'none':>8} {rate:>10.0f} {rate / baseline:>7.2f}x {errors:>14}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import create_app, db, User
+
+# Uso: python benchmarks/bench_static_assets.py
+# Bytes de recursos estáticos de /login y /tasks en la primera visita y en las siguientes (con y sin el
+# pipeline), y tiempo de carga de todas las plantillas en un worker nuevo (compilando el código fuente o
+# leyendo el bytecode).
+PAGES = ['/login', '/tasks']
+REPEAT = 20
+ASSET_PATTERN = re.compile(r'(?:href|src)="(/static/[^"]+)"')
+
+
+def page_assets(client):
+    urls = set()
+    for page in PAGES:
+        urls.update(ASSET_PATTERN.findall(client.get(page).get_data(as_text=True)))
+    return sorted(urls)
+
+
+def visit(client, urls, validators):
+    # Navegador con caché: no pide lo que tiene como immutable y revalida el resto con If-None-Match
+    requests = transferred = 0
+    for url in urls:
+        cached = validators.get(url)
+        if cached and cached[1]:
+            continue
+        headers = {'Accept-Encoding': 'gzip, deflate, br'}
+        if cached:
+            headers['If-None-Match'] = cached[0]
+        response = client.get(url, headers=headers)
+        requests += 1
+        transferred += len(response.data)
+        if response.status_code == 200:
+            validators[url] = (response.headers.get('ETag'), 'immutable' in response.headers.get('Cache-Control', ''))
+    return requests, transferred
+
+
+def asset_traffic(pipeline):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+            'TASK_CACHE_BACKEND': 'none',
+            'STATIC_PIPELINE': pipeline,
+            'STATIC_BUILD_DIR': os.path.join(tmp, 'static'),
+            'TEMPLATE_CACHE_DIR': os.path.join(tmp, 'templates'),
+        })
+        with app.app_context():
+            db.create_all()
+            db.session.add(User(username='bench'))
+            db.session.commit()
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['user_id'] = 1
+        urls = page_assets(client)
+        validators = {}
+        return visit(client, urls, validators), visit(client, urls, validators)
+
+
+def template_load_ms(bytecode_dir):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:', 'TASK_CACHE_BACKEND': 'none'})
+    names = app.jinja_env.list_templates()
+    timings = []
+    for _ in range(REPEAT):
+        # Entorno nuevo en cada vuelta, como un worker recién arrancado
+        environment = Environment(
+            loader=FileSystemLoader(os.path.join(app.root_path, app.template_folder)),
+            bytecode_cache=FileSystemBytecodeCache(bytecode_dir) if bytecode_dir else None,
+        )
+        start = time.perf_counter()
+        for name in names:
+            environment.get_template(name)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(names)
+
+
+if __name__ == '__main__':
+    print(f"{'pipeline':>9} {'visit':>7} {'requests':>9} {'bytes':>8}")
+    for pipeline in (False, True):
+        first, repeat = asset_traffic(pipeline)
+        for label, (requests, transferred) in (('first', first), ('repeat', repeat)):
+            print(f"{str(pipeline):>9} {label:>7} {requests:>9} {transferred:>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template_load_ms(tmp)  # llena la caché de bytecode
+        source_ms, count = template_load_ms(None)
+        bytecode_ms, _ = template_load_ms(tmp)
+    print()
+    print(f"loading {count} templates in a fresh environment: source {source_ms:.2f} ms, bytecode {bytecode_ms:.2f} ms")
@@ -0,0 +1,64 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from sqlalchemy import create_engine, insert
+
+# Agregar el directorio raíz del proyecto al sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.insert(0, ROOT)
+from app import db, Task
+
+# Uso: python benchmarks/bench_stream_render.py [tareas]
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+# Cada modo corre en un proceso nuevo para que el pico de RSS sea solo suyo
+RENDER_SCRIPT = """
+import json, resource, sys, time
+sys.path.insert(0, sys.argv[2])
+from app import create_app
+tasks = int(sys.argv[4])
+app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + sys.argv[1], 'TASK_CACHE_BACKEND': 'none',
+                  'TASKS_MAX_PAGE_SIZE': tasks})
+client = app.test_client()
+with client.session_transaction() as sess:
+    sess['user_id'] = 1
+client.get('/tasks')
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+response = client.get('/tasks?limit=' + ('all' if sys.argv[3] == 'stream' else str(tasks)), buffered=False)
+first_byte = None
+size = 0
+for chunk in response.response:
+    first_byte = first_byte or time.perf_counter() - start
+    size += len(chunk)
+response.close()
+total = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'first_byte': first_byte, 'total': total, 'growth_mb': (peak - baseline) / 1024, 'mb': size / 2 ** 20}))
+"""
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        engine = create_engine(f"sqlite:///{path}")
+        db.metadata.create_all(engine)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("INSERT INTO user (id, username) VALUES (1, 'bench_user')")
+            conn.execute(insert(Task), [{'user_id': 1, 'task': f"Task {i}", 'priority': i % 3 + 1} for i in range(TASKS)])
+        engine.dispose()
+
+        print(f"{TASKS} tasks on one page")
+        print(f"{'mode':>10} {'first byte (ms)':>16} {'total (s)':>10} {'HTML (MB)':>10} {'RSS growth (MB)':>16}")
+        for mode in ('buffered', 'stream'):
+            output = subprocess.run([sys.executable, '-c', RENDER_SCRIPT, path, ROOT, mode, str(TASKS)],
+                                    capture_output=True, text=True, check=True).stdout
+            stats = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:>10} {stats['first_byte'] * 1000:>16.1f} {stats['total']:>10.2f} {stats['mb']:>10.1f} {stats['growth_mb']:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
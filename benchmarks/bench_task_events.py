@@ -0,0 +1,85 @@
+import os
+import sys
+import tempfile
+import time
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import create_app, db, User, Task
+from events import MemoryEventBackend, TaskEventHub
+
+# Uso: python benchmarks/bench_task_events.py [tareas del usuario] [ediciones]
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+EDITS = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+
+# Coste por edición: formulario + redirección (la página completa se vuelve a generar) frente a
+# PATCH de la API + la fila publicada en el canal de cambios
+def edit_cost():
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            'TASKS_PAGE_SIZE': TASKS,
+            'TASKS_MAX_PAGE_SIZE': TASKS,
+            'EVENTS_BACKEND': 'memory',
+        })
+        with app.app_context():
+            db.create_all()
+            db.session.add(User(username="bench_user"))
+            db.session.add_all(Task(user_id=1, task=f"Task {i}", priority=i % 3 + 1) for i in range(TASKS))
+            db.session.commit()
+
+            client = app.test_client()
+            with client.session_transaction() as sess:
+                sess['user_id'] = 1
+            results = {}
+
+            start, size = time.perf_counter(), 0
+            for i in range(EDITS):
+                response = client.post('/edit_task/1', data={'task': f"Edit {i}", 'priority': 1}, follow_redirects=True)
+                size += len(response.data)
+            results['form + redirect'] = ((time.perf_counter() - start) / EDITS, size / EDITS)
+
+            from app import task_events
+            subscription = task_events.subscribe(1)
+            start, size = time.perf_counter(), 0
+            for i in range(EDITS):
+                response = client.patch('/api/v1/tasks/1', json={'task': f"Edit {i}", 'priority': 1})
+                size += len(response.data)
+                for sequence, change in subscription.get(timeout=1):
+                    size += len(f"id: {sequence}\nevent: task\ndata: {change}\n\n")
+            results['API + event'] = ((time.perf_counter() - start) / EDITS, size / EDITS)
+            task_events.unsubscribe(subscription)
+            db.engine.dispose()
+    return results
+
+
+# Reparto: cambios publicados por segundo con 1000 conexiones abiertas repartidas entre 100 usuarios
+# (se mide la entrega en las colas de cada conexión; el envío por la red lo hace cada hilo o greenlet)
+def fan_out(users=100, streams_per_user=10, changes=20000):
+    hub = TaskEventHub(MemoryEventBackend(), max_pending=changes)
+    subscriptions = [hub.subscribe(user_id) for user_id in range(users) for _ in range(streams_per_user)]
+    start = time.perf_counter()
+    for i in range(changes):
+        hub.publish(i % users, [{'type': 'deleted', 'task': {'id': i}}])
+    publish_seconds = time.perf_counter() - start
+
+    delivered = 0
+    for subscription in subscriptions:
+        while subscription.get(timeout=0) is not None:
+            delivered += 1
+    return changes / publish_seconds, delivered
+
+
+def main():
+    print(f"one user with {TASKS} tasks on a single page, {EDITS} edits")
+    print(f"{'flow':>16} {'ms/edit':>9} {'bytes/edit':>11}")
+    for name, (latency, size) in edit_cost().items():
+        print(f"{name:>16} {latency * 1000:>9.2f} {size:>11.0f}")
+
+    rate, delivered = fan_out()
+    print(f"fan-out: {rate:,.0f} changes/s published to 1000 streams (100 users), {delivered:,} deliveries")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+
+# Agregar el directorio raíz del proyecto al sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.insert(0, ROOT)
+from app import db, Task
+
+# Uso: python benchmarks/bench_task_files.py [tareas] [perfil]
+# Exporta las `tareas` de un usuario (por defecto 1M, una de cada 10 con fecha límite) con /tasks/export y
+# vuelve a importar el archivo como otro usuario con /tasks/import, en CSV y NDJSON y con varios tamaños de
+# lote. Cada ejecución corre en un proceso nuevo (pico de RSS propio) sobre una copia de la base de datos.
+# Con el perfil "wal" el RSS incluye el mmap (256 MB) y la caché de páginas (64 MB) de SQLite, que crecen
+# con la base de datos; "default" mide solo la memoria de la aplicación.
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+PROFILE = sys.argv[2] if len(sys.argv) > 2 else 'wal'
+RUNS = [('csv', 5000), ('ndjson', 5000), ('csv', 1000), ('csv', 20000)]
+
+FILES_SCRIPT = """
+import json, os, resource, sys, time
+sys.path.insert(0, sys.argv[2])
+from app import create_app
+app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + sys.argv[1], 'TASK_CACHE_BACKEND': 'none',
+                  'SQLITE_PROFILE': sys.argv[5], 'TASK_IMPORT_BATCH': int(sys.argv[4])})
+file_format, path = sys.argv[3], sys.argv[1] + '.' + sys.argv[3]
+client = app.test_client()
+with client.session_transaction() as sess:
+    sess['user_id'] = 1
+client.get('/tasks')
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+start = time.perf_counter()
+response = client.get('/tasks/export?format=' + file_format, buffered=False)
+first_byte = None
+with open(path, 'wb') as file:
+    for chunk in response.response:
+        first_byte = first_byte or time.perf_counter() - start
+        file.write(chunk)
+response.close()
+export_seconds = time.perf_counter() - start
+export_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+with client.session_transaction() as sess:
+    sess['user_id'] = 2
+start = last = time.perf_counter()
+gap, updates = 0, []
+with open(path, 'rb') as file:
+    # input_stream: con data= el cliente de pruebas leería el archivo entero en memoria
+    response = client.post('/tasks/import', input_stream=file, content_length=os.path.getsize(path),
+                           content_type='text/csv' if file_format == 'csv' else 'application/x-ndjson', buffered=False)
+    for chunk in response.response:
+        for line in chunk.splitlines():
+            updates.append(json.loads(line))
+            now = time.perf_counter()
+            gap, last = max(gap, now - last), now
+    response.close()
+import_seconds = time.perf_counter() - start
+import_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'first_byte': first_byte, 'export_seconds': export_seconds, 'mb': os.path.getsize(path) / 2 ** 20,
+                  'export_growth_mb': (export_kb - baseline) / 1024, 'import_seconds': import_seconds,
+                  'import_growth_mb': (import_kb - export_kb) / 1024, 'updates': len(updates) - 1, 'gap': gap,
+                  'result': updates[-1]}))
+"""
+
+
+def seed(path):
+    engine = create_engine(f"sqlite:///{path}")
+    db.metadata.create_all(engine)
+    due = datetime(2027, 1, 1)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO user (id, username) VALUES (1, 'bench_user'), (2, 'import_user')")
+        for start in range(0, TASKS, 100000):
+            conn.execute(insert(Task), [
+                {'user_id': 1, 'task': f"Task {i}, imported", 'priority': i % 3 + 1,
+                 'due_at': due + timedelta(minutes=i) if i % 10 == 0 else None}
+                for i in range(start, min(start + 100000, TASKS))
+            ])
+    engine.dispose()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        seeded = os.path.join(tmp, 'seed.db')
+        seed(seeded)
+        print(f"{TASKS} tasks, SQLITE_PROFILE={PROFILE} (in-process test client)")
+        print(f"{'format':>7} {'batch':>6} {'file (MB)':>10} {'1st byte (ms)':>14} {'export rows/s':>14} "
+              f"{'RSS (MB)':>9} {'import rows/s':>14} {'RSS (MB)':>9} {'updates':>8} {'max gap (s)':>12}")
+        for file_format, batch in RUNS:
+            path = os.path.join(tmp, 'bench.db')
+            shutil.copy(seeded, path)
+            output = subprocess.run([sys.executable, '-c', FILES_SCRIPT, path, ROOT, file_format, str(batch), PROFILE],
+                                    capture_output=True, text=True, check=True,
+                                    env=dict(os.environ, FLASK_SECRET_KEY=os.getenv('FLASK_SECRET_KEY', 'bench'))).stdout
+            stats = json.loads(output.strip().splitlines()[-1])
+            assert stats['result']['imported'] == TASKS, stats['result']
+            print(f"{file_format:>7} {batch:>6} {stats['mb']:>10.1f} {stats['first_byte'] * 1000:>14.1f} "
+                  f"{TASKS / stats['export_seconds']:>14.0f} {stats['export_growth_mb']:>9.1f} "
+                  f"{TASKS / stats['import_seconds']:>14.0f} {stats['import_growth_mb']:>9.1f} "
+                  f"{stats['updates']:>8} {stats['gap']:>12.2f}")
+            for name in ('bench.db', f'bench.db.{file_format}', 'bench.db-wal', 'bench.db-shm'):
+                if os.path.exists(os.path.join(tmp, name)):
+                    os.remove(os.path.join(tmp, name))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import insert
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import create_app, db, Task, TASK_LIST_COLUMNS
+
+# Uso: python benchmarks/bench_task_hydration.py [50,500,5000]
+SIZES = [int(n) for n in (sys.argv[1] if len(sys.argv) > 1 else "50,500,5000").split(',')]
+REPEAT = 30
+
+app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:', 'TASK_CACHE_BACKEND': 'none'})
+
+
+def orm_objects(limit):
+    # Camino anterior: objetos Task completos en el identity map de la sesión
+    return Task.query.filter_by(user_id=1).order_by(Task.priority, Task.id).limit(limit).all()
+
+
+def rows(limit):
+    # Camino de task_page(): filas Row con las columnas de la lista
+    return db.session.execute(
+        db.select(*TASK_LIST_COLUMNS).where(Task.user_id == 1).order_by(Task.priority, Task.id).limit(limit)
+    ).all()
+
+
+def measure(load, limit):
+    timings = []
+    for _ in range(REPEAT):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        load(limit)
+        timings.append(time.perf_counter() - start)
+    # Memoria retenida por el resultado (incluido el identity map) mientras se usa la página
+    db.session.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    result = load(limit)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return statistics.median(timings) / limit * 1e6, retained / limit
+
+
+def main():
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(Task), [
+            {'user_id': 1, 'task': f"Task number {i}", 'priority': i % 3 + 1} for i in range(max(SIZES))
+        ])
+        db.session.commit()
+
+        print(f"{'rows':>6} {'ORM (us/row)':>13} {'Row (us/row)':>13} {'ORM (B/row)':>12} {'Row (B/row)':>12}")
+        for limit in SIZES:
+            orm_time, orm_bytes = measure(orm_objects, limit)
+            row_time, row_bytes = measure(rows, limit)
+            print(f"{limit:>6} {orm_time:>13.2f} {row_time:>13.2f} {orm_bytes:>12.0f} {row_bytes:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
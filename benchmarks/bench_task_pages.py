@@ -0,0 +1,84 @@
+import os
+import sys
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import app, db, Task, DEFAULT_TASK_VIEW, task_page
+
+# Uso: python benchmarks/bench_task_pages.py [10,1000,100000,1000000]
+SIZES = [int(n) for n in (sys.argv[1] if len(sys.argv) > 1 else "10,1000,100000,1000000").split(',')]
+PAGE_SIZE = 50
+REPEAT = 50
+CHUNK = 50000
+# Vistas de /tasks medidas con los índices de orden y filtro y sin ellos (recorriendo las tareas del usuario).
+# Un prefijo amplio ("task 1" encaja con ~11% de las tareas) se ordena entero tras leerlo del índice
+VIEWS = {
+    'newest': dict(DEFAULT_TASK_VIEW, sort='-created'),
+    'high only': dict(DEFAULT_TASK_VIEW, priorities=(1,)),
+    'narrow prefix': dict(DEFAULT_TASK_VIEW, prefix='task 12345'),
+    'broad prefix': dict(DEFAULT_TASK_VIEW, prefix='task 1'),
+}
+VIEW_INDEXES = ('ix_task_user_created_id', 'ix_task_user_task_lower')
+
+
+def seed(engine, count):
+    # Tareas del usuario medido más tareas de otros usuarios para que el índice tenga que filtrar
+    with engine.begin() as conn:
+        for start in range(0, count, CHUNK):
+            rows = [{'user_id': 1, 'task': f"Task {i}", 'priority': i % 3 + 1}
+                    for i in range(start, min(start + CHUNK, count))]
+            conn.execute(insert(Task), rows)
+        conn.execute(insert(Task), [{'user_id': 2 + i % 100, 'task': f"Other {i}", 'priority': 2} for i in range(10000)])
+
+
+def measure(session, after, view=None):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        task_page(1, after, PAGE_SIZE, session=session, view=view)
+        session.expunge_all()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    print(f"{'tasks':>10} {'first page (ms)':>16} {'deep page (ms)':>16}")
+    view_rows = []
+    for count in SIZES:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            db.metadata.create_all(engine)
+            seed(engine, count)
+            with app.app_context(), Session(engine) as session:
+                # Cursor aproximadamente a la mitad de la lista del usuario
+                middle = session.execute(
+                    db.select(Task.priority, Task.id).filter_by(user_id=1)
+                    .order_by(Task.priority, Task.id).offset(count // 2).limit(1)
+                ).first()
+                first = measure(session, None)
+                deep = measure(session, tuple(middle) if middle else None)
+                indexed = {name: measure(session, None, view) for name, view in VIEWS.items()}
+                for index in VIEW_INDEXES:
+                    session.execute(db.text(f"DROP INDEX {index}"))
+                session.commit()
+                unindexed = {name: measure(session, None, view) for name, view in VIEWS.items()}
+            engine.dispose()
+        print(f"{count:>10} {first:>16.3f} {deep:>16.3f}")
+        view_rows.append((count, indexed, unindexed))
+
+    print()
+    print(f"{'tasks':>10} " + " ".join(f"{name + ' (ms)':>20}" for name in VIEWS))
+    print(f"{'':>10} " + " ".join(f"{'index / no index':>20}" for name in VIEWS))
+    for count, indexed, unindexed in view_rows:
+        print(f"{count:>10} " + " ".join(
+            f"{f'{indexed[name]:.3f} / {unindexed[name]:.3f}':>20}" for name in VIEWS))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import db, Task
+from storage import apply_sqlite_profile, commit_with_retry
+
+# Uso: python benchmarks/bench_write_contention.py [procesos] [segundos]
+PROCESSES = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+DURATION = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+# "before": journal por defecto y sin reintentos; "after": perfil WAL con reintentos de commit
+SCENARIOS = [('before', 'default', 1), ('after', 'wal', 3)]
+
+
+def writer(path, profile, attempts, worker_id, results):
+    engine = create_engine(f"sqlite:///{path}")
+    apply_sqlite_profile(engine, profile)
+    writes = errors = 0
+    deadline = time.monotonic() + DURATION
+    with Session(engine) as session:
+        while time.monotonic() < deadline:
+            # Una transacción por tarea, como POST /tasks
+            try:
+                commit_with_retry(session, lambda: session.execute(
+                    insert(Task).values(user_id=worker_id, task="Contention Task", priority=2)), attempts=attempts)
+                writes += 1
+            except OperationalError:
+                errors += 1
+    engine.dispose()
+    results.put((writes, errors))
+
+
+def run(profile, attempts):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        engine = create_engine(f"sqlite:///{path}")
+        apply_sqlite_profile(engine, profile)
+        db.metadata.create_all(engine)
+        engine.dispose()
+
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=writer, args=(path, profile, attempts, i, results))
+                   for i in range(PROCESSES)]
+        for worker in workers:
+            worker.start()
+        totals = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+    return sum(w for w, _ in totals), sum(e for _, e in totals)
+
+
+def main():
+    print(f"{PROCESSES} processes, {DURATION:.0f}s")
+    print(f"{'scenario':>10} {'profile':>8} {'writes/s':>10} {'locked errors':>14}")
+    for name, profile, attempts in SCENARIOS:
+        writes, errors = run(profile, attempts)
+        print(f"{name:>10} {profile:>8} {writes / DURATION:>10.0f} {errors:>14}")
+
+
+if __name__ == '__main__':
+    main()
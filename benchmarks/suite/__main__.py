@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, ROOT)
+
+from benchmarks.suite.report import compare, summarize  # noqa: E402
+from benchmarks.suite.scenarios import LoginStorm, ReadList, WriteMix, run_scenario  # noqa: E402
+from benchmarks.suite.stubs import StubGoogle, StubWeatherstack  # noqa: E402
+
+# Uso:
+#   python -m benchmarks.suite run [--users 1000 --tasks 1000] [--out results.json]
+#   python -m benchmarks.suite compare base.json new.json [--tolerance 0.10]
+CLIENT_ID = "bench-client"
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def start_server(args, database_uri, google, weatherstack):
+    env = dict(
+        os.environ,
+        BIND=f"127.0.0.1:{args.port}",
+        WEB_CONCURRENCY=str(args.workers),
+        GUNICORN_THREADS=str(args.threads),
+        GUNICORN_ACCESS_LOG="/dev/null",
+        # Sin reciclado de workers: cortaría conexiones keep-alive a mitad de un escenario
+        GUNICORN_MAX_REQUESTS="0",
+        SQLALCHEMY_DATABASE_URI=database_uri,
+        FLASK_SECRET_KEY=os.getenv("FLASK_SECRET_KEY", "bench"),
+        GOOGLE_CLIENT_ID=CLIENT_ID,
+        GOOGLE_CLIENT_SECRET="bench-secret",
+        GOOGLE_DISCOVERY_URL=google.discovery_url,
+        WEATHERSTACK_URL=weatherstack.current_url,
+        WEATHERSTACK_API_KEY="bench",
+        LOGIN_RATE_LIMIT_IP=str(10 ** 9),
+        LOGIN_RATE_LIMIT_USER=str(10 ** 9),
+    )
+    env.update(dict(item.split('=', 1) for item in args.env))
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+                              cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(300):
+        try:
+            requests.get(f"http://127.0.0.1:{args.port}/login", timeout=1)
+            return server
+        except requests.exceptions.RequestException:
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("gunicorn did not start")
+
+
+def run(args):
+    # Importado aquí para que "compare" no cargue la aplicación
+    from benchmarks.suite.seed import seed_database
+
+    scenarios = {
+        'read_list': ReadList(),
+        'write_mix': WriteMix(),
+        'login_storm': LoginStorm(args.users),
+    }
+    selected = args.scenarios.split(',')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_uri = args.database or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        print(f"seeding {args.users} users x {args.tasks} tasks...", file=sys.stderr)
+        start = time.perf_counter()
+        seed_database(database_uri, os.path.join(ROOT, 'migrations'), args.users, args.tasks, seed=args.seed)
+        seed_seconds = time.perf_counter() - start
+
+        google = StubGoogle(CLIENT_ID).start()
+        weatherstack = StubWeatherstack(args.weather_delay).start()
+        server = start_server(args, database_uri, google, weatherstack)
+        results = {}
+        try:
+            base_url = f"http://127.0.0.1:{args.port}"
+            for name in selected:
+                print(f"running {name}...", file=sys.stderr)
+                samples, elapsed = run_scenario(scenarios[name], base_url, args.concurrency, args.iterations,
+                                                args.users, args.seed)
+                results[name] = summarize(samples, elapsed)
+        finally:
+            server.terminate()
+            server.wait()
+            google.stop()
+            weatherstack.stop()
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'users': args.users,
+            'tasks_per_user': args.tasks,
+            'seed': args.seed,
+            'seed_seconds': round(seed_seconds, 1),
+            'concurrency': args.concurrency,
+            'iterations': args.iterations,
+            'workers': args.workers,
+            'threads': args.threads,
+            'env': args.env,
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+        },
+        'scenarios': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as file:
+            file.write(output + '\n')
+    print(output)
+    return 1 if any(result['errors'] for result in results.values()) else 0
+
+
+def compare_files(args):
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+
+    rows, regressions = compare(baseline, current, args.tolerance)
+    print(f"{'scenario':>12} {'metric':>15} {'baseline':>10} {'current':>10} {'change':>8}")
+    for scenario, metric, before, after, change, worse in rows:
+        print(f"{scenario:>12} {metric:>15} {before:>10} {after:>10} {change:>+8.1%}{'  REGRESSION' if worse else ''}")
+    for regression in regressions:
+        print(f"regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="seed a database, start gunicorn and run the scenarios")
+    run_parser.add_argument('--users', type=int, default=1000)
+    run_parser.add_argument('--tasks', type=int, default=1000, help="tasks per user")
+    run_parser.add_argument('--scenarios', default='read_list,write_mix,login_storm')
+    run_parser.add_argument('--concurrency', type=int, default=8, help="virtual users per scenario")
+    run_parser.add_argument('--iterations', type=int, default=200, help="operations per virtual user")
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--workers', type=int, default=2)
+    run_parser.add_argument('--threads', type=int, default=4)
+    run_parser.add_argument('--port', type=int, default=5066)
+    run_parser.add_argument('--weather-delay', type=float, default=0.05, help="stub Weatherstack delay (s)")
+    run_parser.add_argument('--database', help="database URI (default: a temporary SQLite file)")
+    run_parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                            help="extra server environment, e.g. --env SQLITE_PROFILE=default")
+    run_parser.add_argument('--out', help="write the JSON report to this file")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser('compare', help="compare two JSON reports")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--tolerance', type=float, default=0.10,
+                                help="allowed relative change before a metric counts as a regression")
+    compare_parser.set_defaults(handler=compare_files)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
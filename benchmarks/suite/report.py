@@ -0,0 +1,62 @@
+import math
+
+# Métricas que se comparan entre ejecuciones: para las latencias más es peor, para el throughput menos es peor
+LOWER_IS_BETTER = ('p50_ms', 'p95_ms', 'p99_ms')
+HIGHER_IS_BETTER = ('throughput_rps',)
+
+
+def percentile(values, fraction):
+    # Interpolación lineal entre los dos valores más cercanos (igual que numpy por defecto)
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower, upper = math.floor(position), math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def latency_summary(latencies, elapsed):
+    milliseconds = [latency * 1000 for latency in latencies]
+    return {
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(milliseconds, 0.50), 3),
+        'p95_ms': round(percentile(milliseconds, 0.95), 3),
+        'p99_ms': round(percentile(milliseconds, 0.99), 3),
+    }
+
+
+# samples: lista de (etiqueta, segundos, ok, estado HTTP o nombre de la excepción)
+def summarize(samples, elapsed):
+    summary = latency_summary([sample[1] for sample in samples], elapsed)
+    summary['errors'] = sum(1 for sample in samples if not sample[2])
+    summary['by_request'] = {}
+    for label in sorted({sample[0] for sample in samples}):
+        selected = [sample for sample in samples if sample[0] == label]
+        summary['by_request'][label] = latency_summary([sample[1] for sample in selected], elapsed)
+        errors = {}
+        for _, _, ok, status in selected:
+            if not ok:
+                errors[str(status)] = errors.get(str(status), 0) + 1
+        if errors:
+            summary['by_request'][label]['errors'] = errors
+    return summary
+
+
+# Compara dos resultados y devuelve las filas de la tabla y las regresiones por encima de la tolerancia
+def compare(baseline, current, tolerance=0.10):
+    rows, regressions = [], []
+    for scenario, new in current['scenarios'].items():
+        old = baseline['scenarios'].get(scenario)
+        if old is None:
+            continue
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            before, after = old[metric], new[metric]
+            change = (after - before) / before if before else 0.0
+            worse = change > tolerance if metric in LOWER_IS_BETTER else change < -tolerance
+            rows.append((scenario, metric, before, after, change, worse))
+            if worse:
+                regressions.append(f"{scenario} {metric}: {before} -> {after} ({change:+.1%})")
+        if new['errors'] > old['errors']:
+            regressions.append(f"{scenario} errors: {old['errors']} -> {new['errors']}")
+    return rows, regressions
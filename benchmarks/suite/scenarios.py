@@ -0,0 +1,132 @@
+import random
+import threading
+import time
+
+import requests
+
+from .seed import PASSWORD, username
+
+
+class VirtualUser:
+    def __init__(self, base_url, index, users, seed):
+        self.base_url = base_url
+        self.rng = random.Random(seed * 100003 + index)
+        self.user_index = index % users
+        self.http = requests.Session()
+        self.samples = []
+
+    def request(self, label, method, path, expected=(200,), **kwargs):
+        start = time.perf_counter()
+        try:
+            response = self.http.request(method, self.base_url + path, timeout=60, **kwargs)
+            status = response.status_code
+        except requests.exceptions.RequestException as error:
+            response, status = None, type(error).__name__
+        self.samples.append((label, time.perf_counter() - start, status in expected, status))
+        return response
+
+    def login(self, user_index=None):
+        name = username(self.user_index if user_index is None else user_index)
+        return self.request('POST /login', 'POST', '/login', data={'username': name, 'password': PASSWORD},
+                            expected=(302,), allow_redirects=False)
+
+    def close(self):
+        self.http.close()
+
+
+# Lectura: primera página en HTML, recorrido de páginas por la API JSON y algo de clima (stub)
+class ReadList:
+    name = 'read_list'
+
+    def setup(self, user):
+        user.login()
+        user.cursor = None
+
+    def step(self, user):
+        choice = user.rng.random()
+        if choice < 0.05:
+            user.request('GET /weatherstack', 'GET', f"/weatherstack?city=City{user.rng.randrange(20)}")
+            return
+        if choice < 0.6:
+            user.request('GET /tasks', 'GET', '/tasks')
+            return
+        path = '/api/v1/tasks' + (f"?after={user.cursor}" if user.cursor else '')
+        response = user.request('GET /api/v1/tasks', 'GET', path)
+        user.cursor = response.json().get('next_cursor') if response is not None and response.ok else None
+
+
+# Escritura: alta por formulario y por API, edición y borrado de las tareas creadas
+class WriteMix:
+    name = 'write_mix'
+
+    def setup(self, user):
+        user.login()
+        user.created = []
+
+    def step(self, user):
+        choice = user.rng.random()
+        priority = user.rng.randint(1, 3)
+        if choice < 0.2 or not user.created:
+            user.request('POST /tasks', 'POST', '/tasks', data={'task': "Bench task", 'priority': priority})
+            response = user.request('POST /api/v1/tasks', 'POST', '/api/v1/tasks',
+                                    json={'task': "Bench task", 'priority': priority}, expected=(201,))
+            if response is not None and response.status_code == 201:
+                user.created.append(response.json()['id'])
+        elif choice < 0.5:
+            task_id = user.rng.choice(user.created)
+            user.request('PATCH /api/v1/tasks/<id>', 'PATCH', f"/api/v1/tasks/{task_id}",
+                         json={'priority': priority})
+        elif choice < 0.7:
+            task_id = user.rng.choice(user.created)
+            user.request('POST /edit_task/<id>', 'POST', f"/edit_task/{task_id}",
+                         data={'task': "Edited bench task", 'priority': priority}, expected=(200, 302),
+                         allow_redirects=False)
+        else:
+            task_id = user.created.pop(user.rng.randrange(len(user.created)))
+            user.request('DELETE /api/v1/tasks/<id>', 'DELETE', f"/api/v1/tasks/{task_id}")
+
+
+# Tormenta de logins: contraseñas de usuarios distintos y uno de cada cuatro por Google (stub)
+class LoginStorm:
+    name = 'login_storm'
+
+    def __init__(self, users):
+        self.users = users
+
+    def setup(self, user):
+        pass
+
+    def step(self, user):
+        user.http.cookies.clear()
+        if user.rng.random() < 0.25:
+            user.request('GET /google_login', 'GET', '/google_login')
+        else:
+            user.login(user.rng.randrange(self.users))
+
+
+def run_scenario(scenario, base_url, concurrency, iterations, users, seed):
+    virtual_users = [VirtualUser(base_url, index, users, seed) for index in range(concurrency)]
+    for user in virtual_users:
+        scenario.setup(user)
+        user.samples.clear()  # El login de preparación no cuenta
+
+    barrier = threading.Barrier(concurrency + 1)
+
+    def loop(user):
+        barrier.wait()
+        for _ in range(iterations):
+            scenario.step(user)
+
+    threads = [threading.Thread(target=loop, args=(user,)) for user in virtual_users]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    samples = [sample for user in virtual_users for sample in user.samples]
+    for user in virtual_users:
+        user.close()
+    return samples, elapsed
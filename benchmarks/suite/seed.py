@@ -0,0 +1,43 @@
+import random
+
+from flask_migrate import upgrade
+from sqlalchemy import insert
+
+from app import create_app, db, init_migrations, User, Task
+from security import PasswordHasher
+
+PASSWORD = "secure_password"
+
+
+def username(index):
+    return f"bench_user_{index}"
+
+
+# Crea el esquema con las migraciones y carga users x tasks_per_user tareas con prioridades y textos
+# deterministas (misma semilla, mismos datos). Todos los usuarios comparten contraseña y hash: calcular
+# un scrypt por usuario tardaría minutos sin cambiar lo que se mide.
+def seed_database(uri, migrations_dir, users, tasks_per_user, seed=0, hash_method=None, chunk=20000):
+    app = create_app({'SQLALCHEMY_DATABASE_URI': uri})
+    init_migrations(app)
+    rng = random.Random(seed)
+    hasher = PasswordHasher(hash_method or app.config['PASSWORD_HASH_METHOD'], workers=1)
+    password_hash = hasher.hash(PASSWORD)
+    hasher.close()
+
+    with app.app_context():
+        upgrade(directory=migrations_dir)
+        # Base de datos vacía: los ids se asignan en orden (1..users) y la secuencia de PostgreSQL avanza
+        db.session.execute(insert(User), [
+            {'username': username(index), 'password': password_hash} for index in range(users)
+        ])
+        rows = []
+        for user_id in range(1, users + 1):
+            for number in range(tasks_per_user):
+                rows.append({'user_id': user_id, 'task': f"Seeded task {number}", 'priority': rng.randint(1, 3)})
+                if len(rows) >= chunk:
+                    db.session.execute(insert(Task), rows)
+                    rows = []
+        if rows:
+            db.session.execute(insert(Task), rows)
+        db.session.commit()
+        db.engine.dispose()
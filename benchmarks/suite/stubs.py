@@ -0,0 +1,154 @@
+import collections
+import itertools
+import json
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from authlib.common.encoding import urlsafe_b64encode
+from authlib.jose import jwt
+
+
+class StubServer:
+    def __init__(self, handler):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    def send_json(self, payload, status=200, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Proveedor OpenID Connect mínimo en lugar de Google: /authorize redirige de vuelta con un código y
+# /token devuelve un id_token HS256 firmado con una clave publicada en /jwks. Las identidades se
+# reparten en orden entre `identities` usuarios (bench-google-0, bench-google-1, ...). Como Google, los
+# documentos públicos llevan Cache-Control (max_age) y tardan metadata_delay segundos en responder;
+# rotate_key() cambia la clave de firma y su kid, y `requests` cuenta las peticiones por ruta.
+class StubGoogle(StubServer):
+    def __init__(self, client_id, identities=100, max_age=3600, metadata_delay=0.0):
+        self.client_id = client_id
+        self.max_age = max_age
+        self.metadata_delay = metadata_delay
+        self.secret = secrets.token_bytes(32)
+        self.kid = 'bench'
+        self.codes = {}
+        self.subjects = itertools.cycle(range(identities))
+        self.lock = threading.Lock()
+        self.requests = collections.Counter()
+        stub = self
+
+        class Handler(JSONHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                with stub.lock:
+                    stub.requests[url.path] += 1
+                cache_control = {'Cache-Control': f"public, max-age={stub.max_age}"}
+                if url.path in ('/.well-known/openid-configuration', '/jwks'):
+                    time.sleep(stub.metadata_delay)
+                if url.path == '/.well-known/openid-configuration':
+                    self.send_json(stub.metadata(), headers=cache_control)
+                elif url.path == '/jwks':
+                    with stub.lock:
+                        key = {'kty': 'oct', 'kid': stub.kid, 'alg': 'HS256',
+                               'k': urlsafe_b64encode(stub.secret).decode()}
+                    self.send_json({'keys': [key]}, headers=cache_control)
+                elif url.path == '/authorize':
+                    code = stub.issue_code(query.get('nonce'))
+                    location = query['redirect_uri'] + '?' + urlencode({'code': code, 'state': query['state']})
+                    self.send_response(302)
+                    self.send_header('Location', location)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                else:
+                    self.send_json({'error': 'not_found'}, 404)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+                if urlparse(self.path).path != '/token' or form.get('code') not in stub.codes:
+                    self.send_json({'error': 'invalid_grant'}, 400)
+                    return
+                self.send_json(stub.token_for(form['code']))
+
+        super().__init__(Handler)
+
+    @property
+    def discovery_url(self):
+        return f"{self.url}/.well-known/openid-configuration"
+
+    def metadata(self):
+        return {
+            'issuer': self.url,
+            'authorization_endpoint': f"{self.url}/authorize",
+            'token_endpoint': f"{self.url}/token",
+            'jwks_uri': f"{self.url}/jwks",
+            'id_token_signing_alg_values_supported': ['HS256'],
+        }
+
+    def rotate_key(self):
+        with self.lock:
+            self.secret = secrets.token_bytes(32)
+            self.kid = secrets.token_hex(4)
+
+    def issue_code(self, nonce):
+        code = secrets.token_urlsafe(16)
+        with self.lock:
+            self.codes[code] = (nonce, f"bench-google-{next(self.subjects)}")
+        return code
+
+    def token_for(self, code):
+        with self.lock:
+            nonce, subject = self.codes.pop(code)
+        now = int(time.time())
+        claims = {'iss': self.url, 'aud': self.client_id, 'sub': subject, 'email': f"{subject}@example.com",
+                  'iat': now, 'exp': now + 3600, 'nonce': nonce}
+        with self.lock:
+            kid, secret = self.kid, self.secret
+        id_token = jwt.encode({'alg': 'HS256', 'kid': kid}, claims, secret).decode()
+        return {'access_token': secrets.token_urlsafe(16), 'token_type': 'Bearer', 'expires_in': 3600,
+                'id_token': id_token}
+
+
+# Weatherstack falso con retardo fijo por respuesta
+class StubWeatherstack(StubServer):
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        stub = self
+
+        class Handler(JSONHandler):
+            def do_GET(self):
+                time.sleep(stub.delay)
+                city = parse_qs(urlparse(self.path).query).get('query', [''])[0]
+                self.send_json({
+                    'location': {'name': city},
+                    'current': {'temperature': 21, 'weather_descriptions': ['Sunny'], 'weather_icons': ['icon.png']},
+                })
+
+        super().__init__(Handler)
+
+    @property
+    def current_url(self):
+        return f"{self.url}/current"
@@ -0,0 +1,151 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+# Backend en memoria del proceso: LRU por usuario con TTL y número máximo de usuarios
+class LRUTaskCache:
+    def __init__(self, max_users=1024, ttl=30, max_pages=16):
+        self.max_users = max_users
+        self.ttl = ttl
+        self.max_pages = max_pages
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, page_key):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, pages = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return pages.get(page_key)
+
+    def set(self, user_id, page_key, value):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= time.monotonic():
+                entry = (time.monotonic() + self.ttl, {})
+                self._entries[user_id] = entry
+            pages = entry[1]
+            if page_key not in pages and len(pages) >= self.max_pages:
+                pages.pop(next(iter(pages)))
+            pages[page_key] = value
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Backend compatible con Redis: un hash por usuario con expiración (requiere Redis 7+ por EXPIRE NX).
+# La memoria máxima se controla con la política maxmemory del servidor.
+class RedisTaskCache:
+    def __init__(self, url, ttl=30):
+        import redis
+
+        self.ttl = ttl
+        self._errors = redis.RedisError
+        self._redis = redis.Redis.from_url(url)
+
+    def _key(self, user_id):
+        return f"tasks:{user_id}"
+
+    def get(self, user_id, page_key):
+        try:
+            raw = self._redis.hget(self._key(user_id), page_key)
+        except self._errors:
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, user_id, page_key, value):
+        try:
+            pipe = self._redis.pipeline()
+            pipe.hset(self._key(user_id), page_key, json.dumps(value))
+            pipe.expire(self._key(user_id), self.ttl, nx=True)
+            pipe.execute()
+        except self._errors:
+            pass
+
+    def invalidate(self, user_id):
+        try:
+            self._redis.delete(self._key(user_id))
+        except self._errors:
+            pass
+
+    def clear(self):
+        try:
+            for key in self._redis.scan_iter("tasks:*"):
+                self._redis.delete(key)
+        except self._errors:
+            pass
+
+
+# Backend nulo: desactiva la caché sin cambiar el código de las rutas
+class NullTaskCache:
+    def get(self, user_id, page_key):
+        return None
+
+    def set(self, user_id, page_key, value):
+        pass
+
+    def invalidate(self, user_id):
+        pass
+
+    def clear(self):
+        pass
+
+
+# Caché de lectura (read-through) con contadores de aciertos y fallos
+class TaskListCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def get_or_load(self, user_id, page_key, loader):
+        value = self.backend.get(user_id, page_key)
+        if value is not None:
+            self._count('hits')
+            return value
+        self._count('misses')
+        value = loader()
+        self.backend.set(user_id, page_key, value)
+        return value
+
+    def invalidate(self, user_id):
+        self._count('invalidations')
+        self.backend.invalidate(user_id)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['backend'] = type(self.backend).__name__
+        return stats
+
+
+def create_cache_backend(config):
+    backend = config.get('TASK_CACHE_BACKEND', 'memory')
+    ttl = config.get('TASK_CACHE_TTL', 30)
+    if backend == 'redis':
+        return RedisTaskCache(config['TASK_CACHE_URL'], ttl=ttl)
+    if backend == 'memory':
+        return LRUTaskCache(max_users=config.get('TASK_CACHE_MAX_USERS', 1024), ttl=ttl)
+    return NullTaskCache()
@@ -0,0 +1,93 @@
+import zlib
+
+from flask import request
+
+# Compresión de respuestas según Accept-Encoding: brotli (si el paquete está instalado) o gzip. Las
+# respuestas completas se comprimen a partir de min_size bytes; las que van en streaming (/tasks?limit=all,
+# /tasks/export) se comprimen bloque a bloque, vaciando el compresor tras cada bloque para que el navegador
+# pueda ir pintando la lista. Los archivos estáticos ya llegan precomprimidos (assets.py) y el canal SSE no se toca.
+COMPRESSIBLE_TYPES = ('text/html', 'text/plain', 'text/css', 'text/csv', 'application/json', 'application/javascript',
+                      'application/x-ndjson', 'image/svg+xml')
+
+
+class ResponseCompressor:
+    def __init__(self, min_size=1024, gzip_level=6, brotli_quality=4):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+        self._brotli = brotli
+
+    def init_app(self, app):
+        app.extensions['compressor'] = self
+        app.after_request(self.compress)
+
+    @property
+    def encodings(self):
+        return ('br', 'gzip') if self._brotli else ('gzip',)
+
+    def choose_encoding(self):
+        best = None
+        for encoding in self.encodings:
+            quality = request.accept_encodings[encoding]
+            if quality > 0 and (best is None or quality > best[1]):
+                best = (encoding, quality)
+        return best[0] if best else None
+
+    # Devuelve (comprimir, vaciar, terminar) para una respuesta
+    def encoder(self, encoding):
+        if encoding == 'br':
+            compressor = self._brotli.Compressor(quality=self.brotli_quality)
+            return compressor.process, compressor.flush, compressor.finish
+        # wbits=31: formato gzip (cabecera y CRC) en lugar de zlib
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+    def compress(self, response):
+        if (response.status_code < 200 or response.status_code in (204, 304)
+                or response.direct_passthrough or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_TYPES):
+            return response
+        if not response.is_streamed and response.content_length is not None and response.content_length < self.min_size:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = self.choose_encoding()
+        if encoding is None:
+            return response
+
+        process, flush, finish = self.encoder(encoding)
+        if response.is_streamed:
+            response.response = self._stream(response.response, response.iter_encoded(), process, flush, finish)
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(process(response.get_data()) + finish())
+        response.headers['Content-Encoding'] = encoding
+        # Un ETag fuerte identifica los bytes exactos: cada codificación lleva el suyo
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f"{etag}-{encoding}", weak)
+        return response
+
+    # Cerrar la respuesta cierra también el generador original (libera el cursor de la base de datos)
+    @staticmethod
+    def _stream(source, chunks, process, flush, finish):
+        try:
+            for chunk in chunks:
+                data = process(chunk) + flush()
+                if data:
+                    yield data
+            yield finish()
+        finally:
+            if hasattr(source, 'close'):
+                source.close()
+
+
+def create_response_compressor(config):
+    return ResponseCompressor(
+        min_size=config['COMPRESS_MIN_SIZE'],
+        gzip_level=config['COMPRESS_GZIP_LEVEL'],
+        brotli_quality=config['COMPRESS_BROTLI_QUALITY'],
+    )
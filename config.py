@@ -6,7 +6,145 @@ load_dotenv()
 
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
-GOOGLE_DISCOVERY_URL = (
-    "https://accounts.google.com/.well-known/openid-configuration"
+# Se puede apuntar a un proveedor OpenID local (p. ej. el stub de benchmarks/suite)
+GOOGLE_DISCOVERY_URL = os.getenv(
+    "GOOGLE_DISCOVERY_URL", "https://accounts.google.com/.well-known/openid-configuration"
 )
 
+# Caché de los metadatos OpenID y las claves (JWKS) del proveedor: en memoria y en OAUTH_CACHE_PATH
+# (por defecto instance/oauth_metadata.json, compartido por los workers del host). Cada documento dura lo
+# que indique su Cache-Control (OAUTH_METADATA_TTL si no trae, como mucho OAUTH_METADATA_MAX_TTL) y se
+# sigue usando OAUTH_METADATA_STALE_TTL más mientras se refresca. Una clave desconocida vuelve a pedir el
+# JWKS como mucho cada OAUTH_JWKS_REFETCH_INTERVAL segundos. Con OAUTH_WARM_UP los workers de gunicorn
+# cargan ambos documentos al arrancar.
+OAUTH_METADATA_CACHE = os.getenv("OAUTH_METADATA_CACHE", "True") == "True"
+OAUTH_CACHE_PATH = os.getenv("OAUTH_CACHE_PATH")
+OAUTH_METADATA_TTL = int(os.getenv("OAUTH_METADATA_TTL", 3600))
+OAUTH_METADATA_MAX_TTL = int(os.getenv("OAUTH_METADATA_MAX_TTL", 86400))
+OAUTH_METADATA_STALE_TTL = int(os.getenv("OAUTH_METADATA_STALE_TTL", 86400))
+OAUTH_JWKS_REFETCH_INTERVAL = int(os.getenv("OAUTH_JWKS_REFETCH_INTERVAL", 60))
+OAUTH_WARM_UP = os.getenv("OAUTH_WARM_UP", "True") == "True"
+
+# Recordatorios de tareas con fecha límite: con REMINDERS_ENABLED cada proceso (worker de gunicorn) tiene un
+# planificador con los próximos REMINDER_HEAP_SIZE vencimientos en memoria, que vuelve a leer de la base de
+# datos cada REMINDER_POLL_INTERVAL segundos. Los avisos se envían en REMINDER_WORKERS hilos (como mucho
+# REMINDER_MAX_PENDING en curso) al notificador REMINDER_NOTIFIER: "log", "file" (una línea JSON por aviso en
+# REMINDER_LOG_PATH, por defecto instance/reminders.jsonl) o "paquete.modulo:funcion".
+REMINDERS_ENABLED = os.getenv("REMINDERS_ENABLED", "False") == "True"
+REMINDER_NOTIFIER = os.getenv("REMINDER_NOTIFIER", "log")
+REMINDER_LOG_PATH = os.getenv("REMINDER_LOG_PATH")
+REMINDER_HEAP_SIZE = int(os.getenv("REMINDER_HEAP_SIZE", 1000))
+REMINDER_POLL_INTERVAL = float(os.getenv("REMINDER_POLL_INTERVAL", 30))
+REMINDER_WORKERS = int(os.getenv("REMINDER_WORKERS", 4))
+REMINDER_MAX_PENDING = int(os.getenv("REMINDER_MAX_PENDING", 256))
+
+# Tamaño de página para el listado de tareas (paginación por cursor)
+TASKS_PAGE_SIZE = int(os.getenv("TASKS_PAGE_SIZE", 50))
+TASKS_MAX_PAGE_SIZE = int(os.getenv("TASKS_MAX_PAGE_SIZE", 500))
+
+# Lista completa en streaming (/tasks?limit=all): filas leídas por lote y tamaño de cada bloque enviado
+TASKS_STREAM_BATCH = int(os.getenv("TASKS_STREAM_BATCH", 1000))
+TASKS_STREAM_CHUNK = int(os.getenv("TASKS_STREAM_CHUNK", 16384))
+
+# Número máximo de operaciones por lote en /api/v1/tasks/batch
+API_MAX_BATCH = int(os.getenv("API_MAX_BATCH", 5000))
+
+# Importación de tareas (/tasks/import): filas por transacción y errores de validación detallados en el resultado
+TASK_IMPORT_BATCH = int(os.getenv("TASK_IMPORT_BATCH", 5000))
+TASK_IMPORT_MAX_ERRORS = int(os.getenv("TASK_IMPORT_MAX_ERRORS", 100))
+
+# Caché de listas de tareas por usuario: "memory" (LRU en proceso), "redis" o "none"
+TASK_CACHE_BACKEND = os.getenv("TASK_CACHE_BACKEND", "memory")
+TASK_CACHE_URL = os.getenv("TASK_CACHE_URL", "redis://localhost:6379/0")
+TASK_CACHE_TTL = int(os.getenv("TASK_CACHE_TTL", 30))
+TASK_CACHE_MAX_USERS = int(os.getenv("TASK_CACHE_MAX_USERS", 1024))
+
+# Almacenamiento: URL de la base de datos (SQLite o PostgreSQL), perfil de PRAGMAs de SQLite
+# ("wal" o "default"), pool de conexiones y reintentos de commit
+SQLALCHEMY_DATABASE_URI = os.getenv("SQLALCHEMY_DATABASE_URI", "sqlite:///todo.db")
+if SQLALCHEMY_DATABASE_URI.startswith("postgres://"):
+    # Render y Heroku publican URLs "postgres://", que SQLAlchemy ya no acepta
+    SQLALCHEMY_DATABASE_URI = SQLALCHEMY_DATABASE_URI.replace("postgres://", "postgresql://", 1)
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "wal")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+DB_COMMIT_ATTEMPTS = int(os.getenv("DB_COMMIT_ATTEMPTS", 3))
+
+# Reparto de las tareas por usuario en TASK_SHARDS archivos SQLite (0: todas en la base de datos principal).
+# Los archivos van en TASK_SHARD_DIR (por defecto instance/shards) y el mapa de shards (anillo de hash
+# consistente y usuarios fijados o en movimiento) en TASK_SHARD_MAP (por defecto <TASK_SHARD_DIR>/shard_map.json).
+# Tras subir TASK_SHARDS: flask --app app shards rebalance.
+TASK_SHARDS = int(os.getenv("TASK_SHARDS", 0))
+TASK_SHARD_DIR = os.getenv("TASK_SHARD_DIR")
+TASK_SHARD_MAP = os.getenv("TASK_SHARD_MAP")
+
+# Group commit de altas de tareas: las tareas creadas por peticiones concurrentes se insertan juntas en
+# una transacción (hasta TASK_GROUP_COMMIT_ROWS filas, esperando como mucho TASK_GROUP_COMMIT_MS a que
+# lleguen más). Cada petición responde cuando su lote está confirmado.
+TASK_GROUP_COMMIT = os.getenv("TASK_GROUP_COMMIT", "False") == "True"
+TASK_GROUP_COMMIT_ROWS = int(os.getenv("TASK_GROUP_COMMIT_ROWS", 200))
+TASK_GROUP_COMMIT_MS = float(os.getenv("TASK_GROUP_COMMIT_MS", 2))
+
+# Recursos estáticos: al arrancar se minifican (CSS), se renombran con el hash de su contenido y se
+# precomprimen (gzip, y brotli si está instalado) en STATIC_BUILD_DIR (por defecto instance/static); se
+# sirven con caché de STATIC_MAX_AGE segundos. Las plantillas se compilan al arrancar y su bytecode se
+# guarda en TEMPLATE_CACHE_DIR (por defecto instance/templates).
+STATIC_PIPELINE = os.getenv("STATIC_PIPELINE", "True") == "True"
+STATIC_BUILD_DIR = os.getenv("STATIC_BUILD_DIR")
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", 31536000))
+TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR")
+
+# Compresión de respuestas según Accept-Encoding (brotli si está instalado, si no gzip): HTML, JSON y texto
+# a partir de COMPRESS_MIN_SIZE bytes, y la lista completa en streaming bloque a bloque
+COMPRESS_RESPONSES = os.getenv("COMPRESS_RESPONSES", "True") == "True"
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", 6))
+COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", 4))
+
+# Weatherstack: clave, URL, caché por ciudad (segundos) y timeouts de conexión/lectura
+WEATHERSTACK_API_KEY = os.getenv("WEATHERSTACK_API_KEY")
+WEATHERSTACK_URL = os.getenv("WEATHERSTACK_URL", "http://api.weatherstack.com/current")
+WEATHER_CACHE_TTL = int(os.getenv("WEATHER_CACHE_TTL", 600))
+WEATHER_STALE_TTL = int(os.getenv("WEATHER_STALE_TTL", 3600))
+WEATHER_CONNECT_TIMEOUT = float(os.getenv("WEATHER_CONNECT_TIMEOUT", 3.05))
+WEATHER_READ_TIMEOUT = float(os.getenv("WEATHER_READ_TIMEOUT", 5))
+WEATHER_POOL_SIZE = int(os.getenv("WEATHER_POOL_SIZE", 10))
+
+# Contraseñas: método y coste del hash (formato de werkzeug), hilos dedicados al hash y máximo de
+# hashes pendientes antes de responder 503. Los hashes con otro método se recalculan al iniciar sesión.
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+
+# Intentos de login permitidos por IP y por usuario en cada ventana (segundos)
+LOGIN_RATE_LIMIT_IP = int(os.getenv("LOGIN_RATE_LIMIT_IP", 100))
+LOGIN_RATE_LIMIT_USER = int(os.getenv("LOGIN_RATE_LIMIT_USER", 20))
+LOGIN_RATE_WINDOW = int(os.getenv("LOGIN_RATE_WINDOW", 60))
+
+# Sesiones: "cookie" (firmadas, por defecto), "memory" (un solo proceso), "sqlite" (archivo compartido
+# por los workers de un host) o "redis". SESSION_STORE_PATH por defecto es instance/sessions.db.
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "cookie")
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH")
+SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/1")
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", 10000))
+
+# Métricas en /metrics (formato Prometheus) y perfilado de peticiones lentas: se perfila una fracción
+# PROFILE_SAMPLE_RATE de las peticiones y se guarda el perfil si tardan más de PROFILE_SLOW_MS.
+# PROFILE_ENGINE: "cprofile" o "pyinstrument". PROFILE_DIR por defecto es instance/profiles.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "False") == "True"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", 500))
+PROFILE_ENGINE = os.getenv("PROFILE_ENGINE", "cprofile")
+PROFILE_DIR = os.getenv("PROFILE_DIR")
+
+# Canal de cambios de tareas (/tasks/events, Server-Sent Events): "none" (desactivado, por defecto),
+# "memory" (un solo proceso) o "redis" (pub/sub compartido por todos los workers). Cada flujo abierto
+# ocupa un hilo con workers gthread: activarlo junto con GUNICORN_WORKER_CLASS=gevent.
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "none")
+EVENTS_REDIS_URL = os.getenv("EVENTS_REDIS_URL", "redis://localhost:6379/2")
+EVENTS_BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", 100))
+EVENTS_MAX_STREAMS = int(os.getenv("EVENTS_MAX_STREAMS", 1000))
+EVENTS_HEARTBEAT = int(os.getenv("EVENTS_HEARTBEAT", 15))
+EVENTS_STREAM_SECONDS = int(os.getenv("EVENTS_STREAM_SECONDS", 300))
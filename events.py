@@ -0,0 +1,236 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+
+RESET = 'reset'
+
+
+# Backend en memoria: numera los cambios de cada usuario y los entrega a los suscriptores del proceso.
+# Solo sirve con un proceso: con varios workers usar "redis".
+class MemoryEventBackend:
+    def __init__(self):
+        self._sequences = {}
+        self._lock = threading.Lock()
+
+    def publish(self, user_id, changes, deliver):
+        # La numeración y la entrega van bajo el mismo lock para conservar el orden
+        with self._lock:
+            sequence = self._sequences.get(user_id, 0)
+            events = [(sequence + offset, change) for offset, change in enumerate(changes, 1)]
+            self._sequences[user_id] = sequence + len(changes)
+            deliver(user_id, events)
+
+    def sequence(self, user_id):
+        return self._sequences.get(user_id, 0)
+
+    def listen(self, deliver):
+        pass
+
+
+# Backend Redis: un script numera y publica los cambios de una transacción de forma atómica en un único
+# canal; cada worker tiene un solo hilo suscrito que reparte los mensajes entre sus conexiones SSE.
+class RedisEventBackend:
+    CHANNEL = "task_events"
+    PUBLISH_SCRIPT = """
+        local count = tonumber(ARGV[2])
+        local last = redis.call('INCRBY', KEYS[1], count)
+        redis.call('PUBLISH', KEYS[2], ARGV[1] .. ' ' .. (last - count + 1) .. ' ' .. ARGV[3])
+        return last
+    """
+
+    def __init__(self, url):
+        import redis
+
+        self._errors = redis.RedisError
+        self._redis = redis.Redis.from_url(url)
+        self._publish = self._redis.register_script(self.PUBLISH_SCRIPT)
+
+    def _key(self, user_id):
+        return f"task_events:seq:{user_id}"
+
+    def publish(self, user_id, changes, deliver):
+        # Los cambios ya están confirmados: si Redis falla, los clientes los verán al recargar
+        try:
+            self._publish(keys=[self._key(user_id), self.CHANNEL], args=[user_id, len(changes), json.dumps(changes)])
+        except self._errors:
+            pass
+
+    def sequence(self, user_id):
+        try:
+            return int(self._redis.get(self._key(user_id)) or 0)
+        except self._errors:
+            return 0
+
+    def listen(self, deliver):
+        threading.Thread(target=self._listen, args=(deliver,), daemon=True, name='task-events').start()
+
+    def _listen(self, deliver):
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.CHANNEL)
+                for message in pubsub.listen():
+                    user_id, first, payload = message['data'].decode().split(' ', 2)
+                    changes = json.loads(payload)
+                    deliver(int(user_id), [(int(first) + offset, change) for offset, change in enumerate(changes)])
+            except self._errors:
+                time.sleep(1)
+
+
+# Backend nulo: desactiva el canal de cambios
+class NullEventBackend:
+    def publish(self, user_id, changes, deliver):
+        pass
+
+    def sequence(self, user_id):
+        return 0
+
+    def listen(self, deliver):
+        pass
+
+
+class Subscription:
+    def __init__(self, user_id, max_pending):
+        self.user_id = user_id
+        self._queue = queue.Queue(max_pending)
+
+    def put(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # Cliente demasiado lento: se descartan los cambios pendientes y se le pide recargar
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._queue.put_nowait(RESET)
+
+    def get(self, timeout):
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+# Canal de cambios por usuario. Guarda los últimos cambios de cada usuario para que un cliente que se
+# reconecta (Last-Event-ID) reciba los que se perdió; si ya no están, se le envía "reset" y recarga.
+class TaskEventHub:
+    def __init__(self, backend, buffer_size=100, max_users=10000, max_pending=1000, max_streams=1000):
+        self.backend = backend
+        self.buffer_size = buffer_size
+        self.max_users = max_users
+        self.max_pending = max_pending
+        self.max_streams = max_streams
+        self._subscribers = {}
+        self._streams = 0
+        self._buffers = OrderedDict()
+        self._lock = threading.Lock()
+        self._listening_pid = None
+
+    @property
+    def enabled(self):
+        return not isinstance(self.backend, NullEventBackend)
+
+    def configure(self, backend, buffer_size=100, max_pending=1000, max_streams=1000):
+        self.backend = backend
+        self.buffer_size = buffer_size
+        self.max_pending = max_pending
+        self.max_streams = max_streams
+        self._listening_pid = None
+        with self._lock:
+            self._buffers.clear()
+
+    def publish(self, user_id, changes):
+        if changes:
+            self.backend.publish(user_id, changes, self.deliver)
+
+    def sequence(self, user_id):
+        return self.backend.sequence(user_id)
+
+    def deliver(self, user_id, events):
+        with self._lock:
+            buffer = self._buffers.get(user_id)
+            if buffer is None:
+                buffer = self._buffers[user_id] = deque(maxlen=self.buffer_size)
+            buffer.extend(events)
+            self._buffers.move_to_end(user_id)
+            while len(self._buffers) > self.max_users:
+                self._buffers.popitem(last=False)
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            subscription.put(events)
+
+    def subscribe(self, user_id, last_event_id=None):
+        # Un hilo de escucha por proceso (no sobrevive a un fork)
+        if self._listening_pid != os.getpid():
+            self._listening_pid = os.getpid()
+            self.backend.listen(self.deliver)
+
+        # Se registra antes de calcular lo perdido: un cambio puede llegar dos veces (el flujo descarta
+        # los repetidos por su número), pero no perderse
+        current = self.sequence(user_id) if last_event_id is not None else 0
+        subscription = Subscription(user_id, self.max_pending)
+        with self._lock:
+            self._streams += 1
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+            buffered = list(self._buffers.get(user_id, ()))
+
+        if last_event_id is not None and current > last_event_id:
+            missed = [event for event in buffered if event[0] > last_event_id]
+            if missed and missed[0][0] == last_event_id + 1:
+                subscription.put(missed)
+            else:
+                subscription.put(RESET)
+        return subscription
+
+    def has_capacity(self):
+        return self._streams < self.max_streams
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._streams -= 1
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    # Genera el flujo SSE: cambios como eventos "task" con su número como id, comentarios de
+    # keep-alive y cierre tras max_seconds (el navegador se reconecta solo con Last-Event-ID).
+    # La suscripción se crea al empezar a iterar: cerrar un generador sin empezar no ejecuta su finally.
+    def stream(self, user_id, last_event_id=None, heartbeat=15, max_seconds=300):
+        subscription = self.subscribe(user_id, last_event_id)
+        last_sent = last_event_id or 0
+        deadline = time.monotonic() + max_seconds
+        try:
+            yield "retry: 2000\n\n"
+            while time.monotonic() < deadline:
+                item = subscription.get(timeout=min(heartbeat, max(deadline - time.monotonic(), 0)))
+                if item is None:
+                    yield ": keep-alive\n\n"
+                elif item == RESET:
+                    yield "event: reset\ndata: {}\n\n"
+                    return
+                else:
+                    chunk = []
+                    for sequence, change in item:
+                        if sequence > last_sent:
+                            chunk.append(f"id: {sequence}\nevent: task\ndata: {json.dumps(change)}\n\n")
+                            last_sent = sequence
+                    if chunk:
+                        yield "".join(chunk)
+        finally:
+            self.unsubscribe(subscription)
+
+
+def create_event_backend(config):
+    backend = config.get('EVENTS_BACKEND', 'none')
+    if backend == 'redis':
+        return RedisEventBackend(config['EVENTS_REDIS_URL'])
+    if backend == 'memory':
+        return MemoryEventBackend()
+    return NullEventBackend()
@@ -0,0 +1,59 @@
+import multiprocessing
+import os
+
+# Configuración de gunicorn para producción (ver docs/Setup_Guide.md)
+bind = os.getenv("BIND", "0.0.0.0:5000")
+
+# Procesos worker y hilos por worker
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+# Tipo de worker: "gthread" (un hilo por petición) o "gevent" (corrutinas). Con gevent las llamadas
+# de red bloqueantes (Google OAuth, Weatherstack, PostgreSQL) ceden el control y un solo worker
+# atiende hasta worker_connections peticiones en vuelo.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 1000))
+
+# Reciclado de workers: cada worker se reinicia tras max_requests (+ jitter para no reiniciarlos todos a la vez)
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+# Tiempo para terminar las peticiones en curso en una recarga (kill -HUP) o parada (kill -TERM)
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = 5
+
+# Cargar la aplicación en el maestro antes del fork. Con preload, "kill -HUP" recicla los workers
+# pero no recarga el código; para desplegar código nuevo usar GUNICORN_PRELOAD=False o USR2.
+# Con gevent se desactiva por defecto: el monkey patching debe ocurrir antes de importar requests.
+preload_app = os.getenv("GUNICORN_PRELOAD", "False" if worker_class == "gevent" else "True") == "True"
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+
+
+def post_fork(server, worker):
+    # Solo con preload hay una aplicación heredada del maestro que reiniciar. Sin preload se carga después
+    # en el worker; importarla aquí la cargaría antes del monkey patching de gevent y sus colas bloquearían
+    # el hub (p. ej. el pool de hash de contraseñas en el login).
+    if server.cfg.preload_app:
+        from app import app, reset_after_fork
+
+        reset_after_fork(app)
+
+    if worker_class == "gevent":
+        # psycopg2 coopera con gevent mediante un wait callback (solo si se usa PostgreSQL)
+        try:
+            from psycogreen.gevent import patch_psycopg
+        except ImportError:
+            return
+        patch_psycopg()
+
+
+def post_worker_init(worker):
+    # Metadatos OpenID y claves de Google cargados antes de aceptar peticiones: un worker nuevo no se
+    # detiene en el primer login a descargarlos (normalmente los lee del archivo compartido)
+    from app import start_reminders, warm_up_oauth
+
+    warm_up_oauth(worker.wsgi)
+    # Planificador de recordatorios (REMINDERS_ENABLED): uno por worker; cada aviso lo reclama solo uno
+    start_reminders(worker.wsgi)
@@ -0,0 +1,255 @@
+import cProfile
+import os
+import random
+import threading
+import time
+
+from flask import Response, g, has_request_context, request, before_render_template, template_rendered
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+def format_labels(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+# Contador e histograma con el formato de texto de Prometheus (sin depender de prometheus_client).
+# Las métricas son por proceso: con varios workers cada scrape ve solo el worker que responde.
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            yield f"{self.name}_total{format_labels(self.labels, label_values)} {value}"
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, description, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            entry = self._values.setdefault(label_values, [[0] * len(self.buckets), 0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, *label_values):
+        with self._lock:
+            entry = self._values.get(label_values)
+            return entry[2] if entry else 0
+
+    def total(self, *label_values):
+        with self._lock:
+            entry = self._values.get(label_values)
+            return entry[1] if entry else 0.0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(buckets), total, count)) for key, (buckets, total, count) in self._values.items())
+        names = self.labels + ('le',)
+        for label_values, (buckets, total, count) in items:
+            for bound, bucket_count in zip(self.buckets, buckets):
+                yield f"{self.name}_bucket{format_labels(names, label_values + (bound,))} {bucket_count}"
+            yield f"{self.name}_bucket{format_labels(names, label_values + ('+Inf',))} {count}"
+            yield f"{self.name}_sum{format_labels(self.labels, label_values)} {total}"
+            yield f"{self.name}_count{format_labels(self.labels, label_values)} {count}"
+
+
+# Perfilado por muestreo: se perfila una fracción de las peticiones y se guarda el perfil solo si la
+# petición tardó más que el umbral. "cprofile" escribe .prof (snakeviz, pstats); "pyinstrument" escribe
+# .html (requiere pip install pyinstrument).
+class SlowRequestProfiler:
+    def __init__(self, directory, threshold=0.5, sample_rate=0.01, engine='cprofile'):
+        self.directory = directory
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.engine = engine
+        if engine == 'pyinstrument':
+            import pyinstrument
+
+            self._pyinstrument = pyinstrument
+
+    def start(self):
+        if random.random() >= self.sample_rate:
+            return None
+        if self.engine == 'pyinstrument':
+            profiler = self._pyinstrument.Profiler()
+            profiler.start()
+            return profiler
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return None  # Otro perfilador activo en este hilo
+        return profiler
+
+    def finish(self, profiler, elapsed, endpoint):
+        if self.engine == 'pyinstrument':
+            profiler.stop()
+        else:
+            profiler.disable()
+        if elapsed < self.threshold:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{endpoint}-{int(elapsed * 1000)}ms-{os.getpid()}-{threading.get_ident()}"
+        if self.engine == 'pyinstrument':
+            path = os.path.join(self.directory, name + '.html')
+            with open(path, 'w') as output:
+                output.write(profiler.output_html())
+        else:
+            path = os.path.join(self.directory, name + '.prof')
+            profiler.dump_stats(path)
+        return path
+
+
+# Middleware opcional de métricas: latencia por ruta, consultas SQL por petición y su duración,
+# tiempo de render de plantillas y de llamadas HTTP salientes. Se publica en /metrics.
+class RequestMetrics:
+    def __init__(self, profiler=None):
+        self.profiler = profiler
+        self.request_latency = Histogram(
+            'todo_http_request_duration_seconds', 'Request latency by endpoint.', ('endpoint', 'method'))
+        self.requests = Counter(
+            'todo_http_requests', 'Requests by endpoint and status.', ('endpoint', 'method', 'status'))
+        self.sql_queries = Histogram(
+            'todo_sql_queries_per_request', 'SQL statements executed per request.', ('endpoint',), COUNT_BUCKETS)
+        self.sql_latency = Histogram(
+            'todo_sql_query_duration_seconds', 'SQL statement latency by endpoint.', ('endpoint',), QUERY_BUCKETS)
+        self.template_latency = Histogram(
+            'todo_template_render_seconds', 'Template render time.', ('template',))
+        self.outbound_latency = Histogram(
+            'todo_outbound_http_duration_seconds', 'Outbound HTTP time until response headers.', ('service', 'status'))
+        self.profiles = Counter(
+            'todo_slow_request_profiles', 'Profiles written for slow sampled requests.', ('endpoint',))
+        self.metrics = [self.request_latency, self.requests, self.sql_queries, self.sql_latency,
+                        self.template_latency, self.outbound_latency, self.profiles]
+
+    def init_app(self, app, engine):
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        self.instrument(engine)
+        before_render_template.connect(self._before_render, app, weak=False)
+        template_rendered.connect(self._after_render, app, weak=False)
+        app.add_url_rule('/metrics', 'metrics', self.export)
+        app.extensions['metrics'] = self
+
+    # Consultas SQL de un engine (la base de datos principal y cada shard de tareas)
+    def instrument(self, engine):
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _endpoint(self):
+        if has_request_context():
+            return request.endpoint or 'unmatched'
+        return 'none'
+
+    def _before_request(self):
+        g.metrics_start = time.perf_counter()
+        g.metrics_sql_queries = 0
+        g.metrics_profiler = self.profiler.start() if self.profiler else None
+
+    def _after_request(self, response):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = self._endpoint()
+        self.request_latency.observe(elapsed, endpoint, request.method)
+        self.requests.inc(endpoint, request.method, response.status_code)
+        self.sql_queries.observe(g.pop('metrics_sql_queries', 0), endpoint)
+
+        profiler = g.pop('metrics_profiler', None)
+        if profiler is not None and self.profiler.finish(profiler, elapsed, endpoint):
+            self.profiles.inc(endpoint)
+        return response
+
+    def _teardown_request(self, error=None):
+        # Peticiones que terminaron en excepción: no dejar el perfilador activo en el hilo
+        profiler = g.pop('metrics_profiler', None)
+        if profiler is not None:
+            self.profiler.finish(profiler, 0, self._endpoint())
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('metrics_query_start')
+        if not starts:
+            return
+        self.sql_latency.observe(time.perf_counter() - starts.pop(), self._endpoint())
+        if has_request_context() and 'metrics_sql_queries' in g:
+            g.metrics_sql_queries += 1
+
+    def _before_render(self, sender, template, context, **extra):
+        g.setdefault('metrics_template_starts', []).append(time.perf_counter())
+
+    def _after_render(self, sender, template, context, **extra):
+        starts = g.get('metrics_template_starts')
+        if starts:
+            self.template_latency.observe(time.perf_counter() - starts.pop(), template.name or 'string')
+
+    # Hook de respuesta de requests para medir llamadas salientes (Weatherstack, Google)
+    def requests_hook(self, service):
+        def record(response, *args, **kwargs):
+            self.outbound_latency.observe(response.elapsed.total_seconds(), service, response.status_code)
+        return record
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def export(self):
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+
+def create_request_metrics(config):
+    profiler = None
+    if config.get('PROFILE_SAMPLE_RATE', 0) > 0:
+        profiler = SlowRequestProfiler(
+            config['PROFILE_DIR'],
+            threshold=config.get('PROFILE_SLOW_MS', 500) / 1000,
+            sample_rate=config['PROFILE_SAMPLE_RATE'],
+            engine=config.get('PROFILE_ENGINE', 'cprofile'),
+        )
+    return RequestMetrics(profiler)
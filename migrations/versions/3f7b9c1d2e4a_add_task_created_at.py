@@ -0,0 +1,41 @@
+"""add task created_at and sort/filter indexes
+
+Revision ID: 3f7b9c1d2e4a
+Revises: 8a41d2c7b9e3
+Create Date: 2026-10-18 16:04:12.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f7b9c1d2e4a'
+down_revision = '8a41d2c7b9e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), nullable=True))
+
+    # Las tareas existentes reciben la fecha de la migración (el id desempata el orden). En SQLite se
+    # guarda con microsegundos, el mismo formato que escribe SQLAlchemy, para que las comparaciones
+    # del cursor funcionen sobre el texto
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("UPDATE task SET created_at = strftime('%Y-%m-%d %H:%M:%f000', 'now')")
+    else:
+        op.execute("UPDATE task SET created_at = now() AT TIME ZONE 'UTC'")
+
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_index('ix_task_user_created_id', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_task_user_task_lower', 'task', ['user_id', sa.text('lower(task)')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_task_user_task_lower', table_name='task')
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_user_created_id')
+        batch_op.drop_column('created_at')
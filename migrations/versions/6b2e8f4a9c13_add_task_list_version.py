@@ -0,0 +1,30 @@
+"""add task_list_version table
+
+Revision ID: 6b2e8f4a9c13
+Revises: 9d4e2b7a1c58
+Create Date: 2026-10-18 20:12:05.904117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b2e8f4a9c13'
+down_revision = '9d4e2b7a1c58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Sin filas: todas las listas existentes empiezan en la versión 0
+    op.create_table('task_list_version',
+    sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('task_list_version')
@@ -0,0 +1,26 @@
+"""add task (user_id, priority, id) index
+
+Revision ID: 8a41d2c7b9e3
+Revises: 5c162e6f305c
+Create Date: 2026-10-18 11:52:31.102417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a41d2c7b9e3'
+down_revision = '5c162e6f305c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.create_index('ix_task_user_priority_id', ['user_id', 'priority', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_user_priority_id')
@@ -0,0 +1,47 @@
+"""add task full-text search index
+
+Revision ID: 9d4e2b7a1c58
+Revises: 3f7b9c1d2e4a
+Create Date: 2026-10-18 18:21:40.337915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4e2b7a1c58'
+down_revision = '3f7b9c1d2e4a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        op.execute("CREATE INDEX ix_task_search ON task USING gin (to_tsvector('simple', task))")
+        return
+
+    # Tabla FTS5 de contenido externo (las filas se leen de task) y triggers que la mantienen al día.
+    # Una migración posterior que recree la tabla task con batch_alter_table debe volver a crear los triggers.
+    op.execute("CREATE VIRTUAL TABLE task_fts USING fts5("
+               "task, content='task', content_rowid='id', "
+               "tokenize='unicode61 remove_diacritics 2', prefix='2 3')")
+    op.execute("CREATE TRIGGER task_fts_insert AFTER INSERT ON task BEGIN "
+               "INSERT INTO task_fts(rowid, task) VALUES (new.id, new.task); END")
+    op.execute("CREATE TRIGGER task_fts_delete AFTER DELETE ON task BEGIN "
+               "INSERT INTO task_fts(task_fts, rowid, task) VALUES ('delete', old.id, old.task); END")
+    op.execute("CREATE TRIGGER task_fts_update AFTER UPDATE OF task ON task BEGIN "
+               "INSERT INTO task_fts(task_fts, rowid, task) VALUES ('delete', old.id, old.task); "
+               "INSERT INTO task_fts(rowid, task) VALUES (new.id, new.task); END")
+    # Indexa las tareas existentes
+    op.execute("INSERT INTO task_fts(task_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        op.drop_index('ix_task_search', table_name='task')
+        return
+
+    for trigger in ('task_fts_insert', 'task_fts_delete', 'task_fts_update'):
+        op.execute(f"DROP TRIGGER {trigger}")
+    op.execute("DROP TABLE task_fts")
@@ -0,0 +1,32 @@
+"""add task due_at, reminded_at and pending reminder index
+
+Revision ID: c7e1a4d9f2b6
+Revises: 6b2e8f4a9c13
+Create Date: 2026-10-18 23:40:51.227403
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e1a4d9f2b6'
+down_revision = '6b2e8f4a9c13'
+branch_labels = None
+depends_on = None
+
+PENDING = 'due_at IS NOT NULL AND reminded_at IS NULL'
+
+
+def upgrade():
+    # Columnas opcionales: en SQLite basta con ADD COLUMN, sin recrear la tabla (ni los triggers de task_fts)
+    op.add_column('task', sa.Column('due_at', sa.DateTime(), nullable=True))
+    op.add_column('task', sa.Column('reminded_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_task_due_pending', 'task', ['due_at'], unique=False,
+                    sqlite_where=sa.text(PENDING), postgresql_where=sa.text(PENDING))
+
+
+def downgrade():
+    op.drop_index('ix_task_due_pending', table_name='task')
+    op.drop_column('task', 'reminded_at')
+    op.drop_column('task', 'due_at')
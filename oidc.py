@@ -0,0 +1,213 @@
+import contextlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+from authlib.integrations.flask_client import OAuth
+from authlib.integrations.flask_client.apps import FlaskOAuth2App
+from flask import current_app, has_app_context
+
+MAX_AGE = re.compile(r'(?:^|,)\s*(?:s-)?max-age\s*=\s*"?(\d+)"?', re.I)
+NO_CACHE = re.compile(r'(?:^|,)\s*(?:no-store|no-cache)\b', re.I)
+
+
+# Duración de un documento según su Cache-Control (max-age menos Age), acotada a [min_ttl, max_ttl];
+# default_ttl si no trae ninguna
+def cache_lifetime(headers, default_ttl, min_ttl, max_ttl):
+    cache_control = headers.get('Cache-Control', '')
+    if NO_CACHE.search(cache_control):
+        return min_ttl
+    match = MAX_AGE.search(cache_control)
+    if not match:
+        return max(min_ttl, min(default_ttl, max_ttl))
+    try:
+        age = int(headers.get('Age', 0))
+    except ValueError:
+        age = 0
+    return max(min_ttl, min(int(match.group(1)) - age, max_ttl))
+
+
+class ProviderMetadataError(Exception):
+    pass
+
+
+# Caché del documento de descubrimiento OpenID y de las claves de firma (JWKS) del proveedor. Cada worker
+# guarda los documentos en memoria y en un archivo JSON compartido por los workers del host:
+# - Dentro de su duración (Cache-Control del proveedor) se responde desde la caché; un worker recién
+#   arrancado lee el archivo en lugar de ir a la red.
+# - Durante stale_ttl más se responde el documento viejo y se refresca en segundo plano; si el proveedor
+#   falla, se sigue usando hasta que caduque.
+# - Un id_token firmado con una clave desconocida (rotación) fuerza a pedir de nuevo el JWKS, como mucho
+#   una vez cada jwks_refetch_interval segundos para que tokens falsos no sirvan para saturar al proveedor.
+# - Las peticiones simultáneas del mismo documento comparten una sola llamada.
+class ProviderMetadataCache:
+    MIN_TTL = 60
+
+    def __init__(self, discovery_url, path=None, ttl=3600, max_ttl=86400, stale_ttl=86400,
+                 jwks_refetch_interval=60, connect_timeout=3.05, read_timeout=5):
+        self.discovery_url = discovery_url
+        self.path = path
+        self.ttl = ttl
+        self.max_ttl = max_ttl
+        self.stale_ttl = stale_ttl
+        self.jwks_refetch_interval = jwks_refetch_interval
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self._entries = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='oidc-refresh')
+        self.upstream_calls = 0
+
+    @classmethod
+    def from_config(cls, config, path):
+        return cls(
+            config['GOOGLE_DISCOVERY_URL'],
+            path=path,
+            ttl=config['OAUTH_METADATA_TTL'],
+            max_ttl=config['OAUTH_METADATA_MAX_TTL'],
+            stale_ttl=config['OAUTH_METADATA_STALE_TTL'],
+            jwks_refetch_interval=config['OAUTH_JWKS_REFETCH_INTERVAL'],
+        )
+
+    def metadata(self):
+        return self._get('metadata', self.discovery_url)
+
+    def jwks(self, force=False):
+        url = self.metadata().get('jwks_uri')
+        if not url:
+            raise ProviderMetadataError('Missing "jwks_uri" in provider metadata')
+        if force:
+            entry = self._entry('jwks', url)
+            if entry is None or time.time() - entry['fetched_at'] >= self.jwks_refetch_interval:
+                return self._fetch_coalesced('jwks', url).result()
+        return self._get('jwks', url)
+
+    # Carga ambos documentos antes de la primera petición (arranque del worker)
+    def warm_up(self):
+        self.jwks()
+
+    def _get(self, name, url):
+        entry = self._entry(name, url)
+        if entry:
+            now = time.time()
+            if now < entry['expires_at']:
+                return entry['document']
+            if now < entry['expires_at'] + self.stale_ttl:
+                self._refresher.submit(self._refresh, name, url)
+                return entry['document']
+        return self._fetch_coalesced(name, url).result()
+
+    # Entrada vigente para la URL: la de memoria o, si ya caducó, la del archivo si otro worker la refrescó
+    def _entry(self, name, url):
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is None or entry['url'] != url or entry['expires_at'] <= time.time():
+            stored = self._read_file().get(name)
+            if stored and stored.get('url') == url and (entry is None or entry['url'] != url
+                                                        or stored['expires_at'] > entry['expires_at']):
+                with self._lock:
+                    self._entries[name] = entry = stored
+        return entry if entry and entry['url'] == url else None
+
+    def _refresh(self, name, url):
+        # Si el refresco falla se sigue sirviendo el documento viejo hasta que caduque
+        try:
+            self._fetch_coalesced(name, url).result()
+        except (requests.exceptions.RequestException, ProviderMetadataError):
+            pass
+
+    def _fetch_coalesced(self, name, url):
+        with self._lock:
+            future = self._inflight.get(name)
+            if future:
+                return future
+            future = Future()
+            self._inflight[name] = future
+
+        try:
+            entry = self._fetch(url)
+        except Exception as error:
+            future.set_exception(error)
+        else:
+            with self._lock:
+                self._entries[name] = entry
+            self._write_file(name, entry)
+            future.set_result(entry['document'])
+        finally:
+            with self._lock:
+                self._inflight.pop(name, None)
+        return future
+
+    def _fetch(self, url):
+        self.upstream_calls += 1
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        try:
+            document = response.json()
+        except ValueError:
+            raise ProviderMetadataError(f"Invalid JSON from {url}")
+        now = time.time()
+        lifetime = cache_lifetime(response.headers, self.ttl, self.MIN_TTL, self.max_ttl)
+        return {'url': url, 'fetched_at': now, 'expires_at': now + lifetime, 'document': document}
+
+    def _read_file(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    # Escritura atómica: los demás workers leen el archivo entero o el anterior, nunca uno a medias
+    def _write_file(self, name, entry):
+        if not self.path:
+            return
+        stored = self._read_file()
+        stored[name] = entry
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix='.tmp-')
+        except OSError:
+            return
+        try:
+            with os.fdopen(descriptor, 'w') as file:
+                json.dump(stored, file)
+            os.replace(temporary, self.path)
+        except BaseException as error:
+            # El temporal no debe quedar junto al archivo compartido. Sin archivo cada worker pide los
+            # documentos al proveedor, así que un fallo de escritura no se propaga; cualquier otro error sí
+            with contextlib.suppress(OSError):
+                os.unlink(temporary)
+            if not isinstance(error, OSError):
+                raise
+
+
+def provider_metadata_cache():
+    return current_app.extensions.get('oidc_metadata') if has_app_context() else None
+
+
+# Cliente OAuth de Authlib que toma los metadatos y el JWKS de ProviderMetadataCache (si la aplicación
+# tiene una) en lugar de pedirlos una vez por proceso y guardarlos para siempre
+class CachedMetadataOAuth2App(FlaskOAuth2App):
+    def load_server_metadata(self):
+        cache = provider_metadata_cache()
+        if cache is None:
+            return super().load_server_metadata()
+        return dict(self.server_metadata, **cache.metadata())
+
+    def fetch_jwk_set(self, force=False):
+        cache = provider_metadata_cache()
+        if cache is None:
+            return super().fetch_jwk_set(force)
+        return cache.jwks(force=force)
+
+
+class CachedMetadataOAuth(OAuth):
+    oauth2_client_cls = CachedMetadataOAuth2App
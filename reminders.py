@@ -0,0 +1,177 @@
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# Notificador por defecto: una línea en el log de la aplicación por recordatorio
+class LogNotifier:
+    def __init__(self, log=None):
+        self.log = log or logger
+
+    def __call__(self, reminder):
+        self.log.info("Reminder: task %s of user %s is due at %s", reminder['id'], reminder['user_id'],
+                      reminder['due_at'].isoformat())
+
+
+# Notificador local a archivo: una línea JSON por recordatorio. Cada línea se escribe con un solo write()
+# en modo O_APPEND, así que varios procesos pueden compartir el archivo sin mezclar líneas.
+class FileNotifier:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    def __call__(self, reminder):
+        line = json.dumps(dict(reminder, due_at=reminder['due_at'].isoformat())) + "\n"
+        descriptor = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(descriptor, line.encode())
+        finally:
+            os.close(descriptor)
+
+
+# Notificador según REMINDER_NOTIFIER: "log", "file" (REMINDER_LOG_PATH) o la ruta de un callable propio
+# ("paquete.modulo:funcion"), que recibe el diccionario del recordatorio
+def create_notifier(config, log=None):
+    name = config['REMINDER_NOTIFIER']
+    if name == 'log':
+        return LogNotifier(log)
+    if name == 'file':
+        return FileNotifier(config['REMINDER_LOG_PATH'])
+    from werkzeug.utils import import_string
+
+    return import_string(name)
+
+
+# Planificador de recordatorios de tareas con fecha límite. Un hilo por proceso mantiene en un montículo
+# (min-heap) los próximos `capacity` vencimientos pendientes, leídos en orden del índice parcial de due_at,
+# y duerme hasta el primero:
+# - load(limit) devuelve [(due_at, task_id), ...] de las tareas pendientes más próximas, en orden.
+# - claim(task_ids, now) marca como enviadas, en una sola sentencia condicional, las que siguen pendientes
+#   y vencidas, y devuelve sus filas. Con varios procesos cada recordatorio lo reclama solo uno; una tarea
+#   cuya fecha cambió después de cargarla no se reclama con la fecha vieja.
+# - notify(reminder) se llama en un pool de `workers` hilos; con `max_pending` envíos en curso el
+#   planificador espera (no acumula sin límite ni descarta).
+# La lista se vuelve a leer cada poll_interval segundos (tareas de otros procesos) y en cuanto se vacía si
+# estaba llena. schedule() añade las tareas de este proceso sin esperar a esa lectura.
+class ReminderScheduler:
+    def __init__(self, load, claim, notify, capacity=1000, poll_interval=30, workers=4, max_pending=256,
+                 now=utcnow):
+        self.load = load
+        self.claim = claim
+        self.notify = notify
+        self.capacity = capacity
+        self.poll_interval = poll_interval
+        self.now = now
+        self._heap = []
+        # Último vencimiento cargado si la carga llenó el montículo: lo posterior se verá en la siguiente
+        self._horizon = None
+        self._reload_at = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='reminder')
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self.stats = {'loads': 0, 'claimed': 0, 'sent': 0, 'failed': 0}
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name='reminders')
+                self._thread.start()
+        return self
+
+    def stop(self, wait=True):
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None and wait:
+            self._thread.join()
+        self._pool.shutdown(wait=wait)
+
+    # Tareas con fecha confirmadas en este proceso: [(due_at, task_id), ...]
+    def schedule(self, entries):
+        added = False
+        with self._lock:
+            for due_at, task_id in entries:
+                if self._horizon is None or due_at <= self._horizon:
+                    heapq.heappush(self._heap, (due_at, task_id))
+                    added = True
+        if added:
+            self._wake.set()
+
+    def _reload(self):
+        entries = self.load(self.capacity)
+        self.stats['loads'] += 1
+        with self._lock:
+            self._heap = [(due_at, task_id) for due_at, task_id in entries]
+            heapq.heapify(self._heap)
+            self._horizon = entries[-1][0] if len(entries) >= self.capacity else None
+        self._reload_at = time.monotonic() + self.poll_interval
+
+    def _pop_due(self, now):
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap)[1])
+            # Montículo lleno y ya vacío: quedan tareas pendientes sin cargar
+            exhausted = not self._heap and self._horizon is not None
+        return due, exhausted
+
+    # Segundos hasta el próximo vencimiento o la próxima lectura, lo que llegue antes
+    def _timeout(self, now):
+        timeout = self._reload_at - time.monotonic()
+        with self._lock:
+            if self._heap:
+                timeout = min(timeout, (self._heap[0][0] - now).total_seconds())
+        return max(timeout, 0)
+
+    def run_once(self):
+        if time.monotonic() >= self._reload_at:
+            self._reload()
+        now = self.now()
+        due, exhausted = self._pop_due(now)
+        if due:
+            # Sin duplicados: una tarea reprogramada puede estar dos veces en el montículo
+            for reminder in self.claim(sorted(set(due)), now):
+                self.stats['claimed'] += 1
+                self._dispatch(reminder)
+        if exhausted:
+            self._reload_at = 0
+        return self._timeout(self.now())
+
+    def _dispatch(self, reminder):
+        self._pending.acquire()
+        future = self._pool.submit(self.notify, reminder)
+        future.add_done_callback(self._finished)
+
+    def _finished(self, future):
+        self._pending.release()
+        error = future.exception()
+        with self._lock:
+            self.stats['failed' if error else 'sent'] += 1
+        if error:
+            logger.error("Reminder notification failed", exc_info=error)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            # Se limpia antes de la iteración: un aviso que llegue mientras corre despierta la siguiente espera
+            self._wake.clear()
+            try:
+                timeout = self.run_once()
+            except Exception:
+                # Base de datos caída o bloqueada: se reintenta en la siguiente lectura
+                logger.exception("Reminder scheduler iteration failed")
+                self._reload_at = time.monotonic() + self.poll_interval
+                timeout = self.poll_interval
+            self._wake.wait(timeout)
@@ -0,0 +1,126 @@
+import math
+import re
+
+from sqlalchemy import DDL, event, text
+
+# Búsqueda de texto sobre las tareas. En SQLite usa una tabla virtual FTS5 de contenido externo
+# (task_fts) que los triggers mantienen al día con cada INSERT, UPDATE y DELETE de task; en PostgreSQL,
+# un índice GIN sobre to_tsvector('simple', task). El esquema lo crean las migraciones y, para
+# db.create_all(), los eventos de install_search_index().
+FTS_TABLE = 'task_fts'
+
+SQLITE_DDL = [
+    # Solo se indexa el texto: indexar también user_id obligaría a cruzar cada búsqueda con la lista
+    # de todas las filas del usuario; el usuario se filtra al unir con task
+    "CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5("
+    "task, content='task', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_insert AFTER INSERT ON task BEGIN "
+    "INSERT INTO task_fts(rowid, task) VALUES (new.id, new.task); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_delete AFTER DELETE ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, task) VALUES ('delete', old.id, old.task); END",
+    # Cambiar solo la prioridad no vuelve a indexar la fila
+    "CREATE TRIGGER IF NOT EXISTS task_fts_update AFTER UPDATE OF task ON task BEGIN "
+    "INSERT INTO task_fts(task_fts, rowid, task) VALUES ('delete', old.id, old.task); "
+    "INSERT INTO task_fts(rowid, task) VALUES (new.id, new.task); END",
+]
+POSTGRES_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_task_search ON task USING gin (to_tsvector('simple', task))",
+]
+
+# Consulta del usuario: palabras (deben aparecer todas), "frases entre comillas" y prefijos con
+# asterisco (compr* o "lista de comp"*). Solo se conservan las palabras, así que los operadores de
+# FTS5 o de tsquery escritos por el usuario no llegan a la base de datos.
+TERM_PATTERN = re.compile(r'"([^"]*)"(\*?)|(\S+)')
+WORD_PATTERN = re.compile(r'\w+')
+MAX_TERMS = 16
+
+
+def install_search_index(table):
+    for statement in SQLITE_DDL:
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    for statement in POSTGRES_DDL:
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+    # Los triggers desaparecen con la tabla; la tabla FTS hay que borrarla aparte
+    event.listen(table, 'before_drop', DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}").execute_if(dialect='sqlite'))
+
+
+# Para Alembic: la tabla FTS (y sus tablas internas) y el índice GIN no están en los modelos
+def include_search_objects(name, type_, parent_names):
+    if type_ == 'table':
+        return not name.startswith(FTS_TABLE)
+    if type_ == 'index':
+        return name != 'ix_task_search'
+    return True
+
+
+# Devuelve [(palabras, prefijo)]; una lista vacía si la consulta no tiene ninguna palabra
+def parse_search_query(query):
+    terms = []
+    for phrase, phrase_prefix, word in TERM_PATTERN.findall(query or ''):
+        words = tuple(WORD_PATTERN.findall(phrase or word))
+        if words:
+            terms.append((words, bool(phrase_prefix) or word.endswith('*')))
+    return terms[:MAX_TERMS]
+
+
+def fts5_query(terms):
+    return " ".join('"' + " ".join(words) + '"' + ('*' if prefix else '') for words, prefix in terms)
+
+
+def tsquery(terms):
+    return " & ".join(
+        " <-> ".join(words[:-1] + (words[-1] + (':*' if prefix else ''),)) for words, prefix in terms)
+
+
+# Cursor de los resultados: "<puntuación>:<id>" del último resultado de la página (menor puntuación = mejor).
+# Un id fuera del rango de 64 bits con signo no es un cursor válido (no llega a la base de datos).
+def parse_search_cursor(cursor):
+    try:
+        score, task_id = cursor.rsplit(':', 1)
+        score, task_id = float(score), int(task_id)
+    except (AttributeError, ValueError):
+        return None
+    return (score, task_id) if math.isfinite(score) and 0 <= task_id < 2 ** 63 else None
+
+
+def search_statement(dialect, after):
+    if dialect == 'sqlite':
+        # bm25 es negativo y menor cuanto más relevante
+        score = "bm25(task_fts)"
+        source = "task_fts JOIN task ON task.id = task_fts.rowid"
+        match = "task_fts MATCH :query"
+    else:
+        # ts_rank normalizado por la longitud (1 + log) como bm25; en double precision para que el cursor
+        # reproduzca la puntuación exacta
+        score = "-CAST(ts_rank(to_tsvector('simple', task.task), to_tsquery('simple', :query), 1) AS double precision)"
+        source = "task"
+        match = "to_tsvector('simple', task.task) @@ to_tsquery('simple', :query)"
+    keyset = f"AND ({score} > :score OR ({score} = :score AND task.id > :after_id))" if after else ""
+    return text(
+        f"SELECT task.id, task.task, task.priority, {score} AS score FROM {source} "
+        f"WHERE {match} AND task.user_id = :user_id {keyset} "
+        f"ORDER BY score, task.id LIMIT :limit"
+    )
+
+
+# Una página de resultados ordenados por relevancia (el id desempata). Ordenar exige puntuar todas las
+# coincidencias, así que el coste crece con las filas que contienen los términos. La puntuación depende de
+# estadísticas de toda la tabla: si otras tareas cambian entre páginas, el cursor sigue siendo válido
+# pero algún resultado puede repetirse u omitirse. La consulta es texto SQL: bind_arguments (p. ej.
+# {'mapper': Task}) indica a la sesión en qué base de datos está la tabla task (shards.py).
+def search_tasks(session, user_id, terms, after=None, limit=50, bind_arguments=None):
+    dialect = session.get_bind(**(bind_arguments or {})).dialect.name
+    params = {
+        'query': fts5_query(terms) if dialect == 'sqlite' else tsquery(terms),
+        'user_id': user_id,
+        'limit': limit + 1,
+    }
+    if after:
+        params.update(score=after[0], after_id=after[1])
+    rows = session.execute(search_statement(dialect, after), params, bind_arguments=bind_arguments).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = f"{rows[-1].score!r}:{rows[-1].id}"
+    return [{'id': row.id, 'task': row.task, 'priority': row.priority} for row in rows], next_cursor
@@ -0,0 +1,230 @@
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSession, SecureCookieSessionInterface, SessionInterface
+
+
+# Backend en memoria del proceso con expiración y desalojo LRU. Solo sirve con un proceso:
+# con varios workers de gunicorn usar "sqlite" (mismo host) o "redis".
+class MemorySessionStore:
+    def __init__(self, max_sessions=10000):
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._by_user = {}
+        self._lock = threading.Lock()
+
+    def get(self, sid):
+        with self._lock:
+            entry = self._sessions.get(sid)
+            if entry is None:
+                return None
+            expires_at, user_id, data = entry
+            if expires_at <= time.time():
+                self._remove(sid)
+                return None
+            self._sessions.move_to_end(sid)
+            return data
+
+    def save(self, sid, data, user_id, ttl):
+        with self._lock:
+            self._remove(sid)
+            self._sessions[sid] = (time.time() + ttl, user_id, data)
+            if user_id is not None:
+                self._by_user.setdefault(user_id, set()).add(sid)
+            while len(self._sessions) > self.max_sessions:
+                self._remove(next(iter(self._sessions)))
+
+    def _remove(self, sid):
+        entry = self._sessions.pop(sid, None)
+        if entry and entry[1] is not None:
+            sids = self._by_user.get(entry[1], set())
+            sids.discard(sid)
+            if not sids:
+                self._by_user.pop(entry[1], None)
+
+    def delete(self, sid):
+        with self._lock:
+            self._remove(sid)
+
+    def delete_user(self, user_id):
+        with self._lock:
+            for sid in list(self._by_user.get(user_id, ())):
+                self._remove(sid)
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+            self._by_user.clear()
+
+
+# Backend en una tabla SQLite propia (compartida por todos los workers del mismo host)
+class SqliteSessionStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_store ("
+                "sid TEXT PRIMARY KEY, user_id INTEGER, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_session_store_user_id ON session_store (user_id)")
+
+    def _connection(self):
+        # Una conexión por hilo y por proceso (las conexiones no sobreviven a un fork)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, sid):
+        row = self._connection().execute(
+            "SELECT data FROM session_store WHERE sid = ? AND expires_at > ?", (sid, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def save(self, sid, data, user_id, ttl):
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO session_store (sid, user_id, data, expires_at) VALUES (?, ?, ?, ?)",
+                (sid, user_id, data, time.time() + ttl),
+            )
+            # Limpieza ocasional de sesiones caducadas
+            if secrets.randbelow(100) == 0:
+                conn.execute("DELETE FROM session_store WHERE expires_at <= ?", (time.time(),))
+
+    def delete(self, sid):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM session_store WHERE sid = ?", (sid,))
+
+    def delete_user(self, user_id):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM session_store WHERE user_id = ?", (user_id,))
+
+    def clear(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM session_store")
+
+
+# Backend compatible con Redis: una clave por sesión y un set por usuario para revocarlas todas
+class RedisSessionStore:
+    def __init__(self, url):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, sid):
+        data = self._redis.get(f"session:{sid}")
+        return data.decode() if data is not None else None
+
+    def save(self, sid, data, user_id, ttl):
+        pipe = self._redis.pipeline()
+        pipe.set(f"session:{sid}", data, ex=ttl)
+        if user_id is not None:
+            pipe.sadd(f"user_sessions:{user_id}", sid)
+            pipe.expire(f"user_sessions:{user_id}", ttl)
+        pipe.execute()
+
+    def delete(self, sid):
+        self._redis.delete(f"session:{sid}")
+
+    def delete_user(self, user_id):
+        sids = self._redis.smembers(f"user_sessions:{user_id}")
+        keys = [f"session:{sid.decode()}" for sid in sids] + [f"user_sessions:{user_id}"]
+        self._redis.delete(*keys)
+
+    def clear(self):
+        for key in self._redis.scan_iter("session:*"):
+            self._redis.delete(key)
+        for key in self._redis.scan_iter("user_sessions:*"):
+            self._redis.delete(key)
+
+
+class ServerSideSession(SecureCookieSession):
+    def __init__(self, initial=None, sid=None):
+        super().__init__(initial)
+        self.sid = sid or secrets.token_urlsafe(32)
+
+
+# Sesiones guardadas en el servidor: la cookie solo lleva un identificador aleatorio
+class ServerSideSessionInterface(SessionInterface):
+    server_side = True
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store):
+        self.store = store
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        data = self.store.get(sid) if sid else None
+        if data is None:
+            return ServerSideSession()
+        return ServerSideSession(self.serializer.loads(data), sid=sid)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.modified:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.accessed:
+            response.vary.add('Cookie')
+        if not self.should_set_cookie(app, session):
+            return
+
+        ttl = int(app.permanent_session_lifetime.total_seconds())
+        self.store.save(session.sid, self.serializer.dumps(dict(session)), session.get('user_id'), ttl)
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+    # Nuevo identificador al iniciar sesión (evita la fijación de sesión)
+    def regenerate(self, session):
+        self.store.delete(session.sid)
+        session.sid = secrets.token_urlsafe(32)
+        session.modified = True
+
+    def revoke_user(self, user_id):
+        self.store.delete_user(user_id)
+
+
+# Sesiones firmadas en la cookie (comportamiento por defecto de Flask). No se pueden revocar
+# desde el servidor, así que el usuario se comprueba en la base de datos en cada petición.
+class CookieSessionInterface(SecureCookieSessionInterface):
+    server_side = False
+
+    def regenerate(self, session):
+        pass
+
+    def revoke_user(self, user_id):
+        pass
+
+
+def create_session_interface(config):
+    backend = config.get('SESSION_BACKEND', 'cookie')
+    if backend == 'memory':
+        return ServerSideSessionInterface(MemorySessionStore(config.get('SESSION_MAX_ENTRIES', 10000)))
+    if backend == 'sqlite':
+        return ServerSideSessionInterface(SqliteSessionStore(config['SESSION_STORE_PATH']))
+    if backend == 'redis':
+        return ServerSideSessionInterface(RedisSessionStore(config['SESSION_REDIS_URL']))
+    return CookieSessionInterface()
@@ -0,0 +1,248 @@
+import bisect
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+
+import sqlalchemy as sa
+from flask import current_app, has_app_context
+from flask_sqlalchemy.session import Session
+
+# Reparto de las tareas por usuario entre varios archivos SQLite (TASK_SHARDS). Cada usuario tiene todas
+# sus tareas (y su versión de la lista) en un solo shard, así que las consultas de un usuario no cruzan
+# shards y cada archivo tiene su propio bloqueo de escritura. El shard sale del mapa de shards
+# (TASK_SHARD_MAP, un JSON compartido por los workers):
+# - "shards": los shards del anillo de hash consistente, que decide el shard de cada usuario.
+# - "pinned": usuarios fijados a otro shard (o a "main", la base de datos principal) hasta que el
+#   rebalanceo los mueva a su sitio en el anillo.
+# - "moving": usuarios que se están moviendo ({"from", "to"}); sus peticiones reciben 503 mientras tanto.
+# - "cleanup": shards con copias viejas de un usuario ya movido, pendientes de borrar.
+MAIN = 'main'
+VNODES = 64
+
+
+class ShardMoving(Exception):
+    pass
+
+
+class ShardNotSelected(RuntimeError):
+    pass
+
+
+def ring_hash(key):
+    return int.from_bytes(hashlib.blake2b(str(key).encode(), digest_size=8).digest(), 'big')
+
+
+# Anillo de hash consistente: cada shard ocupa `vnodes` puntos y un usuario va al primer punto a partir de
+# su hash. Al pasar de N a N+1 shards solo cambia de shard ~1/(N+1) de los usuarios, todos hacia el nuevo.
+class HashRing:
+    def __init__(self, shards, vnodes=VNODES):
+        points = sorted((ring_hash(f"{shard}#{index}"), shard) for shard in shards for index in range(vnodes))
+        self._hashes = [point for point, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_for(self, key):
+        return self._shards[bisect.bisect(self._hashes, ring_hash(key)) % len(self._hashes)]
+
+
+def read_json(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+# Escritura atómica: los workers leen el mapa entero o el anterior, nunca uno a medias
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.tmp-')
+    try:
+        with os.fdopen(descriptor, 'w') as file:
+            json.dump(data, file, sort_keys=True)
+        os.replace(temporary, path)
+    except BaseException:
+        # El temporal no debe quedar junto al mapa
+        with suppress(OSError):
+            os.unlink(temporary)
+        raise
+
+
+# Mapa de shards de un proceso. Se vuelve a leer cuando cambia el archivo (un stat() por consulta), así que
+# los cambios del rebalanceo llegan a todos los workers sin reiniciarlos.
+class ShardMap:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp = None
+        self.refresh()
+
+    # Crea el mapa con los shards iniciales (y los usuarios que ya tienen tareas en la base de datos
+    # principal fijados a ella) si todavía no existe
+    @classmethod
+    def open(cls, path, shards, main_users=()):
+        if not os.path.exists(path):
+            write_json(path, {'shards': list(shards), 'pinned': {str(user_id): MAIN for user_id in main_users},
+                              'moving': {}, 'cleanup': {}})
+        return cls(path)
+
+    def refresh(self):
+        stat = os.stat(self.path)
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    self._load(read_json(self.path))
+                    self._stamp = stamp
+
+    def _load(self, data):
+        self.shards = data['shards']
+        self.ring = HashRing(self.shards, data.get('vnodes', VNODES))
+        self.pinned = {int(user_id): shard for user_id, shard in data['pinned'].items()}
+        self.moving = {int(user_id): tuple(move) for user_id, move in data['moving'].items()}
+        self.cleanup = {int(user_id): shard for user_id, shard in data['cleanup'].items()}
+
+    def save(self):
+        write_json(self.path, {
+            'shards': self.shards,
+            'pinned': {str(user_id): shard for user_id, shard in self.pinned.items()},
+            'moving': {str(user_id): list(move) for user_id, move in self.moving.items()},
+            'cleanup': {str(user_id): shard for user_id, shard in self.cleanup.items()},
+        })
+        self._stamp = None
+        self.refresh()
+
+    # Shard donde están las tareas del usuario; ShardMoving si se están moviendo
+    def shard_for(self, user_id):
+        self.refresh()
+        # Con el bloqueo: nunca se ve el anillo nuevo con los usuarios fijados del mapa anterior
+        with self._lock:
+            if user_id in self.moving:
+                raise ShardMoving(user_id)
+            return self.placement(user_id)
+
+    def placement(self, user_id):
+        return self.pinned.get(user_id) or self.ring.shard_for(user_id)
+
+    # Un solo rebalanceo a la vez: el resto de procesos solo leen el mapa
+    @contextmanager
+    def exclusive(self):
+        with file_lock(f"{self.path}.lock"):
+            self._stamp = None
+            self.refresh()
+            yield self
+
+
+# Bloqueo exclusivo entre procesos sobre un archivo (p. ej. `<mapa>.lock`)
+@contextmanager
+def file_lock(path):
+    with open(path, 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+# Shards de la aplicación: el mapa, el engine de cada shard ("main" es la base de datos principal) y las
+# tablas que se reparten
+class TaskShards:
+    def __init__(self, shard_map, engines, tables):
+        self.map = shard_map
+        self.engines = engines
+        self.tables = frozenset(tables)
+
+    def shard_for(self, user_id):
+        return self.map.shard_for(user_id)
+
+    def engine(self, shard):
+        if shard is None:
+            raise ShardNotSelected("Task tables are sharded: select the user's shard before querying them.")
+        return self.engines[shard]
+
+    def routes(self, mapper, clause):
+        if mapper is not None:
+            return sa.inspect(mapper).local_table in self.tables
+        table = clause if isinstance(clause, sa.Table) else getattr(clause, 'table', None)
+        return table in self.tables
+
+    # Consultas de administración sobre todos los shards (en paralelo): [(shard, filas), ...]
+    def scatter(self, statement, params=None, shards=None):
+        shards = list(shards or self.map.shards)
+
+        def run(shard):
+            with self.engines[shard].connect() as connection:
+                return shard, connection.execute(statement, params or {}).all()
+
+        with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+            return list(pool.map(run, shards))
+
+
+# db.session con las tablas repartidas enviadas al engine del shard elegido en session.info['task_shard']
+# (lo elige login_required con el usuario de la petición); el resto, a la base de datos principal
+class ShardedSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        shards = current_app.extensions.get('task_shards') if bind is None and has_app_context() else None
+        if shards is not None and shards.routes(mapper, clause):
+            return shards.engine(self.info.get('task_shard'))
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+# Lleva cada usuario a su shard del anillo después de añadir shards (y los de la base de datos principal al
+# activar el reparto). Se puede interrumpir y volver a lanzar en cualquier momento:
+# - users_on(shard): ids de los usuarios con filas en ese shard.
+# - move(user_id, source, target, switch): copia las filas a `target`, llama a switch() (que apunta el
+#   usuario a `target` en el mapa) y solo entonces borra el origen en la misma transacción que las leyó.
+# - purge(user_id, shard): borra las copias viejas que quedaron si move() se cortó después de switch().
+# Los usuarios se mueven por lotes: se marcan como "moving", se esperan `grace` segundos (lo que puede
+# durar una petición que empezó con el mapa anterior) y se mueven uno a uno.
+def rebalance(shard_map, shards, users_on, move, purge, grace=30, batch=1000, log=None):
+    log = log or (lambda message: None)
+    with shard_map.exclusive():
+        for user_id, shard in sorted(shard_map.cleanup.items()):
+            purge(user_id, shard)
+            del shard_map.cleanup[user_id]
+        shard_map.save()
+
+        # Shards nuevos en el anillo: los usuarios que cambiarían de shard se quedan fijados donde están
+        # hasta moverlos, así que el cambio del anillo no esconde ninguna tarea
+        added = [shard for shard in shards if shard not in shard_map.shards]
+        if added:
+            ring = HashRing(shard_map.shards + added)
+            for shard in [MAIN] + shard_map.shards:
+                for user_id in users_on(shard):
+                    if shard_map.placement(user_id) == shard and ring.shard_for(user_id) != shard:
+                        shard_map.pinned[user_id] = shard
+            shard_map.shards = shard_map.shards + added
+            shard_map.save()
+            log(f"Added shards {', '.join(added)} to the ring")
+
+        # Movimientos cortados en una ejecución anterior primero; el origen sigue siendo válido
+        pending = sorted(shard_map.moving.items())
+        pending += sorted((user_id, (shard, shard_map.ring.shard_for(user_id)))
+                          for user_id, shard in shard_map.pinned.items()
+                          if user_id not in shard_map.moving and shard != shard_map.ring.shard_for(user_id))
+        moved = 0
+        for start in range(0, len(pending), batch):
+            chunk = pending[start:start + batch]
+            shard_map.moving.update(chunk)
+            shard_map.save()
+            time.sleep(grace)
+            for user_id, (source, target) in chunk:
+                def switch(user_id=user_id, source=source, target=target):
+                    shard_map.pinned.pop(user_id, None)
+                    if shard_map.ring.shard_for(user_id) != target:
+                        # Movimiento cortado antes de añadir más shards: el siguiente rebalanceo lo termina
+                        shard_map.pinned[user_id] = target
+                    shard_map.moving.pop(user_id, None)
+                    shard_map.cleanup[user_id] = source
+                    shard_map.save()
+
+                move(user_id, source, target, switch)
+                shard_map.cleanup.pop(user_id, None)
+            shard_map.save()
+            moved += len(chunk)
+            log(f"Moved {moved} of {len(pending)} users")
+        return moved
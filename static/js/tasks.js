@@ -0,0 +1,212 @@
+// Actualizaciones incrementales de la lista de tareas: los formularios usan la API JSON y solo se
+// modifica la fila afectada; con el canal de cambios activo (/tasks/events) también se aplican los
+// cambios hechos desde otras pestañas o dispositivos. Sin JavaScript los formularios siguen funcionando.
+(function () {
+    var list = document.getElementById('task-list');
+    if (!list || !window.fetch) {
+        return;
+    }
+    var PRIORITY_LABELS = {1: 'High', 2: 'Medium', 3: 'Low'};
+    var hasMore = list.dataset.hasMore === 'true';
+    var firstPage = list.dataset.firstPage !== 'false';
+    // Vista elegida en el formulario de orden y filtros (ver parse_task_view en app.py)
+    var sort = list.dataset.sort || 'priority';
+    var priorities = (list.dataset.priorities || '').split(',').filter(Boolean).map(Number);
+    var prefix = (list.dataset.prefix || '').toLowerCase();
+
+    function element(tag, attributes, children) {
+        var node = document.createElement(tag);
+        Object.keys(attributes || {}).forEach(function (name) {
+            node.setAttribute(name, attributes[name]);
+        });
+        (children || []).forEach(function (child) {
+            node.appendChild(typeof child === 'string' ? document.createTextNode(child) : child);
+        });
+        return node;
+    }
+
+    // Misma estructura que la fila generada por tasks.html
+    function buildRow(task) {
+        var select = element('select', {id: 'edit-priority-select-' + task.id, name: 'priority', required: ''},
+            [1, 2, 3].map(function (priority) {
+                return element('option', {value: String(priority)}, [PRIORITY_LABELS[priority]]);
+            }));
+        return element('li', {id: 'task-' + task.id, 'data-task-id': task.id}, [
+            element('div', {'class': 'task-container'}, [
+                element('h2', {'class': 'task-title'}),
+                element('p', {'class': 'task-priority'}),
+                element('p', {'class': 'task-due'}),
+            ]),
+            element('form', {'class': 'edit-task-form', method: 'POST', action: '/edit_task/' + task.id}, [
+                element('input', {type: 'text', id: 'edit-task-input-' + task.id, name: 'task', required: ''}),
+                element('label', {'for': 'priority-' + task.id}, ['Priority:']),
+                select,
+                element('label', {'for': 'edit-due-at-input-' + task.id}, ['Due (UTC):']),
+                element('input', {type: 'datetime-local', id: 'edit-due-at-input-' + task.id, name: 'due_at'}),
+                element('button', {id: 'edit-task-button-' + task.id, type: 'submit'}, ['Edit']),
+            ]),
+            element('form', {'class': 'delete-task-form', method: 'GET', action: '/delete_task/' + task.id}, [
+                element('button', {id: 'delete-task-button-' + task.id, type: 'submit'}, ['Delete']),
+            ]),
+        ]);
+    }
+
+    function fill(row, task) {
+        row.dataset.priority = task.priority;
+        row.querySelector('.task-title').textContent = task.task;
+        row.querySelector('.task-priority').textContent = 'Priority: ' + PRIORITY_LABELS[task.priority];
+        row.querySelector('input[name="task"]').value = task.task;
+        row.querySelector('select[name="priority"]').value = String(task.priority);
+        // Fecha límite en UTC, "AAAA-MM-DDTHH:MM" como la del formulario
+        var due = task.due_at ? task.due_at.slice(0, 16) : '';
+        var dueText = row.querySelector('.task-due');
+        dueText.hidden = !due;
+        dueText.textContent = due ? 'Due: ' + due.replace('T', ' ') + ' UTC' : '';
+        row.querySelector('input[name="due_at"]').value = due;
+    }
+
+    function sortsBefore(a, b) {
+        var pa = Number(a.dataset.priority), pb = Number(b.dataset.priority);
+        return pa < pb || (pa === pb && Number(a.dataset.taskId) < Number(b.dataset.taskId));
+    }
+
+    // Coloca la fila en orden (prioridad, id). Si hay más páginas y la fila va después de la última
+    // visible, pertenece a una página posterior y se quita de esta.
+    function place(row) {
+        var rows = Array.prototype.filter.call(list.children, function (other) { return other !== row; });
+        for (var i = 0; i < rows.length; i++) {
+            if (sortsBefore(row, rows[i])) {
+                list.insertBefore(row, rows[i]);
+                return;
+            }
+        }
+        if (hasMore && rows.length) {
+            row.remove();
+        } else {
+            list.appendChild(row);
+        }
+    }
+
+    function matches(task) {
+        return (!priorities.length || priorities.indexOf(task.priority) !== -1) &&
+            task.task.toLowerCase().indexOf(prefix) === 0;
+    }
+
+    // Con orden por fecha las filas existentes no se mueven (la fecha no cambia); las nuevas van al
+    // principio de la primera página (más recientes primero) o al final de la última (más antiguas primero)
+    function placeByDate(row, isNew) {
+        if (!isNew) {
+            return;
+        }
+        if (sort === '-created' && firstPage) {
+            list.insertBefore(row, list.firstChild);
+        } else if (sort === 'created' && !hasMore) {
+            list.appendChild(row);
+        }
+    }
+
+    function upsert(task) {
+        var existing = document.getElementById('task-' + task.id);
+        if (!matches(task)) {
+            if (existing) {
+                existing.remove();
+            }
+            return;
+        }
+        var row = existing || buildRow(task);
+        fill(row, task);
+        if (sort === 'priority') {
+            place(row);
+        } else {
+            placeByDate(row, !existing);
+        }
+    }
+
+    function remove(taskId) {
+        var row = document.getElementById('task-' + taskId);
+        if (row) {
+            row.remove();
+        }
+    }
+
+    function apply(change) {
+        if (change.type === 'deleted') {
+            remove(change.task.id);
+        } else {
+            upsert(change.task);
+        }
+    }
+
+    function showError(message) {
+        var error = document.querySelector('p.error');
+        if (!error) {
+            error = element('p', {'class': 'error'});
+            document.getElementById('add-task-form').before(error);
+        }
+        error.textContent = message;
+    }
+
+    function send(method, url, body) {
+        return fetch(url, {
+            method: method,
+            headers: body ? {'Content-Type': 'application/json'} : {},
+            body: body ? JSON.stringify(body) : undefined,
+            credentials: 'same-origin',
+        }).then(function (response) {
+            return response.json().then(function (data) {
+                if (!response.ok) {
+                    throw new Error(data.error || 'Request failed.');
+                }
+                return data;
+            });
+        });
+    }
+
+    function formTask(form) {
+        return {
+            task: form.querySelector('[name="task"]').value.trim(),
+            priority: Number(form.querySelector('[name="priority"]').value),
+            due_at: form.querySelector('[name="due_at"]').value || null,
+        };
+    }
+
+    document.getElementById('add-task-form').addEventListener('submit', function (event) {
+        event.preventDefault();
+        var form = event.target, task = formTask(form);
+        send('POST', '/api/v1/tasks', task).then(function (result) {
+            upsert({id: result.id, task: task.task, priority: task.priority, due_at: task.due_at});
+            form.querySelector('[name="task"]').value = '';
+            form.querySelector('[name="due_at"]').value = '';
+        }).catch(function (error) { showError(error.message); });
+    });
+
+    list.addEventListener('submit', function (event) {
+        var form = event.target;
+        var row = form.closest('li');
+        if (form.classList.contains('edit-task-form')) {
+            event.preventDefault();
+            var task = formTask(form);
+            send('PATCH', '/api/v1/tasks/' + row.dataset.taskId, task).then(function () {
+                upsert({id: Number(row.dataset.taskId), task: task.task, priority: task.priority, due_at: task.due_at});
+            }).catch(function (error) { showError(error.message); });
+        } else if (form.classList.contains('delete-task-form')) {
+            event.preventDefault();
+            send('DELETE', '/api/v1/tasks/' + row.dataset.taskId).then(function () {
+                remove(row.dataset.taskId);
+            }).catch(function (error) { showError(error.message); });
+        }
+    });
+
+    // Canal de cambios: "task" trae una fila insertada/modificada/borrada; "reset" indica que se
+    // perdieron cambios (cliente lento o historial agotado) y hay que recargar la página
+    if (list.dataset.eventsUrl && window.EventSource) {
+        var source = new EventSource(list.dataset.eventsUrl + '?last_event_id=' + list.dataset.lastEventId);
+        source.addEventListener('task', function (event) {
+            apply(JSON.parse(event.data));
+        });
+        source.addEventListener('reset', function () {
+            source.close();
+            window.location.reload();
+        });
+    }
+})();
@@ -0,0 +1,121 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+# Perfiles de PRAGMAs para SQLite. "wal" permite lectores concurrentes con un escritor
+# y reduce los fsync (synchronous=NORMAL es seguro en modo WAL).
+SQLITE_PROFILES = {
+    'default': {},
+    'wal': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -64000,  # 64 MB
+        'mmap_size': 268435456,  # 256 MB
+    },
+}
+
+
+def is_memory_database(uri):
+    return uri in ('sqlite://', 'sqlite:///:memory:') or 'mode=memory' in uri
+
+
+# Opciones del pool de conexiones; las bases en memoria usan un pool estático sin tamaño.
+# En servidores de base de datos las conexiones se reciclan y se comprueban antes de usarse.
+def engine_options(uri, pool_size=5, max_overflow=10, pool_timeout=30, pool_recycle=1800):
+    if is_memory_database(uri):
+        return {}
+    options = {'pool_size': pool_size, 'max_overflow': max_overflow, 'pool_timeout': pool_timeout}
+    if not uri.startswith('sqlite'):
+        options.update(pool_recycle=pool_recycle, pool_pre_ping=True)
+    return options
+
+
+# Aplica los PRAGMAs del perfil en cada conexión nueva del engine
+def apply_sqlite_profile(engine, profile):
+    pragmas = SQLITE_PROFILES[profile]
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def is_busy_error(error):
+    message = str(getattr(error, 'orig', error)).lower()
+    return 'database is locked' in message or 'database is busy' in message
+
+
+# Ejecuta work() y confirma la transacción, reintentando si SQLite devuelve "database is locked".
+# Tras un rollback los cambios pendientes se pierden, por eso se repite work() completo.
+def commit_with_retry(session, work, attempts=3, backoff=0.05):
+    for attempt in range(attempts):
+        try:
+            result = work()
+            session.commit()
+            return result
+        except OperationalError as error:
+            session.rollback()
+            if not is_busy_error(error) or attempt == attempts - 1:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+# Group commit: agrupa escrituras de peticiones concurrentes en una sola transacción. Un hilo por proceso
+# toma lo que haya en la cola (hasta max_rows), espera como mucho max_delay segundos a que llegue más y
+# llama a flush(items), que debe confirmar el lote y devolver un resultado por elemento. submit() bloquea
+# hasta que el lote de su elemento se confirma (o falla), así que al volver la escritura ya es visible.
+class GroupCommitter:
+    def __init__(self, flush, max_rows=200, max_delay=0.002, timeout=30):
+        self.flush = flush
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker_pid = None
+
+    def submit(self, item):
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, future))
+        return future.result(timeout=self.timeout)
+
+    def _ensure_worker(self):
+        # El hilo no sobrevive a un fork: cada worker de gunicorn arranca el suyo
+        if self._worker_pid != os.getpid():
+            with self._lock:
+                if self._worker_pid != os.getpid():
+                    self._worker_pid = os.getpid()
+                    threading.Thread(target=self._run, daemon=True, name='group-commit').start()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_rows:
+            try:
+                batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                results = self.flush([item for item, _ in batch])
+            except Exception as error:
+                for _, future in batch:
+                    future.set_exception(error)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
@@ -1,11 +1,27 @@
 import pytest
 import sys
 import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 from sqlalchemy.exc import SQLAlchemyError
 
 # Agregar el directorio raíz del proyecto al sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
-from app import app, db, User, Task
+
+# Base de datos de pruebas: TEST_DATABASE_URI, o TEST_DATABASE=postgres para levantar un
+# servidor PostgreSQL temporal con pgserver (pip install pgserver)
+if os.getenv("TEST_DATABASE") == "postgres" and not os.getenv("TEST_DATABASE_URI"):
+    import tempfile
+    import pgserver
+    postgres_server = pgserver.get_server(tempfile.mkdtemp(), cleanup_mode='delete')
+    os.environ["TEST_DATABASE_URI"] = postgres_server.get_uri().replace("postgresql://", "postgresql+psycopg2://", 1)
+if os.getenv("TEST_DATABASE_URI"):
+    os.environ["SQLALCHEMY_DATABASE_URI"] = os.environ["TEST_DATABASE_URI"]
+
+from app import app, db, User, Task, task_cache
 
 @pytest.fixture
 def client():
@@ -17,6 +33,10 @@ def client():
     with app.app_context():
         try:
             db.create_all()  # Crear tablas para las pruebas
+            task_cache.clear()  # Evitar páginas cacheadas de pruebas anteriores
+            # Usuarios 1 y 2 para las pruebas que crean tareas con user_id fijo (PostgreSQL exige la clave foránea)
+            db.session.add_all([User(username="fixture_user_1"), User(username="fixture_user_2")])
+            db.session.commit()
             yield app.test_client()  # Proveer el cliente de pruebas
         except SQLAlchemyError as e:
             print(f"Error al configurar la base de datos: {e}")
@@ -24,3 +44,51 @@ def client():
             db.session.remove()
             db.drop_all()  # Limpiar las tablas después de las pruebas
 
+
+# Inicia sesión en el cliente de pruebas como el usuario `user_id` (from conftest import login)
+def login(client, user_id=1):
+    with client.session_transaction() as session:
+        session['user_id'] = user_id
+
+
+# Servidor Weatherstack falso en un puerto local para probar el cliente sin salir a internet
+class FakeWeatherstack:
+    def __init__(self):
+        self.calls = 0
+        self.delay = 0
+        self.payload = None
+
+    def response_for(self, city):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.payload is not None:
+            return self.payload
+        return {
+            'location': {'name': city},
+            'current': {'temperature': 21, 'weather_descriptions': ['Sunny'], 'weather_icons': ['icon.png']},
+        }
+
+@pytest.fixture
+def fake_weatherstack():
+    fake = FakeWeatherstack()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            city = parse_qs(urlparse(self.path).query).get('query', [''])[0]
+            body = json.dumps(fake.response_for(city)).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    fake.url = f"http://127.0.0.1:{server.server_port}/current"
+    yield fake
+    server.shutdown()
+    server.server_close()
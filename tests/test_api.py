@@ -0,0 +1,98 @@
+import sys
+import os
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import app, db, Task
+from conftest import login
+
+def test_api_requires_login(client):
+    assert client.post('/api/v1/tasks/batch', json={'operations': []}).status_code == 401
+    assert client.post('/api/v1/tasks', json={'task': "Task"}).status_code == 401
+
+def test_batch_create_update_delete(client):
+    login(client)
+    other = Task(user_id=2, task="Other user task", priority=1)
+    existing = Task(user_id=1, task="Existing", priority=3)
+    db.session.add_all([other, existing])
+    db.session.commit()
+
+    response = client.post('/api/v1/tasks/batch', json={'operations': [
+        {'op': 'create', 'task': "Imported 1", 'priority': 1},
+        {'op': 'create', 'task': "Imported 2"},
+        {'op': 'create', 'task': "", 'priority': 1},
+        {'op': 'update', 'id': existing.id, 'priority': 2},
+        {'op': 'delete', 'id': other.id},
+        {'op': 'archive', 'id': existing.id},
+    ]})
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [result['status'] for result in results] == ['created', 'created', 'invalid', 'updated', 'not_found', 'invalid']
+
+    db.session.expire_all()
+    assert db.session.get(Task, results[0]['id']).task == "Imported 1"
+    assert db.session.get(Task, results[1]['id']).priority == 3
+    assert db.session.get(Task, existing.id).priority == 2
+    assert db.session.get(Task, other.id) is not None  # No se borran tareas de otro usuario
+
+    response = client.post('/api/v1/tasks/batch', json={'operations': [{'op': 'delete', 'id': existing.id}]})
+    assert response.get_json()['results'][0]['status'] == 'deleted'
+    assert db.session.get(Task, existing.id) is None
+
+def test_batch_invalidates_task_cache(client):
+    login(client)
+    client.get('/api/v1/tasks')  # Cachear la primera página
+    client.post('/api/v1/tasks/batch', json={'operations': [{'op': 'create', 'task': "Bulk Task", 'priority': 1}]})
+    tasks = client.get('/api/v1/tasks').get_json()['tasks']
+    assert [task['task'] for task in tasks] == ["Bulk Task"]
+
+def test_batch_limits(client):
+    login(client)
+    assert client.post('/api/v1/tasks/batch', json={'operations': []}).status_code == 400
+    assert client.post('/api/v1/tasks/batch', data="not json").status_code == 400
+
+    max_batch = app.config['API_MAX_BATCH']
+    app.config['API_MAX_BATCH'] = 2
+    try:
+        operations = [{'op': 'create', 'task': "Task"}] * 3
+        assert client.post('/api/v1/tasks/batch', json={'operations': operations}).status_code == 400
+    finally:
+        app.config['API_MAX_BATCH'] = max_batch
+
+def test_single_task_endpoints(client):
+    login(client)
+    response = client.post('/api/v1/tasks', json={'task': "Single", 'priority': 2})
+    assert response.status_code == 201
+    task_id = response.get_json()['id']
+
+    assert client.patch(f'/api/v1/tasks/{task_id}', json={'task': "Renamed"}).status_code == 200
+    assert client.patch(f'/api/v1/tasks/{task_id}', json={'priority': 7}).status_code == 400
+    assert client.delete(f'/api/v1/tasks/{task_id}').status_code == 200
+    assert client.delete(f'/api/v1/tasks/{task_id}').status_code == 404
+
+# Nueva prueba: Ids fuera del rango de 64 bits: operación no válida en el lote y 404 en las rutas de una tarea
+# de la API
+def test_out_of_range_task_ids(client):
+    login(client)
+    response = client.post('/api/v1/tasks/batch', json={'operations': [
+        {'op': 'update', 'id': 2 ** 70, 'priority': 1}, {'op': 'delete', 'id': -2 ** 63 - 1}]})
+    assert response.status_code == 200
+    assert [result['status'] for result in response.get_json()['results']] == ['invalid', 'invalid']
+    assert client.patch('/api/v1/tasks/99999999999999999999', json={'task': "Renamed"}).status_code == 404
+    assert client.delete('/api/v1/tasks/99999999999999999999').status_code == 404
+    assert client.patch(f'/api/v1/tasks/{2 ** 63 - 1}', json={'task': "Renamed"}).status_code == 404
+    # Las rutas del formulario redirigen a la lista, como con cualquier tarea que no existe
+    assert client.get('/delete_task/99999999999999999999').status_code == 302
+    assert client.post('/edit_task/99999999999999999999', data={'task': "Renamed", 'priority': "1"}).status_code == 302
+
+# Nueva prueba: Orden y filtros en la API de consulta
+def test_list_tasks_sort_and_filter(client):
+    login(client)
+    for name, priority in (("Alpha", 3), ("Beta", 1), ("alphabet", 2)):
+        assert client.post('/api/v1/tasks', json={'task': name, 'priority': priority}).status_code == 201
+
+    response = client.get('/api/v1/tasks?sort=-created&q=alp')
+    assert [task['task'] for task in response.get_json()['tasks']] == ["alphabet", "Alpha"]
+    response = client.get('/api/v1/tasks?priority=1&priority=2')
+    assert [task['task'] for task in response.get_json()['tasks']] == ["Beta", "alphabet"]
+    assert client.get('/api/v1/tasks?sort=name').status_code == 400
@@ -0,0 +1,137 @@
+import sys
+import os
+import gzip
+import re
+from app import app
+from assets import MANIFEST, build_assets, compressors, load_assets, minify_css, precompile_templates
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+
+def stylesheet_url(client, page):
+    html = client.get(page).get_data(as_text=True)
+    return re.search(r'<link rel="stylesheet" href="([^"]+)"', html).group(1)
+
+
+# Nueva prueba: El minificado de CSS no cambia el significado de los selectores
+def test_minify_css():
+    source = "/* lista */\nul  li :hover ,\na:focus {\n  color : red ;\n  margin: 0 auto;\n}\n"
+    assert minify_css(source) == "ul li :hover,a:focus{color :red;margin:0 auto}"
+
+
+# Nueva prueba: Las páginas enlazan la hoja de estilos con el hash de su contenido
+def test_pages_link_fingerprinted_assets(client):
+    html = client.get('/login').get_data(as_text=True)
+    assert re.search(r'href="/static/styles/login\.[0-9a-f]{12}\.css"', html)
+    assert re.search(r'src="/static/google-icon\.[0-9a-f]{12}\.png"', html)
+
+
+# Nueva prueba: Los recursos con hash se sirven precomprimidos, con caché inmutable y ETag
+def test_fingerprinted_asset_encodings(client):
+    url = stylesheet_url(client, '/login')
+    with open(os.path.join(app.config['STATIC_BUILD_DIR'], url[len('/static/'):]), 'rb') as file:
+        built = file.read()
+
+    plain = client.get(url, headers={'Accept-Encoding': 'identity'})
+    assert plain.status_code == 200
+    assert plain.data == built
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert plain.headers['Vary'] == 'Accept-Encoding'
+    assert plain.mimetype == 'text/css'
+
+    gzipped = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(gzipped.data) == built
+    assert len(gzipped.data) < len(built)
+
+    # brotli es opcional: sin el paquete solo hay versión gzip
+    compressed = client.get(url, headers={'Accept-Encoding': 'gzip, deflate, br'})
+    if 'br' in compressors():
+        import brotli
+        assert compressed.headers['Content-Encoding'] == 'br'
+        assert brotli.decompress(compressed.data) == built
+        assert len(compressed.data) < len(gzipped.data)
+
+    # Cada codificación tiene su ETag; con If-None-Match la respuesta es un 304 vacío
+    assert plain.headers['ETag'] != gzipped.headers['ETag']
+    revalidated = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzipped.headers['ETag']})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+
+
+# Nueva prueba: Las URL sin hash siguen funcionando, pero con revalidación en lugar de caché inmutable
+def test_unfingerprinted_asset_fallback(client):
+    response = client.get('/static/styles/tasks.css')
+    assert response.status_code == 200
+    assert 'immutable' not in response.headers.get('Cache-Control', '')
+    assert response.headers['ETag']
+    assert client.get('/static/styles/missing.css').status_code == 404
+    assert client.get('/static/styles/tasks.000000000000.css').status_code == 404
+
+
+# Nueva prueba: Cambiar un archivo cambia su URL; los que no cambian conservan la suya
+def test_build_assets_fingerprints_content(tmp_path):
+    source = tmp_path / "static"
+    (source / "styles").mkdir(parents=True)
+    (source / "styles" / "a.css").write_text("body { color: red; }" * 20)
+    (source / "icon.png").write_bytes(b"\x89PNG" + bytes(500))
+    first = build_assets(str(source), str(tmp_path / "build"))
+    assert first['styles/a.css']['encodings'] == list(compressors())
+    assert first['icon.png']['encodings'] == []
+    assert (tmp_path / "build" / (first['styles/a.css']['path'] + '.gz')).exists()
+
+    (source / "styles" / "a.css").write_text("body { color: blue; }" * 20)
+    second = build_assets(str(source), str(tmp_path / "build"))
+    assert second['styles/a.css']['path'] != first['styles/a.css']['path']
+    assert second['icon.png'] == first['icon.png']
+    # Los archivos de la construcción anterior se borran
+    assert not (tmp_path / "build" / first['styles/a.css']['path']).exists()
+    assert not (tmp_path / "build" / (first['styles/a.css']['path'] + '.gz')).exists()
+    assert (tmp_path / "build" / second['icon.png']['path']).exists()
+
+
+# Nueva prueba: Al arrancar se usa el manifiesto existente y solo se construye si static/ cambió después
+def test_load_assets_builds_only_when_sources_change(tmp_path):
+    source = tmp_path / "static"
+    source.mkdir()
+    (source / "a.css").write_text("body { color: red; }")
+    build = tmp_path / "build"
+    first = load_assets(str(source), str(build))
+    built_at = os.path.getmtime(build / MANIFEST)
+    os.utime(source / "a.css", (built_at - 10, built_at - 10))
+    os.utime(source, (built_at - 10, built_at - 10))
+    assert load_assets(str(source), str(build)) == first
+    assert os.path.getmtime(build / MANIFEST) == built_at
+
+    (source / "b.css").write_text("p { margin: 0; }")
+    os.utime(source / "b.css", (built_at + 10, built_at + 10))
+    assert sorted(load_assets(str(source), str(build))) == ['a.css', 'b.css']
+
+
+# Nueva prueba: Las plantillas quedan compiladas al arrancar y su bytecode en TEMPLATE_CACHE_DIR
+def test_templates_precompiled():
+    names = app.jinja_env.list_templates()
+    assert 'tasks.html' in names
+    cached = {key[1] for key in app.jinja_env.cache.keys()}
+    assert set(names) <= cached
+    assert len(os.listdir(app.config['TEMPLATE_CACHE_DIR'])) >= len(names)
+
+
+# Nueva prueba: El bytecode de una plantilla que ya no existe se borra; `flask assets build` reconstruye todo
+def test_stale_template_bytecode_is_removed(tmp_path):
+    directory = tmp_path / "templates"
+    directory.mkdir()
+    (directory / "__jinja2_0123456789abcdef.cache").write_bytes(b"old")
+    cache_dir = app.config['TEMPLATE_CACHE_DIR']
+    app.config['TEMPLATE_CACHE_DIR'] = str(directory)
+    try:
+        result = app.test_cli_runner().invoke(args=['assets', 'build'])
+    finally:
+        app.config['TEMPLATE_CACHE_DIR'] = cache_dir
+        precompile_templates(app)
+    assert result.exit_code == 0, result.output
+    assert 'static files built' in result.output and 'templates compiled' in result.output
+    assert len(os.listdir(directory)) == len(app.jinja_env.list_templates())
+    assert "__jinja2_0123456789abcdef.cache" not in os.listdir(directory)
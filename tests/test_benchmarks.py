@@ -0,0 +1,46 @@
+import sys
+import os
+import pytest
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from benchmarks.suite.report import compare, percentile, summarize
+
+
+def result(p95, throughput, errors=0):
+    return {'scenarios': {'read_list': {'p50_ms': 10, 'p95_ms': p95, 'p99_ms': 40,
+                                        'throughput_rps': throughput, 'errors': errors}}}
+
+
+# Nueva prueba: Percentiles con interpolación lineal
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == pytest.approx(50.5)
+    assert percentile(values, 0.99) == pytest.approx(99.01)
+    assert percentile([], 0.95) == 0.0
+
+
+# Nueva prueba: Resumen por escenario y por tipo de petición
+def test_summarize():
+    samples = [('GET /tasks', 0.010, True, 200), ('GET /tasks', 0.030, True, 200), ('POST /login', 0.200, False, 503)]
+    summary = summarize(samples, elapsed=2.0)
+    assert summary['requests'] == 3
+    assert summary['throughput_rps'] == 1.5
+    assert summary['errors'] == 1
+    assert summary['by_request']['GET /tasks']['p50_ms'] == pytest.approx(20)
+    assert summary['by_request']['POST /login']['errors'] == {'503': 1}
+
+
+# Nueva prueba: Se marca como regresión una latencia mayor o un throughput menor que la tolerancia
+def test_compare_detects_regressions():
+    _, regressions = compare(result(20, 100), result(21, 95), tolerance=0.10)
+    assert regressions == []
+
+    _, regressions = compare(result(20, 100), result(25, 100), tolerance=0.10)
+    assert len(regressions) == 1 and 'p95_ms' in regressions[0]
+
+    _, regressions = compare(result(20, 100), result(20, 80), tolerance=0.10)
+    assert len(regressions) == 1 and 'throughput_rps' in regressions[0]
+
+    _, regressions = compare(result(20, 100), result(20, 100, errors=3))
+    assert regressions == ["read_list errors: 0 -> 3"]
@@ -0,0 +1,60 @@
+import sys
+import os
+import time
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from cache import LRUTaskCache, NullTaskCache, TaskListCache
+
+def test_lru_get_set_invalidate():
+    cache = LRUTaskCache(max_users=10, ttl=30)
+    cache.set(1, "first:50", {'tasks': [], 'next_cursor': None})
+    assert cache.get(1, "first:50") == {'tasks': [], 'next_cursor': None}
+    assert cache.get(1, "other") is None
+
+    cache.invalidate(1)
+    assert cache.get(1, "first:50") is None
+
+def test_lru_evicts_least_recently_used_user():
+    cache = LRUTaskCache(max_users=2, ttl=30)
+    cache.set(1, "page", "a")
+    cache.set(2, "page", "b")
+    cache.get(1, "page")  # El usuario 1 pasa a ser el más reciente
+    cache.set(3, "page", "c")
+
+    assert cache.get(1, "page") == "a"
+    assert cache.get(2, "page") is None
+    assert cache.get(3, "page") == "c"
+
+def test_lru_limits_pages_per_user():
+    cache = LRUTaskCache(max_users=2, ttl=30, max_pages=2)
+    for page in ("p1", "p2", "p3"):
+        cache.set(1, page, page)
+    assert cache.get(1, "p1") is None
+    assert cache.get(1, "p3") == "p3"
+
+def test_lru_ttl_expiration():
+    cache = LRUTaskCache(max_users=2, ttl=0.01)
+    cache.set(1, "page", "a")
+    time.sleep(0.02)
+    assert cache.get(1, "page") is None
+
+def test_read_through_counters():
+    cache = TaskListCache(LRUTaskCache())
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return "rows"
+
+    assert cache.get_or_load(1, "page", loader) == "rows"
+    assert cache.get_or_load(1, "page", loader) == "rows"
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+    # Con el backend nulo siempre se consulta la base de datos
+    cache = TaskListCache(NullTaskCache())
+    cache.get_or_load(1, "page", loader)
+    cache.get_or_load(1, "page", loader)
+    assert len(calls) == 3
@@ -0,0 +1,122 @@
+import sys
+import os
+import json
+import pytest
+from app import app, db, Task, task_events
+from events import TaskEventHub, MemoryEventBackend, NullEventBackend, RESET
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+
+@pytest.fixture
+def events(client):
+    # Canal de cambios en memoria solo durante la prueba, con flujos cortos
+    task_events.configure(MemoryEventBackend(), buffer_size=10)
+    app.config.update(EVENTS_STREAM_SECONDS=0.2, EVENTS_HEARTBEAT=0.1)
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+    yield task_events
+    task_events.configure(NullEventBackend())
+    app.config.update(EVENTS_STREAM_SECONDS=300, EVENTS_HEARTBEAT=15)
+
+
+def read_events(client, last_event_id=0):
+    body = client.get(f'/tasks/events?last_event_id={last_event_id}').get_data(as_text=True)
+    return [json.loads(line[len('data: '):]) for line in body.splitlines() if line.startswith('data: ')]
+
+
+# Nueva prueba: Los cambios se numeran por usuario y llegan solo a sus suscriptores
+def test_hub_fans_out_per_user():
+    hub = TaskEventHub(MemoryEventBackend())
+    first, second, other = hub.subscribe(1), hub.subscribe(1), hub.subscribe(2)
+    hub.publish(1, [{'type': 'deleted', 'task': {'id': 5}}])
+
+    assert first.get(timeout=0) == [(1, {'type': 'deleted', 'task': {'id': 5}})]
+    assert second.get(timeout=0) == [(1, {'type': 'deleted', 'task': {'id': 5}})]
+    assert other.get(timeout=0) is None
+    assert hub.sequence(1) == 1 and hub.sequence(2) == 0
+
+
+# Nueva prueba: Al reconectarse se reenvían los cambios perdidos, o "reset" si ya no están en el historial
+def test_hub_replays_missed_changes():
+    hub = TaskEventHub(MemoryEventBackend(), buffer_size=3)
+    hub.publish(1, [{'type': 'deleted', 'task': {'id': task_id}} for task_id in range(1, 6)])
+
+    assert [event[0] for event in hub.subscribe(1, last_event_id=3).get(timeout=0)] == [4, 5]
+    assert hub.subscribe(1, last_event_id=1).get(timeout=0) == RESET
+    assert hub.subscribe(1, last_event_id=5).get(timeout=0) is None
+
+
+# Nueva prueba: Un cliente lento recibe "reset" en lugar de acumular cambios sin límite
+def test_slow_subscriber_gets_reset():
+    hub = TaskEventHub(MemoryEventBackend(), max_pending=2)
+    subscription = hub.subscribe(1)
+    for task_id in range(3):
+        hub.publish(1, [{'type': 'deleted', 'task': {'id': task_id}}])
+    assert subscription.get(timeout=0) == RESET
+
+
+# Nueva prueba: Formato SSE con id, evento y datos; los repetidos se descartan
+def test_stream_format():
+    hub = TaskEventHub(MemoryEventBackend())
+    stream = hub.stream(1, last_event_id=0, heartbeat=0.01, max_seconds=0.05)
+    assert next(stream) == "retry: 2000\n\n"
+    hub.publish(1, [{'type': 'deleted', 'task': {'id': 7}}])
+    assert next(stream) == 'id: 1\nevent: task\ndata: {"type": "deleted", "task": {"id": 7}}\n\n'
+    assert next(stream) == ": keep-alive\n\n"
+    stream.close()
+    assert not hub._subscribers
+
+
+# Nueva prueba: Altas, ediciones y borrados por formulario publican la fila afectada
+def test_form_changes_are_published(client, events):
+    client.post('/tasks', data={'task': "Streamed", 'priority': 2})
+    with app.app_context():
+        task_id = Task.query.filter_by(task="Streamed").one().id
+    client.post(f'/edit_task/{task_id}', data={'task': "Streamed edit", 'priority': 1})
+    client.get(f'/delete_task/{task_id}')
+
+    assert read_events(client) == [
+        {'type': 'inserted', 'task': {'id': task_id, 'task': "Streamed", 'priority': 2, 'due_at': None}},
+        {'type': 'updated', 'task': {'id': task_id, 'task': "Streamed edit", 'priority': 1, 'due_at': None}},
+        {'type': 'deleted', 'task': {'id': task_id}},
+    ]
+
+
+# Nueva prueba: Los lotes de la API publican filas completas, también en las modificaciones parciales
+def test_batch_changes_are_published(client, events):
+    with app.app_context():
+        task = Task(user_id=1, task="Existing", priority=3)
+        db.session.add(task)
+        db.session.commit()
+        existing_id = task.id
+    last_event_id = events.sequence(1)
+
+    response = client.post('/api/v1/tasks/batch', json={'operations': [
+        {'op': 'create', 'task': "Batch", 'priority': 1},
+        {'op': 'update', 'id': existing_id, 'priority': 2},
+        {'op': 'delete', 'id': 999999},
+    ]})
+    created_id = response.get_json()['results'][0]['id']
+
+    assert read_events(client, last_event_id) == [
+        {'type': 'inserted', 'task': {'id': created_id, 'task': "Batch", 'priority': 1, 'due_at': None}},
+        {'type': 'updated', 'task': {'id': existing_id, 'task': "Existing", 'priority': 2, 'due_at': None}},
+    ]
+
+
+# Nueva prueba: Los cambios de otro usuario no aparecen en el canal
+def test_other_users_changes_are_not_streamed(client, events):
+    with app.app_context():
+        db.session.add(Task(user_id=2, task="Someone else", priority=1))
+        db.session.commit()
+    assert read_events(client) == []
+
+
+# Nueva prueba: La página incluye el canal solo si está activo
+def test_tasks_page_links_event_stream(client, events):
+    assert b'data-events-url="/tasks/events"' in client.get('/tasks').data
+    task_events.configure(NullEventBackend())
+    assert b'data-events-url' not in client.get('/tasks').data
+    assert client.get('/tasks/events').status_code == 404
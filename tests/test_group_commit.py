@@ -0,0 +1,106 @@
+import sys
+import os
+import threading
+import pytest
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import create_app, db, Task, User, task_cache
+from conftest import login
+from storage import GroupCommitter
+
+def submit_all(committer, items):
+    results, errors = {}, {}
+
+    def submit(item):
+        try:
+            results[item] = committer.submit(item)
+        except Exception as error:
+            errors[item] = error
+
+    threads = [threading.Thread(target=submit, args=(item,)) for item in items]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+# Nueva prueba: Las escrituras concurrentes se agrupan y cada una recibe su resultado
+def test_group_committer_coalesces_writes():
+    batches = []
+    release = threading.Event()
+
+    def flush(items):
+        # El primer lote se retiene para que el resto se acumule en la cola
+        if not batches:
+            release.wait(5)
+        batches.append(items)
+        return [item * 10 for item in items]
+
+    committer = GroupCommitter(flush, max_rows=50, max_delay=0.001)
+    threading.Timer(0.2, release.set).start()
+    results, errors = submit_all(committer, range(40))
+    assert errors == {}
+    assert results == {item: item * 10 for item in range(40)}
+    assert len(batches) < 40
+    assert max(len(batch) for batch in batches) <= 50
+
+# Nueva prueba: Si el lote falla, todas sus peticiones reciben el error
+def test_group_committer_propagates_errors():
+    def flush(items):
+        raise RuntimeError("database is locked")
+
+    results, errors = submit_all(GroupCommitter(flush), range(5))
+    assert results == {}
+    assert all(isinstance(error, RuntimeError) for error in errors.values()) and len(errors) == 5
+
+@pytest.fixture
+def group_commit_app(tmp_path):
+    backend = task_cache.backend
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'group_commit.db'}",
+        'TASK_GROUP_COMMIT': True,
+        'TASK_CACHE_BACKEND': 'memory',
+    })
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([User(username="writer_1"), User(username="writer_2")])
+        db.session.commit()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+    task_cache.backend = backend
+
+# Nueva prueba: Altas concurrentes por formulario y API con group commit; cada usuario ve su tarea
+# en la página a la que se le redirige, aunque su lista estuviera en caché
+def test_group_commit_read_your_writes(group_commit_app):
+    def writer(number, user_id, statuses):
+        client = group_commit_app.test_client()
+        login(client, user_id)
+        client.get('/tasks')  # Deja la primera página en caché
+        if number % 2:
+            response = client.post('/tasks', data={'task': f"Form task {number}", 'priority': '2'})
+            statuses.append(response.status_code)
+            page = client.get(response.headers['Location'])
+            statuses.append(f"Form task {number}" in page.text)
+        else:
+            response = client.post('/api/v1/tasks', json={'task': f"API task {number}", 'priority': 1})
+            statuses.append(response.status_code)
+            page = client.get('/tasks')
+            statuses.append(f"API task {number}" in page.text)
+
+    statuses = []
+    threads = [threading.Thread(target=writer, args=(number, number % 2 + 1, statuses)) for number in range(30)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(status for status in statuses if not isinstance(status, bool)) == [201] * 15 + [302] * 15
+    assert all(status for status in statuses if isinstance(status, bool))
+    with group_commit_app.app_context():
+        assert db.session.scalar(db.select(db.func.count()).select_from(Task)) == 30
+    client = group_commit_app.test_client()
+    login(client)
+    assert client.post('/api/v1/tasks', json={'task': ""}).status_code == 400
@@ -0,0 +1,146 @@
+import sys
+import os
+import gzip
+from sqlalchemy import insert
+from app import app, db, Task, TaskListVersion, task_cache, task_list_version
+from conftest import login
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+
+def version(user_id=1):
+    with app.app_context():
+        return task_list_version(user_id)
+
+
+# Bytes en la red de una respuesta: línea de estado, cabeceras y cuerpo tal como se envían
+def wire_bytes(response):
+    headers = sum(len(f"{name}: {value}\r\n") for name, value in response.headers.items())
+    return len(f"HTTP/1.1 {response.status}\r\n") + headers + 2 + len(response.data)
+
+
+# Nueva prueba: La versión de la lista sube una vez por transacción que cambia tareas del usuario
+def test_task_list_version_bumps(client):
+    login(client)
+    assert version() == 0
+    client.post('/tasks', data={'task': "Versioned", 'priority': '2'})
+    assert version() == 1
+    with app.app_context():
+        task_id = Task.query.filter_by(task="Versioned").one().id
+    client.post(f'/edit_task/{task_id}', data={'task': "Versioned (edited)", 'priority': '1'})
+    assert version() == 2
+    client.get(f'/delete_task/{task_id}')
+    assert version() == 3
+    client.post('/api/v1/tasks/batch', json={'operations': [
+        {'op': 'create', 'task': "A", 'priority': 1},
+        {'op': 'create', 'task': "B", 'priority': 2},
+    ]})
+    assert version() == 4
+    # Una operación que no cambia nada (tarea inexistente) no sube la versión; las de otro usuario tampoco
+    client.delete('/api/v1/tasks/999999')
+    login(client, user_id=2)
+    client.post('/api/v1/tasks', json={'task': "Other user", 'priority': 1})
+    assert version() == 4
+    assert version(2) == 1
+
+
+# Nueva prueba: Con el ETag de la versión actual /tasks responde 304 sin consultar la página
+def test_tasks_page_not_modified(client):
+    login(client)
+    client.post('/api/v1/tasks', json={'task': "Cached page", 'priority': 1})
+    first = client.get('/tasks')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    assert 'Cookie' in first.headers['Vary']
+
+    stats = task_cache.stats()
+    revalidated = client.get('/tasks', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+    assert revalidated.headers['ETag'] == etag
+    assert task_cache.stats()['hits'] == stats['hits'] and task_cache.stats()['misses'] == stats['misses']
+
+    # Otra vista u otra página tiene su propio ETag
+    assert client.get('/tasks?sort=-created', headers={'If-None-Match': etag}).status_code == 200
+
+    client.post('/api/v1/tasks', json={'task': "Invalidates the ETag", 'priority': 2})
+    changed = client.get('/tasks', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert "Invalidates the ETag" in changed.get_data(as_text=True)
+
+
+# Nueva prueba: La API de listado usa el mismo mecanismo
+def test_api_list_not_modified(client):
+    login(client)
+    response = client.get('/api/v1/tasks')
+    assert client.get('/api/v1/tasks', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+    client.post('/api/v1/tasks', json={'task': "New", 'priority': 1})
+    assert client.get('/api/v1/tasks', headers={'If-None-Match': response.headers['ETag']}).status_code == 200
+
+
+# Nueva prueba: Bytes en la red al cargar varias veces una lista de 10k tareas: la primera carga va
+# comprimida y las siguientes, mientras la lista no cambia, son un 304 sin cuerpo
+def test_repeated_loads_of_10k_tasks_bytes_on_the_wire(client):
+    with app.app_context():
+        db.session.execute(insert(Task), [
+            {'user_id': 1, 'task': f"Bulk task number {i}", 'priority': 1 + i % 3} for i in range(10000)])
+        db.session.commit()
+    login(client)
+
+    plain = client.get('/tasks?limit=all', headers={'Accept-Encoding': 'identity'})
+    html = plain.get_data()
+    assert html.count(b'<li id="task-') == 10000
+
+    compressed = client.get('/tasks?limit=all', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == html
+    etag = compressed.headers['ETag']
+    assert etag.endswith('-gzip"')
+
+    repeats = [client.get('/tasks?limit=all', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+               for _ in range(5)]
+    assert all(response.status_code == 304 for response in repeats)
+
+    first_load = wire_bytes(compressed)
+    repeat_loads = sum(wire_bytes(response) for response in repeats)
+    assert first_load * 10 < wire_bytes(plain)
+    # Cinco recargas cuestan menos que el 1 % de la primera carga sin comprimir
+    assert repeat_loads * 100 < wire_bytes(plain)
+
+
+# Nueva prueba: Solo se comprimen las respuestas por encima del umbral y si el cliente lo acepta
+def test_response_compression_threshold(client):
+    login(client)
+    small = client.get('/api/v1/tasks', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+
+    client.post('/api/v1/tasks/batch', json={'operations': [
+        {'op': 'create', 'task': f"Task {i}", 'priority': 1} for i in range(50)]})
+    large = client.get('/api/v1/tasks', headers={'Accept-Encoding': 'gzip'})
+    assert large.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in large.headers['Vary']
+    plain = client.get('/api/v1/tasks', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in plain.headers
+    assert gzip.decompress(large.data) == plain.data
+    assert large.headers['ETag'] != plain.headers['ETag']
+
+
+# Nueva prueba: Las páginas que se vuelven a mostrar con un error de formulario también van por versión: un
+# cambio confirmado en otro worker (que solo limpia su propia caché en memoria) se ve enseguida
+def test_form_error_pages_use_the_list_version(client):
+    login(client)
+    client.post('/api/v1/tasks', json={'task': "Before", 'priority': 1})
+    assert "Before" in client.post('/tasks', data={'task': "", 'priority': '1'}).get_data(as_text=True)
+
+    # Cambio de otro worker: la fila y la versión se escriben sin pasar por la sesión ni la invalidación
+    with db.engine.begin() as connection:
+        connection.execute(insert(Task), {'user_id': 1, 'task': "From another worker", 'priority': 2})
+        connection.execute(db.update(TaskListVersion).where(TaskListVersion.user_id == 1)
+                           .values(version=TaskListVersion.version + 1))
+    html = client.post('/tasks', data={'task': "", 'priority': '1'}).get_data(as_text=True)
+    assert "Invalid input." in html and "From another worker" in html
+    task_id = client.get('/api/v1/tasks').get_json()['tasks'][0]['id']
+    assert "From another worker" in client.post(f'/edit_task/{task_id}', data={'task': "", 'priority': '1'}).get_data(as_text=True)
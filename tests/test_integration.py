@@ -1,6 +1,7 @@
 import pytest
 import os
-from app import app, db, User, Task
+from app import app, db, User, Task, task_cache
+from conftest import login
 from werkzeug.security import generate_password_hash
 from unittest.mock import patch
 from flask import redirect
@@ -14,6 +15,10 @@ def client():
     with app.app_context():
         try:
             db.create_all()
+            task_cache.clear()
+            # Usuarios 1 y 2 para las pruebas que crean tareas con user_id fijo (PostgreSQL exige la clave foránea)
+            db.session.add_all([User(username="fixture_user_1"), User(username="fixture_user_2")])
+            db.session.commit()
             yield app.test_client()
         finally:
             db.session.remove()
@@ -38,8 +43,7 @@ def test_database_operations(client):
     assert tasks[0].task == "Test Task"
 
 def test_session_management(client):
-    with client.session_transaction() as session:
-        session['user_id'] = 1
+    login(client)
 
     # Simular acceso a una ruta protegida
     response = client.get('/tasks')
@@ -68,8 +72,7 @@ def test_user_authentication_flow(client):
 
 def test_task_management_workflow(client):
     # Simular un usuario logueado
-    with client.session_transaction() as session:
-        session['user_id'] = 1
+    login(client)
 
     # Crear una nueva tarea
     response = client.post('/tasks', data={
@@ -136,3 +139,51 @@ def test_google_authorize(mock_get, mock_authorize, client):
 def test_server_running(client):
     response = client.get('/login')
     assert response.status_code == 200
+
+def test_tasks_pagination(client):
+    login(client)
+    db.session.add_all([Task(user_id=1, task=f"Paged Task {i}", priority=2) for i in range(3)])
+    db.session.commit()
+
+    response = client.get('/tasks?limit=2')
+    assert response.status_code == 200
+    assert b"next-page-link" in response.data
+
+    response = client.get('/api/v1/tasks?limit=2')
+    data = response.get_json()
+    assert len(data['tasks']) == 2
+    assert data['next_cursor'] is not None
+
+    response = client.get(f"/api/v1/tasks?limit=2&after={data['next_cursor']}")
+    data = response.get_json()
+    assert [task['task'] for task in data['tasks']] == ["Paged Task 2"]
+    assert data['next_cursor'] is None
+
+    assert client.get('/api/v1/tasks?after=bad').status_code == 400
+    # Claves y ids fuera de rango: 400 en la API y primera página en /tasks, como cualquier cursor no válido
+    for cursor in ('99999999999999999999999-1', '1-99999999999999999999999'):
+        assert client.get(f'/api/v1/tasks?sort=created&after={cursor}').get_json() == {'error': 'Invalid cursor.'}
+        assert client.get(f'/tasks?sort=created&after={cursor}').status_code == 200
+
+def test_task_cache_invalidation(client):
+    login(client)
+
+    before = task_cache.stats()
+    client.get('/tasks')
+    client.get('/tasks')
+    stats = task_cache.stats()
+    assert stats['misses'] == before['misses'] + 1
+    assert stats['hits'] == before['hits'] + 1
+
+    # Añadir una tarea invalida la página cacheada del usuario
+    client.post('/tasks', data={'task': 'Cached Task', 'priority': 1})
+    response = client.get('/tasks')
+    assert b"Cached Task" in response.data
+    assert task_cache.stats()['invalidations'] > stats['invalidations']
+
+    response = client.get('/api/v1/cache/stats')
+    assert response.get_json()['backend'] == 'LRUTaskCache'
+
+    # Sin sesión los contadores no se ven
+    client.get('/logout')
+    assert client.get('/api/v1/cache/stats').status_code == 401
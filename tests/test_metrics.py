@@ -0,0 +1,85 @@
+import sys
+import os
+import pytest
+from app import create_app, db, task_cache, User, Task
+from metrics import Counter, Histogram
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+
+@pytest.fixture
+def metrics_app(tmp_path, fake_weatherstack):
+    # Aplicación propia con métricas activas y perfilado de todas las peticiones
+    # (create_app cambia el backend de la caché global; se restaura al final)
+    cache_backend = task_cache.backend
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'METRICS_ENABLED': True,
+        'PROFILE_SAMPLE_RATE': 1,
+        'PROFILE_SLOW_MS': 0,
+        'PROFILE_DIR': str(tmp_path / "profiles"),
+        'WEATHERSTACK_URL': fake_weatherstack.url,
+        'TASK_CACHE_BACKEND': 'none',
+    })
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(username="metrics_user"))
+        db.session.add(Task(user_id=1, task="Measured", priority=1))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    task_cache.backend = cache_backend
+
+
+# Nueva prueba: Formato de texto de Prometheus para contadores e histogramas
+def test_prometheus_exposition():
+    counter = Counter('demo_requests', 'Demo.', ('status',))
+    counter.inc(200)
+    counter.inc(200)
+    histogram = Histogram('demo_seconds', 'Demo.', ('route',), buckets=(0.1, 1))
+    histogram.observe(0.5, 'a"b')
+
+    lines = list(counter.samples()) + list(histogram.samples())
+    assert 'demo_requests_total{status="200"} 2' in lines
+    assert 'demo_seconds_bucket{route="a\\"b",le="0.1"} 0' in lines
+    assert 'demo_seconds_bucket{route="a\\"b",le="1"} 1' in lines
+    assert 'demo_seconds_bucket{route="a\\"b",le="+Inf"} 1' in lines
+    assert 'demo_seconds_count{route="a\\"b"} 1' in lines
+
+
+# Nueva prueba: Latencia por ruta, consultas SQL y render de plantillas en /metrics
+def test_request_metrics(metrics_app):
+    client = metrics_app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+    assert client.get('/tasks').status_code == 200
+
+    metrics = metrics_app.extensions['metrics']
+    assert metrics.request_latency.count('todo.tasks', 'GET') == 1
+    assert metrics.requests.value('todo.tasks', 'GET', 200) == 1
+    assert metrics.sql_queries.total('todo.tasks') >= 2  # Usuario y página de tareas
+    assert metrics.template_latency.count('tasks.html') == 1
+
+    body = client.get('/metrics').data.decode()
+    assert '# TYPE todo_http_request_duration_seconds histogram' in body
+    assert 'todo_http_request_duration_seconds_count{endpoint="todo.tasks",method="GET"} 1' in body
+    assert 'todo_template_render_seconds_count{template="tasks.html"} 1' in body
+
+
+# Nueva prueba: Tiempo de las llamadas salientes a Weatherstack
+def test_outbound_http_metrics(metrics_app):
+    response = metrics_app.test_client().get('/weatherstack?city=Zapopan')
+    assert response.status_code == 200
+    assert metrics_app.extensions['metrics'].outbound_latency.count('weatherstack', 200) == 1
+
+
+# Nueva prueba: Las peticiones muestreadas más lentas que el umbral guardan su perfil
+def test_slow_request_profile(metrics_app, tmp_path):
+    metrics_app.test_client().get('/login')
+    profiles = os.listdir(tmp_path / "profiles")
+    assert len(profiles) == 1
+    assert profiles[0].endswith('.prof') and 'todo.login' in profiles[0]
+    assert metrics_app.extensions['metrics'].profiles.value('todo.login') == 1
@@ -0,0 +1,72 @@
+import sys
+import os
+import subprocess
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine
+
+# Agregar el directorio raíz del proyecto al sys.path
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+sys.path.insert(0, ROOT)
+from app import db, parse_cursor, task_page
+from search import include_search_objects
+
+# Las migraciones versionadas deben producir el mismo esquema que los modelos (SQLite no puede
+# reflejar el índice sobre lower(task), así que ese índice no se compara; la tabla FTS no está en los modelos)
+@pytest.mark.filterwarnings('ignore:.*expression-based index')
+def test_migrations_match_models(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'migrated.db'}"
+    env = dict(os.environ, SQLALCHEMY_DATABASE_URI=uri)
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'db', 'upgrade'],
+                   cwd=ROOT, env=env, check=True, capture_output=True)
+
+    engine = create_engine(uri)
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn, opts={'include_name': include_search_objects})
+        assert compare_metadata(context, db.metadata) == []
+    engine.dispose()
+
+# Nueva prueba: Las tareas anteriores a created_at reciben una fecha comparable con los cursores
+def test_created_at_backfill_paginates(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'migrated.db'}"
+    env = dict(os.environ, SQLALCHEMY_DATABASE_URI=uri)
+    flask_db = [sys.executable, '-m', 'flask', '--app', 'app', 'db']
+    subprocess.run(flask_db + ['upgrade', '8a41d2c7b9e3'], cwd=ROOT, env=env, check=True, capture_output=True)
+    engine = create_engine(uri)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO user (id, username) VALUES (1, 'old_user')")
+        conn.exec_driver_sql("INSERT INTO task (user_id, task, priority) VALUES (1, 'a', 1), (1, 'b', 2), (1, 'c', 3)")
+    engine.dispose()
+    subprocess.run(flask_db + ['upgrade'], cwd=ROOT, env=env, check=True, capture_output=True)
+
+    from app import create_app
+    from app import task_cache
+    backend = task_cache.backend
+    try:
+        with create_app({'SQLALCHEMY_DATABASE_URI': uri}).app_context():
+            view = {'sort': 'created', 'priorities': (), 'prefix': ''}
+            first, cursor = task_page(1, limit=2, view=view)
+            second, cursor = task_page(1, parse_cursor(cursor), limit=2, view=view)
+            assert [task.task for task in first + second] == ['a', 'b', 'c']
+            assert cursor is None
+            db.engine.dispose()
+    finally:
+        task_cache.backend = backend
+
+# Nueva prueba: La migración de búsqueda indexa las tareas existentes
+def test_search_index_backfill(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'migrated.db'}"
+    env = dict(os.environ, SQLALCHEMY_DATABASE_URI=uri)
+    flask_db = [sys.executable, '-m', 'flask', '--app', 'app', 'db']
+    subprocess.run(flask_db + ['upgrade', '3f7b9c1d2e4a'], cwd=ROOT, env=env, check=True, capture_output=True)
+    engine = create_engine(uri)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO user (id, username) VALUES (1, 'old_user')")
+        conn.exec_driver_sql("INSERT INTO task (user_id, task, priority, created_at) "
+                             "VALUES (1, 'Buy milk', 1, '2026-01-01 00:00:00.000000')")
+    subprocess.run(flask_db + ['upgrade'], cwd=ROOT, env=env, check=True, capture_output=True)
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT rowid FROM task_fts WHERE task_fts MATCH 'milk'").all() == [(1,)]
+    subprocess.run(flask_db + ['downgrade', '3f7b9c1d2e4a'], cwd=ROOT, env=env, check=True, capture_output=True)
+    engine.dispose()
@@ -0,0 +1,132 @@
+import sys
+import os
+import time
+import pytest
+import requests
+from app import app, google, User
+from oidc import ProviderMetadataCache, cache_lifetime
+from benchmarks.suite.stubs import StubGoogle
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+CLIENT_ID = "test-client"
+
+
+@pytest.fixture
+def stub_google():
+    stub = StubGoogle(CLIENT_ID, max_age=600).start()
+    yield stub
+    stub.stop()
+
+
+# Aplicación de pruebas apuntando al proveedor falso, con la caché de metadatos en tmp_path
+@pytest.fixture
+def stub_login(client, stub_google, monkeypatch, tmp_path):
+    cache = ProviderMetadataCache(stub_google.discovery_url, path=str(tmp_path / "oauth_metadata.json"),
+                                  jwks_refetch_interval=0)
+    monkeypatch.setitem(app.extensions, 'oidc_metadata', cache)
+    monkeypatch.setattr(google, 'client_id', CLIENT_ID)
+    monkeypatch.setattr(google, 'client_secret', "test-secret")
+    return cache
+
+
+def google_login(client):
+    authorize = client.get('/google_login')
+    assert authorize.status_code == 302
+    callback = requests.get(authorize.headers['Location'], allow_redirects=False, timeout=5)
+    return client.get(callback.headers['Location'].replace('http://localhost', ''))
+
+
+# Nueva prueba: Duración según Cache-Control y Age, acotada, y por defecto sin cabecera
+def test_cache_lifetime():
+    assert cache_lifetime({'Cache-Control': 'public, max-age=3600'}, 100, 60, 86400) == 3600
+    assert cache_lifetime({'Cache-Control': 'public, max-age=3600', 'Age': '600'}, 100, 60, 86400) == 3000
+    assert cache_lifetime({'Cache-Control': 'max-age=999999'}, 100, 60, 86400) == 86400
+    assert cache_lifetime({'Cache-Control': 'no-store'}, 100, 60, 86400) == 60
+    assert cache_lifetime({}, 100, 60, 86400) == 100
+
+
+# Nueva prueba: Un worker nuevo con el archivo compartido ya lleno no pide nada al proveedor
+def test_metadata_shared_between_workers(stub_google, tmp_path):
+    path = str(tmp_path / "oauth_metadata.json")
+    first = ProviderMetadataCache(stub_google.discovery_url, path=path)
+    first.warm_up()
+    assert stub_google.requests == {'/.well-known/openid-configuration': 1, '/jwks': 1}
+
+    second = ProviderMetadataCache(stub_google.discovery_url, path=path)
+    second.warm_up()
+    assert second.metadata()['issuer'] == stub_google.url
+    assert second.jwks()['keys'][0]['kid'] == 'bench'
+    assert second.upstream_calls == 0
+    assert stub_google.requests == {'/.well-known/openid-configuration': 1, '/jwks': 1}
+
+
+# Nueva prueba: Si la escritura del archivo compartido falla no queda ningún temporal en el directorio
+def test_metadata_file_write_failure_removes_temporary(tmp_path, monkeypatch):
+    cache = ProviderMetadataCache("http://provider.invalid/.well-known/openid-configuration",
+                                  path=str(tmp_path / "oauth_metadata.json"))
+    entry = {'url': cache.discovery_url, 'fetched_at': 0, 'expires_at': 0, 'document': {}}
+
+    def failing_replace(source, destination):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, 'replace', failing_replace)
+    cache._write_file('metadata', entry)
+    assert os.listdir(tmp_path) == []
+
+    monkeypatch.undo()
+    with pytest.raises(TypeError):
+        cache._write_file('metadata', dict(entry, document=object()))
+    assert os.listdir(tmp_path) == []
+
+
+# Nueva prueba: Caducado, se responde el documento viejo y se refresca en segundo plano; si el proveedor
+# no responde se sigue usando
+def test_metadata_background_refresh(stub_google):
+    cache = ProviderMetadataCache(stub_google.discovery_url)
+    cache.warm_up()
+    cache._entries['metadata']['expires_at'] = time.time() - 1
+
+    assert cache.metadata()['issuer'] == stub_google.url
+    cache._refresher.submit(lambda: None).result()
+    assert stub_google.requests['/.well-known/openid-configuration'] == 2
+    assert cache._entries['metadata']['expires_at'] > time.time() + 500
+
+    stub_google.stop()
+    cache._entries['jwks']['expires_at'] = time.time() - 1
+    assert cache.jwks()['keys'][0]['kid'] == 'bench'
+    cache._refresher.submit(lambda: None).result()
+    assert cache.jwks()['keys'][0]['kid'] == 'bench'
+
+
+# Nueva prueba: Forzar el JWKS (clave desconocida) respeta el intervalo mínimo entre descargas
+def test_jwks_refetch_is_rate_limited(stub_google):
+    cache = ProviderMetadataCache(stub_google.discovery_url, jwks_refetch_interval=60)
+    cache.warm_up()
+    stub_google.rotate_key()
+    for _ in range(5):
+        cache.jwks(force=True)
+    assert stub_google.requests['/jwks'] == 1
+
+    cache._entries['jwks']['fetched_at'] -= 60
+    assert cache.jwks(force=True)['keys'][0]['kid'] == stub_google.kid
+    assert stub_google.requests['/jwks'] == 2
+
+
+# Nueva prueba: Login con Google contra el proveedor falso: metadatos y claves se descargan una vez y una
+# rotación de claves solo vuelve a pedir el JWKS
+def test_google_login_against_stub_provider(client, stub_google, stub_login):
+    response = google_login(client)
+    assert response.status_code == 302 and response.headers['Location'].endswith('/tasks')
+    with app.app_context():
+        assert User.query.filter_by(google_id='bench-google-0').one().username == 'bench-google-0@example.com'
+
+    client.get('/logout')
+    assert google_login(client).status_code == 302
+    assert stub_google.requests == {'/.well-known/openid-configuration': 1, '/authorize': 2, '/jwks': 1}
+
+    stub_google.rotate_key()
+    client.get('/logout')
+    assert google_login(client).status_code == 302
+    assert stub_google.requests['/jwks'] == 2
+    assert stub_google.requests['/.well-known/openid-configuration'] == 1
@@ -0,0 +1,48 @@
+import sys
+import os
+import pytest
+from werkzeug.datastructures import MultiDict
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import db, parse_task_view, pending_reminders_query, task_page_queries
+
+# Vistas de /tasks: (parámetros de la URL, cursor de la página siguiente)
+VIEWS = [
+    ({}, (2, 5)),
+    ({'priority': ['1', '2']}, (2, 5)),
+    ({'q': 'buy'}, (2, 5)),
+    ({'priority': ['1'], 'q': 'buy'}, (1, 5)),
+    ({'sort': 'created'}, (1767225600000000, 5)),
+    ({'sort': '-created'}, (1767225600000000, 5)),
+    ({'sort': '-created', 'priority': ['2']}, (1767225600000000, 5)),
+    ({'sort': 'created', 'q': 'buy'}, (1767225600000000, 5)),
+]
+
+def query_plan(query):
+    sql = query.limit(51).compile(db.engine, compile_kwargs={'literal_binds': True})
+    if db.engine.dialect.name == 'postgresql':
+        # Con tablas casi vacías PostgreSQL prefiere recorrerlas: se desactiva para ver si el índice sirve
+        db.session.execute(db.text("SET LOCAL enable_seqscan = off"))
+        return "\n".join(row[0] for row in db.session.execute(db.text(f"EXPLAIN {sql}")))
+    return "\n".join(row[3] for row in db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")))
+
+# Nueva prueba: Cada consulta de la lista (primera página y siguientes) busca en un índice compuesto
+# que empieza por user_id en lugar de recorrer la tabla o un índice entero
+@pytest.mark.parametrize('args, cursor', VIEWS)
+def test_task_queries_use_indexes(client, args, cursor):
+    view = parse_task_view(MultiDict(args))
+    for after in (None, cursor):
+        for query in task_page_queries(1, after, view):
+            plan = query_plan(query)
+            assert 'ix_task_user_' in plan, plan
+            assert 'SCAN' not in plan and 'Seq Scan' not in plan, plan
+    db.session.rollback()
+
+# Nueva prueba: El planificador lee los próximos recordatorios del índice parcial, ya en orden y sin
+# pasar por las tareas sin fecha o ya avisadas
+def test_pending_reminders_use_partial_index(client):
+    plan = query_plan(pending_reminders_query(1000))
+    assert 'ix_task_due_pending' in plan, plan
+    assert 'TEMP B-TREE' not in plan and 'Sort' not in plan and 'Seq Scan' not in plan, plan
+    db.session.rollback()
@@ -0,0 +1,175 @@
+import sys
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import app, create_app, db, Task, User, claim_reminders, load_pending_reminders, task_cache, utcnow
+from conftest import login
+from reminders import FileNotifier, ReminderScheduler
+
+
+# Notificador de pruebas: guarda los recordatorios y avisa cuando llegan `expected`
+class CollectingNotifier:
+    def __init__(self, expected):
+        self.expected = expected
+        self.reminders = []
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def __call__(self, reminder):
+        with self.lock:
+            self.reminders.append(reminder)
+            if len(self.reminders) >= self.expected:
+                self.done.set()
+
+
+def scheduler_for(application, notifier, **options):
+    return ReminderScheduler(lambda limit: load_pending_reminders(application, limit),
+                             lambda task_ids, now: claim_reminders(application, task_ids, now),
+                             notifier, **options)
+
+
+def add_tasks(due_dates, user_id=1):
+    with app.app_context():
+        db.session.execute(insert(Task), [
+            {'user_id': user_id, 'task': f"Task {index}", 'priority': 1, 'due_at': due_at}
+            for index, due_at in enumerate(due_dates)])
+        db.session.commit()
+
+
+# Nueva prueba: Fecha límite en la API (con zona horaria se guarda en UTC), en la lista y en el formulario
+def test_due_at_in_api_and_form(client):
+    login(client)
+    created = client.post('/api/v1/tasks', json={'task': "Dentist", 'priority': 1, 'due_at': "2026-10-20T09:30:00+02:00"})
+    assert created.status_code == 201
+    task_id = created.get_json()['id']
+    assert client.get('/api/v1/tasks').get_json()['tasks'][0]['due_at'] == "2026-10-20T07:30:00"
+
+    invalid = client.post('/api/v1/tasks', json={'task': "Bad", 'priority': 1, 'due_at': "tomorrow"})
+    assert invalid.status_code == 400 and 'due_at' in invalid.get_json()['error']
+
+    assert client.patch(f'/api/v1/tasks/{task_id}', json={'due_at': None}).status_code == 200
+    assert client.get('/api/v1/tasks').get_json()['tasks'][0]['due_at'] is None
+
+    client.post('/tasks', data={'task': "Passport", 'priority': '2', 'due_at': "2026-11-01T12:00"})
+    html = client.get('/tasks').get_data(as_text=True)
+    assert "Due: 2026-11-01 12:00 UTC" in html
+    assert 'value="2026-11-01T12:00"' in html
+
+
+# Nueva prueba: Cambiar la fecha límite vuelve a dejar pendiente el recordatorio; otros cambios no
+def test_changing_due_at_rearms_reminder(client):
+    login(client)
+    past = utcnow() - timedelta(minutes=1)
+    task_id = client.post('/api/v1/tasks', json={'task': "Call", 'priority': 1, 'due_at': past.isoformat()}).get_json()['id']
+    assert [row['id'] for row in claim_reminders(app, [task_id], utcnow())] == [task_id]
+    assert claim_reminders(app, [task_id], utcnow()) == []
+
+    client.patch(f'/api/v1/tasks/{task_id}', json={'priority': 2})
+    with app.app_context():
+        assert db.session.get(Task, task_id).reminded_at is not None
+
+    client.post(f'/edit_task/{task_id}', data={'task': "Call", 'priority': '2', 'due_at': "2030-01-01T08:00"})
+    with app.app_context():
+        task = db.session.get(Task, task_id)
+        assert task.due_at == datetime(2030, 1, 1, 8, 0) and task.reminded_at is None
+
+
+# Nueva prueba: Se avisan las tareas vencidas y las que vencen mientras corre, una vez y en orden;
+# las futuras y las que no tienen fecha no
+def test_scheduler_sends_due_reminders(client):
+    now = utcnow()
+    add_tasks([now - timedelta(hours=1), now + timedelta(seconds=0.5), now - timedelta(minutes=1),
+               now + timedelta(days=1), None])
+    notifier = CollectingNotifier(expected=3)
+    scheduler = scheduler_for(app, notifier, capacity=10, poll_interval=60, workers=1).start()
+    try:
+        assert notifier.done.wait(5)
+        time.sleep(0.2)
+    finally:
+        scheduler.stop()
+    assert [reminder['task'] for reminder in notifier.reminders] == ["Task 0", "Task 2", "Task 1"]
+    assert scheduler.stats['loads'] == 1 and scheduler.stats['sent'] == 3
+    with app.app_context():
+        assert [task_id for _, task_id in load_pending_reminders(app, 10)] == [4]
+
+
+# Nueva prueba: Con el montículo lleno, al vaciarse se leen las siguientes sin esperar al intervalo
+def test_scheduler_drains_backlog_in_heap_sized_rounds(client):
+    add_tasks([utcnow() - timedelta(seconds=index) for index in range(25)])
+    notifier = CollectingNotifier(expected=25)
+    scheduler = scheduler_for(app, notifier, capacity=10, poll_interval=60, workers=2, max_pending=4).start()
+    try:
+        assert notifier.done.wait(5)
+    finally:
+        scheduler.stop()
+    assert len({reminder['id'] for reminder in notifier.reminders}) == 25
+    assert scheduler.stats['loads'] >= 3
+
+
+# Nueva prueba: Una tarea con fecha creada en el proceso entra en el montículo sin esperar a la lectura
+def test_scheduler_picks_up_new_tasks_without_polling(client, monkeypatch):
+    login(client)
+    notifier = CollectingNotifier(expected=1)
+    scheduler = scheduler_for(app, notifier, poll_interval=3600).start()
+    monkeypatch.setitem(app.extensions, 'reminders', scheduler)
+    try:
+        due_at = utcnow() + timedelta(seconds=0.3)
+        client.post('/api/v1/tasks', json={'task': "Soon", 'priority': 1, 'due_at': due_at.isoformat()})
+        assert notifier.done.wait(5)
+    finally:
+        scheduler.stop()
+    assert notifier.reminders[0]['task'] == "Soon"
+    assert scheduler.stats['loads'] == 1
+
+
+# Nueva prueba: Dos procesos (dos aplicaciones con su propio pool sobre la misma base de datos) con su
+# planificador: cada recordatorio se envía una sola vez
+def test_two_processes_send_each_reminder_once(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'reminders.db'}"
+    backend = task_cache.backend
+    try:
+        apps = [create_app({'SQLALCHEMY_DATABASE_URI': uri}) for _ in range(2)]
+        with apps[0].app_context():
+            db.create_all()
+            db.session.add(User(username="owner"))
+            db.session.flush()
+            now = utcnow()
+            db.session.execute(insert(Task), [
+                {'user_id': 1, 'task': f"Task {index}", 'priority': 1, 'due_at': now - timedelta(seconds=index % 7)}
+                for index in range(300)])
+            db.session.commit()
+
+        notifier = CollectingNotifier(expected=300)
+        schedulers = [scheduler_for(application, notifier, capacity=50, poll_interval=60) for application in apps]
+        for scheduler in schedulers:
+            scheduler.start()
+        try:
+            assert notifier.done.wait(10)
+            time.sleep(0.2)
+        finally:
+            for scheduler in schedulers:
+                scheduler.stop()
+        ids = [reminder['id'] for reminder in notifier.reminders]
+        assert len(ids) == len(set(ids)) == 300
+        for application in apps:
+            with application.app_context():
+                db.engine.dispose()
+    finally:
+        task_cache.backend = backend
+
+
+# Nueva prueba: El notificador de archivo escribe una línea JSON por recordatorio
+def test_file_notifier(tmp_path):
+    path = tmp_path / 'reminders' / 'reminders.jsonl'
+    notify = FileNotifier(str(path))
+    notify({'id': 1, 'user_id': 2, 'task': "Dentist", 'due_at': datetime(2026, 10, 20, 7, 30)})
+    notify({'id': 3, 'user_id': 2, 'task': "Passport", 'due_at': datetime(2026, 11, 1, 12, 0)})
+    assert path.read_text().splitlines() == [
+        '{"id": 1, "user_id": 2, "task": "Dentist", "due_at": "2026-10-20T07:30:00"}',
+        '{"id": 3, "user_id": 2, "task": "Passport", "due_at": "2026-11-01T12:00:00"}',
+    ]
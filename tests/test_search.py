@@ -0,0 +1,91 @@
+import sys
+import os
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import db, Task
+from conftest import login
+from search import fts5_query, parse_search_cursor, parse_search_query, tsquery
+
+def search(client, query, **params):
+    response = client.get('/api/v1/tasks/search', query_string=dict(params, q=query))
+    assert response.status_code == 200
+    return response.get_json()
+
+def texts(result):
+    return [task['task'] for task in result['tasks']]
+
+# Nueva prueba: Palabras, frases y prefijos; los operadores del usuario no llegan a FTS5
+def test_parse_search_query():
+    assert parse_search_query('buy "whole milk" gro*') == [(('buy',), False), (('whole', 'milk'), False), (('gro',), True)]
+    assert parse_search_query('"lista de comp"*') == [(('lista', 'de', 'comp'), True)]
+    assert parse_search_query('NEAR(a b) OR c:') == [(('NEAR', 'a'), False), (('b',), False), (('OR',), False), (('c',), False)]
+    assert parse_search_query('" * "') == []
+    terms = parse_search_query('buy "whole milk" gro*')
+    assert fts5_query(terms) == '"buy" "whole milk" "gro"*'
+    assert tsquery(terms) == "buy & whole <-> milk & gro:*"
+    assert parse_search_cursor("-1.5:12") == (-1.5, 12)
+    assert parse_search_cursor("nan:12") is None
+    assert parse_search_cursor("12") is None
+    assert parse_search_cursor(f"1:{2 ** 63}") is None and parse_search_cursor("1:-1") is None
+
+# Nueva prueba: Búsqueda por usuario con frases, prefijos y orden por relevancia
+def test_search_tasks(client):
+    db.session.add_all([
+        Task(user_id=1, task="Buy milk", priority=1),
+        Task(user_id=1, task="Milk the cow, then buy more milk", priority=2),
+        Task(user_id=1, task="Call the bank", priority=3),
+        Task(user_id=1, task="Groceries: milk, bread", priority=3),
+        Task(user_id=2, task="Buy milk", priority=1),
+    ])
+    db.session.commit()
+    login(client)
+
+    assert sorted(texts(search(client, 'milk'))) == ["Buy milk", "Groceries: milk, bread", "Milk the cow, then buy more milk"]
+    assert texts(search(client, '"buy milk"')) == ["Buy milk"]
+    assert texts(search(client, 'groc*')) == ["Groceries: milk, bread"]
+    assert texts(search(client, 'bank call')) == ["Call the bank"]
+    assert search(client, 'dentist')['tasks'] == []
+    # La tarea que repite "milk" y es la más corta de las que tienen "buy" va primero
+    assert texts(search(client, 'buy milk'))[0] == "Buy milk"
+
+    assert client.get('/api/v1/tasks/search?q=%22%22').status_code == 400
+    assert client.get('/api/v1/tasks/search?q=milk&after=bad').status_code == 400
+    response = client.get('/api/v1/tasks/search?q=milk&after=1:99999999999999999999999')
+    assert response.status_code == 400 and response.get_json() == {'error': "Invalid cursor."}
+
+# Nueva prueba: Los triggers mantienen el índice al editar y borrar, también con la API por lotes
+def test_search_index_follows_changes(client):
+    login(client)
+    task_id = client.post('/api/v1/tasks', json={'task': "Renew passport"}).get_json()['id']
+    assert texts(search(client, 'passport')) == ["Renew passport"]
+
+    client.patch(f'/api/v1/tasks/{task_id}', json={'task': "Renew licence"})
+    assert search(client, 'passport')['tasks'] == []
+    assert texts(search(client, 'licence')) == ["Renew licence"]
+
+    client.patch(f'/api/v1/tasks/{task_id}', json={'priority': 1})
+    assert search(client, 'licence')['tasks'][0]['priority'] == 1
+
+    client.delete(f'/api/v1/tasks/{task_id}')
+    assert search(client, 'licence')['tasks'] == []
+
+# Nueva prueba: Paginación por cursor sin repetir ni omitir resultados
+def test_search_pagination(client):
+    db.session.add_all([Task(user_id=1, task=f"Report {'draft ' * (i % 4)}{i}", priority=1) for i in range(11)])
+    db.session.commit()
+    login(client)
+
+    seen, after = [], None
+    while True:
+        page = search(client, 'report', limit=3, **({'after': after} if after else {}))
+        seen += [task['id'] for task in page['tasks']]
+        after = page['next_cursor']
+        if not after:
+            break
+    assert len(seen) == 11 and len(set(seen)) == 11
+
+    response = client.get('/tasks/search?q=report&limit=3')
+    assert response.status_code == 200
+    assert response.data.count(b'<li id="result-') == 3
+    assert b'id="next-page-link"' in response.data
@@ -0,0 +1,139 @@
+import sys
+import os
+import pytest
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+from app import app, db, User, Task
+from sessions import MemorySessionStore, SqliteSessionStore, ServerSideSessionInterface, CookieSessionInterface
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+
+@pytest.fixture
+def server_sessions(client):
+    # Sesiones en memoria del servidor solo durante la prueba
+    previous = app.session_interface
+    app.session_interface = ServerSideSessionInterface(MemorySessionStore())
+    yield app.session_interface
+    app.session_interface = previous
+
+
+def login(client, username="session_user"):
+    with app.app_context():
+        if not User.query.filter_by(username=username).first():
+            db.session.add(User(username=username, password=generate_password_hash("secure_password")))
+            db.session.commit()
+    return client.post('/login', data={'username': username, 'password': "secure_password"})
+
+
+def count_queries(function):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        function()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    return statements
+
+
+# Nueva prueba: El backend en memoria expira las sesiones y desaloja las más antiguas
+def test_memory_store_ttl_and_eviction():
+    store = MemorySessionStore(max_sessions=2)
+    store.save("a", "{}", 1, ttl=60)
+    store.save("b", "{}", 1, ttl=60)
+    store.save("c", "{}", 2, ttl=60)
+    assert store.get("a") is None
+    assert store.get("b") == "{}"
+
+    store.save("d", "{}", 3, ttl=0)
+    assert store.get("d") is None
+
+
+# Nueva prueba: Revocar todas las sesiones de un usuario en los backends memoria y SQLite
+@pytest.mark.parametrize("make_store", [
+    lambda tmp_path: MemorySessionStore(),
+    lambda tmp_path: SqliteSessionStore(str(tmp_path / "sessions.db")),
+])
+def test_store_delete_user(tmp_path, make_store):
+    store = make_store(tmp_path)
+    store.save("s1", '{"user_id": 1}', 1, ttl=60)
+    store.save("s2", '{"user_id": 1}', 1, ttl=60)
+    store.save("s3", '{"user_id": 2}', 2, ttl=60)
+
+    store.delete_user(1)
+    assert store.get("s1") is None
+    assert store.get("s2") is None
+    assert store.get("s3") == '{"user_id": 2}'
+
+
+# Nueva prueba: Las sesiones SQLite caducadas no se devuelven
+def test_sqlite_store_expired(tmp_path):
+    store = SqliteSessionStore(str(tmp_path / "sessions.db"))
+    store.save("old", "{}", 1, ttl=-1)
+    assert store.get("old") is None
+
+
+# Nueva prueba: Con sesiones en el servidor la cookie solo lleva el identificador
+def test_server_side_cookie_is_opaque(client, server_sessions):
+    response = login(client)
+    assert response.status_code == 302
+    cookie = client.get_cookie(app.config.get('SESSION_COOKIE_NAME', 'session'))
+    assert "user_id" not in cookie.value
+    assert server_sessions.store.get(cookie.value) is not None
+
+
+# Nueva prueba: El login regenera el identificador de sesión
+def test_login_regenerates_session_id(client, server_sessions):
+    with client.session_transaction() as sess:
+        sess['visited'] = True
+    before = client.get_cookie('session').value
+
+    login(client)
+    after = client.get_cookie('session').value
+    assert after != before
+    assert server_sessions.store.get(before) is None
+
+
+# Nueva prueba: El usuario cacheado en la sesión evita consultarlo en cada petición
+def test_cached_user_skips_user_query(client, server_sessions):
+    login(client)
+    with app.app_context():
+        statements = count_queries(lambda: client.get('/api/v1/tasks'))
+    assert not any("FROM user" in statement for statement in statements)
+
+
+# Nueva prueba: Con cookies firmadas se comprueba el usuario en la base de datos
+def test_cookie_session_checks_user(client):
+    assert isinstance(app.session_interface, CookieSessionInterface)
+    with client.session_transaction() as sess:
+        sess['user_id'] = 999
+    response = client.get('/api/v1/tasks')
+    assert response.status_code == 401
+
+
+# Nueva prueba: Editar y borrar sin sesión redirige al login
+def test_edit_and_delete_require_login(client):
+    with app.app_context():
+        task = Task(user_id=1, task="Protected", priority=1)
+        db.session.add(task)
+        db.session.commit()
+        task_id = task.id
+
+    assert client.post(f'/edit_task/{task_id}', data={'task': "x", 'priority': 2}).headers['Location'] == '/login'
+    assert client.get(f'/delete_task/{task_id}').headers['Location'] == '/login'
+    with app.app_context():
+        assert db.session.get(Task, task_id).task == "Protected"
+
+
+# Nueva prueba: logout?all=1 cierra las sesiones del usuario en todos los dispositivos
+def test_logout_all_revokes_every_session(client, server_sessions):
+    other = app.test_client()
+    login(client)
+    login(other)
+    assert other.get('/api/v1/tasks').status_code == 200
+
+    client.get('/logout?all=1')
+    assert other.get('/api/v1/tasks').status_code == 401
+    assert client.get('/api/v1/tasks').status_code == 401
@@ -0,0 +1,316 @@
+import sys
+import os
+import subprocess
+import threading
+from datetime import timedelta
+import pytest
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import create_app, db, Task, User, SHARDED_TABLES, claim_reminders, database_revision, load_pending_reminders, rebalance_task_shards, task_cache, utcnow
+from conftest import login
+from sqlalchemy import create_engine
+from reminders import ReminderScheduler
+from shards import HashRing, write_json
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+USERS = 30
+
+
+def make_app(tmp_path, shards, **config):
+    return create_app(dict({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'main.db'}",
+        'TASK_SHARDS': shards,
+        'TASK_SHARD_DIR': str(tmp_path / 'shards'),
+    }, **config))
+
+
+def dispose(app):
+    shards = app.extensions.get('task_shards')
+    with app.app_context():
+        for engine in (shards.engines.values() if shards else [db.engine]):
+            engine.dispose()
+
+
+# Aplicación con 3 shards y USERS usuarios en la base de datos principal
+@pytest.fixture
+def sharded_app(tmp_path):
+    backend = task_cache.backend
+    app = make_app(tmp_path, 3)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([User(username=f"user_{user_id}") for user_id in range(1, USERS + 1)])
+        db.session.commit()
+    yield app
+    dispose(app)
+    task_cache.backend = backend
+
+
+def add_tasks(app, count=2, **fields):
+    client = app.test_client()
+    for user_id in range(1, USERS + 1):
+        login(client, user_id)
+        for index in range(count):
+            assert client.post('/api/v1/tasks', json=dict({'task': f"Task {user_id}-{index}", 'priority': 1}, **fields)).status_code == 201
+    return client
+
+
+def task_counts(app):
+    shards = app.extensions['task_shards']
+    return {shard: rows[0][0] for shard, rows in shards.scatter(db.select(db.func.count(Task.id)), shards=shards.engines)}
+
+
+def listed_tasks(client, user_id):
+    login(client, user_id)
+    return sorted(task['task'] for task in client.get('/api/v1/tasks').get_json()['tasks'])
+
+
+# Nueva prueba: Al añadir un shard solo cambia de shard ~1/N de los usuarios, y todos van al nuevo
+def test_hash_ring_moves_only_users_of_the_new_shard():
+    before, after = HashRing(['0', '1', '2', '3']), HashRing(['0', '1', '2', '3', '4'])
+    moved = [user_id for user_id in range(10000) if before.shard_for(user_id) != after.shard_for(user_id)]
+    assert {after.shard_for(user_id) for user_id in moved} == {'4'}
+    assert 1500 < len(moved) < 2500
+    counts = [sum(1 for user_id in range(10000) if after.shard_for(user_id) == shard) for shard in '01234']
+    assert min(counts) > 1200 and max(counts) < 2800
+
+
+# Nueva prueba: Una escritura del mapa que falla no deja el temporal junto al archivo
+def test_write_json_failure_removes_temporary(tmp_path):
+    path = str(tmp_path / "shard_map.json")
+    with pytest.raises(TypeError):
+        write_json(path, {'shards': object()})
+    assert os.listdir(tmp_path) == []
+
+
+# Nueva prueba: Las tareas de cada usuario van a su shard y no a la base de datos principal; listar, buscar,
+# editar y borrar funcionan igual
+def test_requests_use_the_users_shard(sharded_app):
+    client = add_tasks(sharded_app)
+    shards = sharded_app.extensions['task_shards']
+    counts = task_counts(sharded_app)
+    assert counts['main'] == 0 and sum(counts.values()) == 2 * USERS
+    expected = {}
+    for user_id in range(1, USERS + 1):
+        shard = shards.shard_for(user_id)
+        expected[shard] = expected.get(shard, 0) + 2
+    assert {shard: count for shard, count in counts.items() if count} == expected
+
+    assert listed_tasks(client, 7) == ["Task 7-0", "Task 7-1"]
+    results = client.get('/api/v1/tasks/search?q=task').get_json()['tasks']
+    assert sorted(task['task'] for task in results) == ["Task 7-0", "Task 7-1"]
+    task_id = results[0]['id']
+    client.post(f'/edit_task/{task_id}', data={'task': "Edited", 'priority': '2'})
+    assert client.delete(f'/api/v1/tasks/{results[1]["id"]}').status_code == 200
+    assert listed_tasks(client, 7) == ["Edited"]
+
+
+# Nueva prueba: Con group commit hay un escritor por shard y cada tarea llega a su shard
+def test_group_commit_per_shard(tmp_path):
+    backend = task_cache.backend
+    app = make_app(tmp_path, 2, TASK_GROUP_COMMIT=True)
+    try:
+        with app.app_context():
+            db.create_all()
+            db.session.add_all([User(username=f"user_{user_id}") for user_id in range(1, USERS + 1)])
+            db.session.commit()
+        assert set(app.extensions['task_writers']) == {'main', '0', '1'}
+        client = add_tasks(app, count=1)
+        assert sum(task_counts(app).values()) == USERS
+        assert listed_tasks(client, 3) == ["Task 3-0"]
+    finally:
+        dispose(app)
+        task_cache.backend = backend
+
+
+# Nueva prueba: Subir TASK_SHARDS y rebalancear mueve solo a los usuarios del shard nuevo; sus tareas siguen
+# visibles (con ids nuevos) y el ETag de su lista cambia
+def test_rebalance_moves_users_to_new_shard(sharded_app, tmp_path):
+    client = add_tasks(sharded_app)
+    before = {user_id: sharded_app.extensions['task_shards'].shard_for(user_id) for user_id in range(1, USERS + 1)}
+    etags = {}
+    for user_id in range(1, USERS + 1):
+        login(client, user_id)
+        etags[user_id] = client.get('/api/v1/tasks').headers['ETag']
+
+    grown = make_app(tmp_path, 4)
+    try:
+        # Hasta rebalancear, el shard nuevo no está en el anillo: nada cambia de sitio
+        assert grown.extensions['task_shards'].map.shards == ['0', '1', '2']
+        moved = rebalance_task_shards(grown, grace=0)
+        after = {user_id: grown.extensions['task_shards'].shard_for(user_id) for user_id in range(1, USERS + 1)}
+        changed = [user_id for user_id in after if after[user_id] != before[user_id]]
+        assert moved == len(changed) > 0
+        assert {after[user_id] for user_id in changed} == {'3'}
+        assert task_counts(grown)['3'] == 2 * len(changed)
+
+        client = grown.test_client()
+        for user_id in range(1, USERS + 1):
+            assert listed_tasks(client, user_id) == [f"Task {user_id}-0", f"Task {user_id}-1"]
+            login(client, user_id)
+            response = client.get('/api/v1/tasks', headers={'If-None-Match': etags[user_id]})
+            assert response.status_code == (200 if user_id in changed else 304)
+        # Los demás workers ven el mapa nuevo sin reiniciarse
+        assert sharded_app.extensions['task_shards'].shard_for(changed[0]) == '3'
+    finally:
+        dispose(grown)
+
+
+# Nueva prueba: Al activar el reparto, las tareas de la base de datos principal se siguen viendo (usuarios
+# fijados a "main") hasta que el rebalanceo las lleva a su shard
+def test_enabling_shards_keeps_existing_tasks(tmp_path):
+    backend = task_cache.backend
+    plain = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'main.db'}"})
+    with plain.app_context():
+        db.create_all()
+        db.session.add_all([User(username=f"user_{user_id}") for user_id in range(1, USERS + 1)])
+        db.session.commit()
+    add_tasks(plain)
+    dispose(plain)
+
+    app = make_app(tmp_path, 3)
+    try:
+        assert task_counts(app)['main'] == 2 * USERS
+        client = app.test_client()
+        assert listed_tasks(client, 5) == ["Task 5-0", "Task 5-1"]
+        assert rebalance_task_shards(app, grace=0) == USERS
+        counts = task_counts(app)
+        assert counts['main'] == 0 and sum(counts.values()) == 2 * USERS
+        assert listed_tasks(client, 5) == ["Task 5-0", "Task 5-1"]
+        assert app.extensions['task_shards'].map.pinned == {}
+    finally:
+        dispose(app)
+        task_cache.backend = backend
+
+
+# Nueva prueba: Mientras se mueven sus tareas, el usuario recibe 503 con Retry-After; los demás no
+def test_moving_user_gets_503(sharded_app):
+    client = add_tasks(sharded_app, count=1)
+    shard_map = sharded_app.extensions['task_shards'].map
+    shard_map.moving[4] = (shard_map.placement(4), '0')
+    shard_map.save()
+    login(client, 4)
+    response = client.get('/api/v1/tasks')
+    assert response.status_code == 503 and response.headers['Retry-After'] == '5'
+    assert client.get('/tasks').status_code == 503
+    assert listed_tasks(client, 5) == ["Task 5-0"]
+
+
+# Nueva prueba: Un movimiento cortado después de apuntar el usuario al destino deja copias en el origen;
+# el siguiente rebalanceo las borra y cada tarea queda una sola vez
+def test_interrupted_move_is_cleaned_up(sharded_app, tmp_path, monkeypatch):
+    add_tasks(sharded_app)
+    grown = make_app(tmp_path, 4)
+    try:
+        import app as app_module
+        move = app_module.move_user_tasks
+
+        def crash_after_switch(app, user_id, source, target, switch):
+            def switch_and_crash():
+                switch()
+                raise RuntimeError("killed")
+            return move(app, user_id, source, target, switch_and_crash)
+
+        monkeypatch.setattr(app_module, 'move_user_tasks', crash_after_switch)
+        with pytest.raises(RuntimeError):
+            rebalance_task_shards(grown, grace=0)
+        shard_map = grown.extensions['task_shards'].map
+        assert len(shard_map.cleanup) == 1
+        assert sum(task_counts(grown).values()) == 2 * USERS + 2
+
+        monkeypatch.setattr(app_module, 'move_user_tasks', move)
+        rebalance_task_shards(grown, grace=0)
+        assert sum(task_counts(grown).values()) == 2 * USERS
+        assert shard_map.cleanup == {} and shard_map.moving == {} and shard_map.pinned == {}
+        client = grown.test_client()
+        for user_id in range(1, USERS + 1):
+            assert listed_tasks(client, user_id) == [f"Task {user_id}-0", f"Task {user_id}-1"]
+    finally:
+        dispose(grown)
+
+
+# Nueva prueba: El planificador de recordatorios lee de todos los shards y envía cada aviso una vez
+def test_reminders_across_shards(sharded_app):
+    add_tasks(sharded_app, count=1, due_at=(utcnow() - timedelta(minutes=1)).isoformat())
+    pending = load_pending_reminders(sharded_app, 100)
+    assert len(pending) == USERS and {shard for _, (shard, _) in pending} == {'0', '1', '2'}
+
+    sent, done = [], threading.Event()
+
+    def notify(reminder):
+        sent.append(reminder)
+        if len(sent) == USERS:
+            done.set()
+
+    scheduler = ReminderScheduler(lambda limit: load_pending_reminders(sharded_app, limit),
+                                  lambda keys, now: claim_reminders(sharded_app, keys, now),
+                                  notify, capacity=10, poll_interval=60).start()
+    try:
+        assert done.wait(5)
+    finally:
+        scheduler.stop()
+    assert sorted(reminder['user_id'] for reminder in sent) == list(range(1, USERS + 1))
+    assert load_pending_reminders(sharded_app, 100) == []
+
+
+# Nueva prueba: Consultas de administración sobre todos los shards desde el CLI
+def test_shards_cli(sharded_app):
+    add_tasks(sharded_app, count=1)
+    runner = sharded_app.test_cli_runner()
+    stats = runner.invoke(args=['shards', 'stats'])
+    assert stats.exit_code == 0 and 'ring: 0, 1, 2; pinned: 0' in stats.output
+    query = runner.invoke(args=['shards', 'query', 'SELECT count(*) FROM task'])
+    counts = dict(line.split('\t') for line in query.output.splitlines())
+    assert sorted(counts) == ['0', '1', '2'] and sum(map(int, counts.values())) == USERS
+
+
+# Nueva prueba: La importación escribe en el shard del usuario y la exportación lee de él
+def test_import_and_export_use_the_users_shard(sharded_app):
+    client = sharded_app.test_client()
+    login(client, 9)
+    response = client.post('/tasks/import', data="task,priority\nImported A,1\nImported B,2\n", content_type='text/csv')
+    assert '"imported": 2' in response.get_data(as_text=True)
+    shard = sharded_app.extensions['task_shards'].shard_for(9)
+    assert task_counts(sharded_app) == {name: 2 if name == shard else 0 for name in ['main', '0', '1', '2']}
+    lines = client.get('/tasks/export').get_data(as_text=True).splitlines()
+    assert [line.split(',')[1] for line in lines[1:]] == ["Imported A", "Imported B"]
+
+
+# Nueva prueba: Con la base de datos principal migrada, cada shard recorre las mismas migraciones hasta su
+# revisión (también al subirla después) y un shard sin versión no deja arrancar
+def test_shards_follow_main_database_migrations(tmp_path):
+    backend = task_cache.backend
+    env = dict(os.environ, SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'main.db'}")
+    flask_db = [sys.executable, '-m', 'flask', '--app', 'app', 'db']
+    subprocess.run(flask_db + ['upgrade', '6b2e8f4a9c13'], cwd=ROOT, env=env, check=True, capture_output=True)
+    try:
+        app = make_app(tmp_path, 2)
+        with app.app_context():
+            for engine in app.extensions['task_shards'].engines.values():
+                assert database_revision(engine) == '6b2e8f4a9c13'
+            assert 'due_at' not in {column['name'] for column in db.inspect(
+                app.extensions['task_shards'].engines['0']).get_columns('task')}
+        dispose(app)
+
+        subprocess.run(flask_db + ['upgrade'], cwd=ROOT, env=env, check=True, capture_output=True)
+        app = make_app(tmp_path, 2)
+        with app.app_context():
+            head = database_revision(db.engine)
+            assert [database_revision(engine) for engine in app.extensions['task_shards'].engines.values()] == [head] * 3
+        client = app.test_client()
+        with app.app_context():
+            db.session.add(User(username="user_1"))
+            db.session.commit()
+        login(client, 1)
+        assert client.post('/api/v1/tasks', json={'task': "Sharded", 'priority': 1, 'due_at': "2027-01-01T00:00"}).status_code == 201
+        assert listed_tasks(client, 1) == ["Sharded"]
+        dispose(app)
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'shards' / 'tasks-2.db'}")
+        db.metadata.create_all(engine, tables=SHARDED_TABLES)
+        engine.dispose()
+        with pytest.raises(RuntimeError, match="Shard 2 is at revision None"):
+            make_app(tmp_path, 3)
+    finally:
+        task_cache.backend = backend
@@ -0,0 +1,52 @@
+import sys
+import os
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from storage import apply_sqlite_profile, commit_with_retry, engine_options
+
+def test_wal_profile_pragmas(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    apply_sqlite_profile(engine, 'wal')
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == 'wal'
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    engine.dispose()
+
+def test_engine_options_skip_memory_databases():
+    assert engine_options('sqlite:///:memory:') == {}
+    assert engine_options('sqlite:///todo.db', pool_size=3)['pool_size'] == 3
+
+class FakeSession:
+    def __init__(self, failures, message="database is locked"):
+        self.failures = failures
+        self.message = message
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        if self.failures:
+            self.failures -= 1
+            raise OperationalError("COMMIT", {}, Exception(self.message))
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+def test_commit_retries_when_database_is_locked():
+    session = FakeSession(failures=2)
+    calls = []
+    assert commit_with_retry(session, lambda: calls.append(1) or "done", attempts=3, backoff=0) == "done"
+    assert len(calls) == 3  # work() se repite tras cada rollback
+    assert session.commits == 1
+    assert session.rollbacks == 2
+
+def test_commit_does_not_retry_other_errors():
+    session = FakeSession(failures=1, message="no such table: task")
+    with pytest.raises(OperationalError):
+        commit_with_retry(session, lambda: None, attempts=3, backoff=0)
+    assert session.rollbacks == 1
@@ -0,0 +1,74 @@
+import sys
+import os
+import json
+import subprocess
+from sqlalchemy import create_engine, insert
+from app import app, db, Task
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+
+# Presupuesto de memoria del render en streaming, medido en un proceso aparte sobre su línea base
+STREAM_RSS_BUDGET_MB = 64
+
+# Proceso hijo: renderiza /tasks?limit=all leyendo la respuesta bloque a bloque e informa del pico de RSS
+RENDER_SCRIPT = """
+import json, resource, sys
+sys.path.insert(0, sys.argv[2])
+from app import create_app
+app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + sys.argv[1], 'TASK_CACHE_BACKEND': 'none'})
+client = app.test_client()
+with client.session_transaction() as sess:
+    sess['user_id'] = 1
+client.get('/tasks')
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+response = client.get('/tasks?limit=all', buffered=False)
+size = rows = 0
+for chunk in response.response:
+    size += len(chunk)
+    rows += chunk.count(b'<li id="task-')
+response.close()
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'baseline_kb': baseline, 'peak_kb': peak, 'bytes': size, 'rows': rows}))
+"""
+
+
+# Nueva prueba: ?limit=all devuelve todas las tareas en orden con una respuesta en streaming
+def test_stream_all_tasks(client):
+    with app.app_context():
+        db.session.add_all(Task(user_id=1, task=f"Streamed {i}", priority=3 - i % 3) for i in range(120))
+        db.session.commit()
+        expected = [task.id for task in Task.query.filter_by(user_id=1).order_by(Task.priority, Task.id)]
+
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+    response = client.get('/tasks?limit=all')
+    assert response.status_code == 200
+    assert response.is_streamed
+    html = response.get_data(as_text=True)
+    positions = [html.index(f'id="task-{task_id}"') for task_id in expected]
+    assert positions == sorted(positions)
+    assert 'id="next-page-link"' not in html
+
+
+# Nueva prueba: Renderizar 500k tareas en streaming mantiene el pico de RSS dentro del presupuesto
+def test_stream_500k_tasks_memory_budget(tmp_path):
+    path = str(tmp_path / "large.db")
+    engine = create_engine(f"sqlite:///{path}")
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO user (id, username) VALUES (1, 'large_user')")
+        for start in range(0, 500000, 50000):
+            conn.execute(insert(Task), [
+                {'user_id': 1, 'task': f"Task {i}", 'priority': i % 3 + 1} for i in range(start, start + 50000)
+            ])
+    engine.dispose()
+
+    result = subprocess.run([sys.executable, '-c', RENDER_SCRIPT, path, ROOT], capture_output=True, text=True,
+                            env=dict(os.environ, FLASK_SECRET_KEY="test"), timeout=600)
+    assert result.returncode == 0, result.stderr
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    assert stats['rows'] == 500000
+    growth_mb = (stats['peak_kb'] - stats['baseline_kb']) / 1024
+    assert growth_mb < STREAM_RSS_BUDGET_MB, stats
@@ -4,7 +4,9 @@ from sqlalchemy.exc import SQLAlchemyError
 
 # Agregar el directorio raíz del proyecto al sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
-from app import Task, User, db
+from datetime import datetime, timedelta
+from werkzeug.datastructures import MultiDict
+from app import Task, User, db, parse_cursor, parse_task_view, task_page
 from werkzeug.security import generate_password_hash
 
 # Prueba existente: Crear una tarea
@@ -102,3 +104,79 @@ def test_task_user_relationship(client):
     except SQLAlchemyError as e:
         print(f"Error en la base de datos: {e}")
         assert False
+
+# Nueva prueba: Paginación por cursor de las tareas de un usuario
+def test_task_page_keyset(client):
+    db.session.add_all([Task(user_id=1, task=f"Task {i}", priority=i % 3 + 1) for i in range(7)])
+    other = Task(user_id=2, task="Other user task", priority=1)
+    db.session.add(other)
+    db.session.commit()
+
+    first, cursor = task_page(1, limit=5)
+    assert len(first) == 5
+    assert [task.priority for task in first] == sorted(task.priority for task in first)
+    assert cursor is not None
+
+    second, cursor = task_page(1, parse_cursor(cursor), limit=5)
+    assert len(second) == 2
+    assert cursor is None
+    assert {task.id for task in first}.isdisjoint(task.id for task in second)
+    assert other.id not in {task.id for task in first + second} and len(first + second) == 7
+
+# Nueva prueba: Las páginas se leen como filas de solo lectura, sin pasar por el identity map
+def test_task_page_rows_are_untracked(client):
+    db.session.add_all([Task(user_id=1, task=f"Task {i}", priority=1) for i in range(3)])
+    db.session.commit()
+    db.session.expunge_all()
+
+    tasks, _ = task_page(1, limit=5)
+    assert [task.task for task in tasks] == ["Task 0", "Task 1", "Task 2"]
+    assert not isinstance(tasks[0], Task)
+    assert len(db.session.identity_map) == 0
+
+# Nueva prueba: Cursores inválidos
+def test_parse_cursor():
+    assert parse_cursor("2-15") == (2, 15)
+    assert parse_cursor("abc") is None
+    assert parse_cursor(None) is None
+
+# Nueva prueba: Orden por fecha de creación y filtros por prioridad y prefijo, paginando por cursor
+def test_task_page_sort_and_filter(client):
+    start = datetime(2026, 1, 1)
+    db.session.add_all([
+        Task(user_id=1, task=f"{'Buy' if i % 2 else 'Call'} item {i}", priority=i % 3 + 1,
+             created_at=start + timedelta(minutes=i // 2))  # Fechas repetidas: el id desempata
+        for i in range(9)
+    ])
+    db.session.add(Task(user_id=2, task="Buy other", priority=1, created_at=start))
+    db.session.commit()
+
+    def all_pages(args, limit=2):
+        view = parse_task_view(MultiDict(args))
+        tasks, cursor = task_page(1, limit=limit, view=view)
+        while cursor:
+            page, cursor = task_page(1, parse_cursor(cursor), limit=limit, view=view)
+            tasks += page
+        return tasks
+
+    newest = all_pages({'sort': '-created'})
+    assert [(task.created_at, task.id) for task in newest] == sorted(
+        ((task.created_at, task.id) for task in newest), reverse=True)
+    assert len(newest) == 9
+    oldest = all_pages({'sort': 'created'})
+    assert [task.id for task in oldest] == [task.id for task in reversed(newest)]
+
+    high_or_low = all_pages({'priority': ['1', '3']})
+    assert {task.priority for task in high_or_low} == {1, 3} and len(high_or_low) == 6
+    buys = all_pages({'q': 'bUY', 'sort': 'created'})
+    assert [task.task for task in buys] == [f"Buy item {i}" for i in (1, 3, 5, 7)]
+    assert all_pages({'q': 'Buy item 1%'}) == []
+
+# Nueva prueba: Parámetros de orden y filtro no válidos
+def test_parse_task_view():
+    assert parse_task_view(MultiDict()) == {'sort': 'priority', 'priorities': (), 'prefix': ''}
+    assert parse_task_view(MultiDict([('priority', '2'), ('priority', '1'), ('q', ' x ')]))['priorities'] == (1, 2)
+    assert parse_task_view(MultiDict([('priority', p) for p in '123']))['priorities'] == ()
+    assert parse_task_view(MultiDict({'sort': 'name'})) is None
+    assert parse_task_view(MultiDict({'priority': '4'})) is None
+    assert parse_task_view(MultiDict({'priority': 'high'})) is None
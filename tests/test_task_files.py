@@ -0,0 +1,162 @@
+import sys
+import os
+import io
+import json
+import subprocess
+from sqlalchemy import create_engine, insert
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import app, db, Task
+from conftest import login
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+
+# Presupuesto de memoria de la exportación y de la importación de un archivo grande, sobre la línea base
+FILE_RSS_BUDGET_MB = 64
+
+# Proceso hijo: exporta las tareas del usuario 1 a un archivo leyendo la respuesta bloque a bloque, las importa
+# como usuario 2 e informa del pico de RSS tras cada fase. Sin el perfil WAL: su mmap_size (256 MB) y
+# cache_size (64 MB) de SQLite cuentan en el RSS según crece la base de datos y no son memoria de la importación.
+FILES_SCRIPT = """
+import json, os, resource, sys
+sys.path.insert(0, sys.argv[2])
+from app import create_app
+app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + sys.argv[1], 'TASK_CACHE_BACKEND': 'none',
+                  'SQLITE_PROFILE': 'default'})
+client = app.test_client()
+with client.session_transaction() as sess:
+    sess['user_id'] = 1
+client.get('/tasks')
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+response = client.get('/tasks/export?format=csv', buffered=False)
+with open(sys.argv[3], 'wb') as file:
+    for chunk in response.response:
+        file.write(chunk)
+response.close()
+exported = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+with client.session_transaction() as sess:
+    sess['user_id'] = 2
+with open(sys.argv[3], 'rb') as file:
+    # input_stream: con data= el cliente de pruebas leería el archivo entero en memoria
+    response = client.post('/tasks/import', input_stream=file, content_length=os.path.getsize(sys.argv[3]),
+                           content_type='text/csv', buffered=False)
+    updates = [json.loads(line) for chunk in response.response for line in chunk.splitlines()]
+    response.close()
+imported = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'baseline_kb': baseline, 'export_kb': exported, 'import_kb': imported,
+                  'batches': len(updates) - 1, 'result': updates[-1]}))
+"""
+
+
+def import_file(client, data, filename='tasks.csv', **kwargs):
+    response = client.post('/tasks/import', data={'file': (io.BytesIO(data.encode()), filename)}, **kwargs)
+    assert response.status_code == 200 and response.mimetype == 'application/x-ndjson'
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def user_tasks(user_id):
+    return db.session.execute(db.select(Task.task, Task.priority, Task.due_at).where(Task.user_id == user_id)
+                              .order_by(Task.priority, Task.id)).all()
+
+
+# Nueva prueba: La importación valida cada fila (prioridad 1, 2 o 3 como el formulario), salta las no válidas
+# con su número de línea e informa del progreso por cada lote confirmado
+def test_import_csv_in_batches(client):
+    login(client)
+    app.config['TASK_IMPORT_BATCH'] = 2
+    try:
+        updates = import_file(client, "task,priority,due_at\n"
+                                      "Buy milk,1,\n"
+                                      "Bad priority,4,\n"
+                                      "\"Call Ana, then Luis\",2,2026-10-20T09:30+02:00\n"
+                                      "Default priority,,\n"
+                                      ",1,\n"
+                                      "Bad date,3,tomorrow\n")
+    finally:
+        app.config['TASK_IMPORT_BATCH'] = 5000
+    assert updates[0] == {'line': 4, 'imported': 2, 'invalid': 1}
+    result = updates[-1]
+    assert result['done'] and 'error' not in result
+    assert (result['line'], result['imported'], result['invalid']) == (7, 3, 3)
+    assert [error['line'] for error in result['errors']] == [3, 6, 7]
+    assert result['errors'][0]['error'] == "Field 'priority' must be 1, 2 or 3."
+
+    db.session.expire_all()
+    assert [(task, priority) for task, priority, _ in user_tasks(1)] == [
+        ("Buy milk", 1), ("Call Ana, then Luis", 2), ("Default priority", 3)]
+    assert user_tasks(1)[1].due_at.isoformat() == "2026-10-20T07:30:00"
+
+
+# Nueva prueba: El cuerpo de la petición también puede ser el archivo; NDJSON admite las mismas reglas
+def test_import_ndjson_body(client):
+    login(client)
+    response = client.post('/tasks/import', data='{"task": "From API", "priority": 2}\n\nnot json\n[1]\n'
+                                                 '{"task": "Bad", "priority": "1"}\n', content_type='application/x-ndjson')
+    result = json.loads(response.get_data(as_text=True).splitlines()[-1])
+    assert (result['imported'], result['invalid']) == (1, 3)
+    assert [error['line'] for error in result['errors']] == [3, 4, 5]
+    assert [task for task, _, _ in user_tasks(1)] == ["From API"]
+
+
+# Nueva prueba: Formato desconocido o CSV sin columna "task" se rechazan antes de importar nada
+def test_import_rejects_unknown_files(client):
+    login(client)
+    assert client.post('/tasks/import', data={'file': (io.BytesIO(b"task\nA\n"), 'tasks.xlsx')}).status_code == 400
+    response = client.post('/tasks/import', data=b"name,priority\nA,1\n", content_type='text/csv')
+    assert response.status_code == 400 and 'task' in response.get_json()['error']
+    assert client.post('/tasks/import', data=b"\xff\xfe", content_type='text/csv').status_code == 400
+    assert user_tasks(1) == []
+    assert client.get('/tasks/export?format=xml').status_code == 400
+
+
+# Nueva prueba: Exportar y volver a importar (en CSV y NDJSON) da las mismas tareas; la exportación solo
+# incluye las del usuario y se revalida con su ETag
+def test_export_round_trip(client):
+    login(client)
+    import_file(client, "task,priority,due_at\nAlpha,1,2026-01-02T03:04:05\n\"Beta, \"\"quoted\"\"\",3,\nGamma,2,\n")
+    db.session.add(Task(user_id=2, task="Other user task", priority=1))
+    db.session.commit()
+
+    for file_format in ('csv', 'ndjson'):
+        response = client.get(f'/tasks/export?format={file_format}')
+        assert response.status_code == 200 and response.is_streamed
+        assert response.headers['Content-Disposition'] == f'attachment; filename="tasks.{file_format}"'
+        assert "Other user task" not in response.get_data(as_text=True)
+        assert client.get(f'/tasks/export?format={file_format}',
+                          headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+        login(client, 2)
+        db.session.execute(db.delete(Task).where(Task.user_id == 2))
+        db.session.commit()
+        result = import_file(client, response.get_data(as_text=True), filename=f'tasks.{file_format}')[-1]
+        assert (result['imported'], result['invalid']) == (3, 0)
+        assert user_tasks(2) == user_tasks(1)
+        login(client, 1)
+
+    lines = client.get('/tasks/export?priority=1').get_data(as_text=True).splitlines()
+    assert lines[0] == "id,task,priority,due_at,created_at" and len(lines) == 2
+    assert lines[1].split(',')[1:4] == ["Alpha", "1", "2026-01-02T03:04:05"]
+
+
+# Nueva prueba: Exportar 200k tareas a un archivo e importarlo mantiene el pico de RSS dentro del presupuesto
+def test_export_import_200k_tasks_memory_budget(tmp_path):
+    path = str(tmp_path / "large.db")
+    engine = create_engine(f"sqlite:///{path}")
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO user (id, username) VALUES (1, 'large_user'), (2, 'import_user')")
+        for start in range(0, 200000, 50000):
+            conn.execute(insert(Task), [
+                {'user_id': 1, 'task': f"Task {i}", 'priority': i % 3 + 1} for i in range(start, start + 50000)
+            ])
+    engine.dispose()
+
+    result = subprocess.run([sys.executable, '-c', FILES_SCRIPT, path, ROOT, str(tmp_path / "tasks.csv")],
+                            capture_output=True, text=True, env=dict(os.environ, FLASK_SECRET_KEY="test"), timeout=600)
+    assert result.returncode == 0, result.stderr
+    stats = json.loads(result.stdout.strip().splitlines()[-1])
+    assert stats['result']['imported'] == 200000 and stats['result']['invalid'] == 0
+    assert stats['batches'] == 200000 // 5000
+    assert (stats['export_kb'] - stats['baseline_kb']) / 1024 < FILE_RSS_BUDGET_MB, stats
+    assert (stats['import_kb'] - stats['baseline_kb']) / 1024 < FILE_RSS_BUDGET_MB, stats
@@ -1,7 +1,9 @@
 import sys
 import os
+import time
 from unittest.mock import patch
-from app import google, User, db
+from app import app, google, User, db
+from security import PasswordHasher, RateLimiter
 from werkzeug.security import generate_password_hash, check_password_hash
 
 # Agregar el directorio raíz del proyecto al sys.path
@@ -121,4 +123,57 @@ def test_google_authorize(mock_google_get, mock_authorize_access_token, client):
     assert user is not None
     assert user.username == "new_user@gmail.com"
     assert response.status_code == 302  # Redirección esperada
-    assert response.headers['Location'] == '/tasks'
\ No newline at end of file
+    assert response.headers['Location'] == '/tasks'
+# Nueva prueba: Rehash transparente al iniciar sesión cuando cambia el método de hash
+def test_login_rehashes_password(client):
+    user = User(username="rehash_user", password=generate_password_hash("secure_password", "pbkdf2:sha256:1000"))
+    db.session.add(user)
+    db.session.commit()
+
+    response = client.post('/login', data={'username': 'rehash_user', 'password': 'secure_password'})
+    assert response.status_code == 302
+
+    db.session.expire_all()
+    user = User.query.filter_by(username="rehash_user").first()
+    assert user.password.startswith(app.config['PASSWORD_HASH_METHOD'])
+    assert check_password_hash(user.password, "secure_password")
+
+# Nueva prueba: Límite de intentos de login por usuario
+def test_login_rate_limit(client):
+    limiter = app.extensions['login_limiters']['username']
+    limit = limiter.limit
+    limiter.limit = 2
+    try:
+        for _ in range(2):
+            response = client.post('/login', data={'username': 'limited_user', 'password': 'wrong'})
+            assert response.status_code == 200
+        response = client.post('/login', data={'username': 'limited_user', 'password': 'wrong'})
+        assert response.status_code == 429
+        assert b"Too many attempts" in response.data
+    finally:
+        limiter.limit = limit
+        limiter.clear()
+
+# Nueva prueba: Un usuario de Google (sin contraseña) no puede entrar con el formulario
+def test_login_google_user_without_password(client):
+    db.session.add(User(username="google_user@gmail.com", google_id="999"))
+    db.session.commit()
+    response = client.post('/login', data={'username': 'google_user@gmail.com', 'password': 'anything'})
+    assert response.status_code == 200
+    assert b"Login failed" in response.data
+
+# Nueva prueba: Detección de hashes con otro método o coste
+def test_password_hasher_needs_rehash():
+    hasher = PasswordHasher("pbkdf2:sha256:1000", workers=1)
+    assert hasher.verify(hasher.hash("secret"), "secret")
+    assert not hasher.needs_rehash(hasher.hash("secret"))
+    assert hasher.needs_rehash(generate_password_hash("secret", "pbkdf2:sha256:2000"))
+    assert not hasher.verify(None, "secret")
+
+# Nueva prueba: Ventana del limitador de intentos
+def test_rate_limiter_window():
+    limiter = RateLimiter(limit=1, window=0.05)
+    assert limiter.hit("127.0.0.1")
+    assert not limiter.hit("127.0.0.1")
+    time.sleep(0.06)
+    assert limiter.hit("127.0.0.1")
@@ -0,0 +1,63 @@
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import requests
+
+# Agregar el directorio raíz del proyecto al sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from app import app
+from weather import WeatherClient, WeatherError
+
+def test_weather_is_cached_per_city(fake_weatherstack):
+    client = WeatherClient(fake_weatherstack.url, "key", ttl=60)
+    assert client.get("Guadalajara")['city'] == "Guadalajara"
+    assert client.get(" guadalajara ")['temperature'] == 21
+    assert fake_weatherstack.calls == 1
+
+    client.get("Monterrey")
+    assert fake_weatherstack.calls == 2
+
+def test_stale_while_revalidate(fake_weatherstack):
+    client = WeatherClient(fake_weatherstack.url, "key", ttl=0, stale_ttl=60)
+    client.get("Guadalajara")
+
+    # El dato viejo se devuelve de inmediato y se refresca en segundo plano
+    fake_weatherstack.delay = 0.2
+    start = time.monotonic()
+    assert client.get("Guadalajara")['city'] == "Guadalajara"
+    assert time.monotonic() - start < 0.1
+    client._refresher.shutdown(wait=True)
+    assert fake_weatherstack.calls == 2
+
+def test_concurrent_requests_are_coalesced(fake_weatherstack):
+    client = WeatherClient(fake_weatherstack.url, "key", ttl=60)
+    fake_weatherstack.delay = 0.2
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(client.get, ["Guadalajara"] * 10))
+    assert all(result['city'] == "Guadalajara" for result in results)
+    assert fake_weatherstack.calls == 1
+
+def test_read_timeout(fake_weatherstack):
+    client = WeatherClient(fake_weatherstack.url, "key", read_timeout=0.05)
+    fake_weatherstack.delay = 0.3
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get("Guadalajara")
+
+def test_api_error(fake_weatherstack):
+    fake_weatherstack.payload = {'success': False, 'error': {'info': "Invalid access key."}}
+    client = WeatherClient(fake_weatherstack.url, "bad-key")
+    with pytest.raises(WeatherError, match="Invalid access key"):
+        client.get("Guadalajara")
+
+def test_weatherstack_route(client, fake_weatherstack, monkeypatch):
+    # El cliente de la aplicación se crea con la primera consulta; aquí se sustituye por uno contra el falso
+    monkeypatch.setitem(app.extensions, 'weatherstack', WeatherClient(fake_weatherstack.url, "key"))
+    response = client.get('/weatherstack?city=Zapopan')
+    assert response.status_code == 200
+    assert b"Weather in Zapopan" in response.data
+
+    fake_weatherstack.payload = {'success': False, 'error': {'info': "Invalid access key."}}
+    response = client.get('/weatherstack?city=Tlaquepaque')
+    assert response.status_code == 500
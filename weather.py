@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class WeatherError(Exception):
+    pass
+
+
+# Cliente de Weatherstack con sesión HTTP reutilizable, timeouts y caché por ciudad.
+# - Dentro de ttl se responde desde la caché.
+# - Entre ttl y ttl + stale_ttl se responde el dato viejo y se refresca en segundo plano.
+# - Las peticiones simultáneas de la misma ciudad comparten una sola llamada a la API.
+class WeatherClient:
+    def __init__(self, base_url, api_key, ttl=600, stale_ttl=3600, connect_timeout=3.05,
+                 read_timeout=5, pool_size=10, max_cities=1000):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_cities = max_cities
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix='weather-refresh')
+        self.upstream_calls = 0
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            config['WEATHERSTACK_URL'],
+            config['WEATHERSTACK_API_KEY'],
+            ttl=config['WEATHER_CACHE_TTL'],
+            stale_ttl=config['WEATHER_STALE_TTL'],
+            connect_timeout=config['WEATHER_CONNECT_TIMEOUT'],
+            read_timeout=config['WEATHER_READ_TIMEOUT'],
+            pool_size=config['WEATHER_POOL_SIZE'],
+        )
+
+    def get(self, city):
+        key = city.strip().lower()
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry:
+            fetched_at, weather = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                return weather
+            if age < self.ttl + self.stale_ttl:
+                self._refresher.submit(self._refresh, key, city)
+                return weather
+        return self._fetch_coalesced(key, city).result()
+
+    def _refresh(self, key, city):
+        # Si el refresco falla se sigue sirviendo el dato viejo hasta que caduque
+        try:
+            self._fetch_coalesced(key, city).result()
+        except (requests.exceptions.RequestException, WeatherError):
+            pass
+
+    def _fetch_coalesced(self, key, city):
+        with self._lock:
+            future = self._inflight.get(key)
+            if future:
+                return future
+            future = Future()
+            self._inflight[key] = future
+
+        try:
+            weather = self._fetch(city)
+        except Exception as error:
+            future.set_exception(error)
+        else:
+            with self._lock:
+                self._cache[key] = (time.monotonic(), weather)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_cities:
+                    self._cache.popitem(last=False)
+            future.set_result(weather)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return future
+
+    def _fetch(self, city):
+        self.upstream_calls += 1
+        response = self.session.get(
+            self.base_url,
+            params={'access_key': self.api_key, 'query': city},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        weather_data = response.json()
+
+        # Weatherstack responde 200 con {"success": false, "error": {...}} en errores de la API
+        if 'location' not in weather_data:
+            error = weather_data.get('error', {})
+            raise WeatherError(error.get('info', 'Unexpected response from Weatherstack.'))
+
+        # Extraer datos relevantes de la respuesta
+        return {
+            'city': weather_data['location']['name'],
+            'temperature': weather_data['current']['temperature'],
+            'description': weather_data['current']['weather_descriptions'][0],
+            'icon': weather_data['current']['weather_icons'][0]
+        }
+
+    def close(self):
+        self._refresher.shutdown(wait=False)
+        self.session.close()